@@ -0,0 +1,163 @@
+from collections import OrderedDict
+import config
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# Politeness and filler that don't change what a question asks
+_FILLER = re.compile(r"^(?:(?:please|hey|hi|ok|okay|so|can you|could you|would you|tell me|i want to know)\s+)+"
+                     r"|\s+please$")
+
+
+def normalize_question(question):
+    """
+    Lowercased, accents and punctuation stripped, whitespace collapsed and
+    leading filler ("please", "can you", ...) dropped:
+    "Can you show me  West Side Crew's members?" -> "show me west side crew s members"
+    """
+    text = unicodedata.normalize("NFKD", question)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = " ".join(re.sub(r"[^\w\s]", " ", text).split())
+    return _FILLER.sub("", text)
+
+
+def context_fingerprint(context):
+    """Hash of retrieved context; any change in the rows (or the graph stats) changes it"""
+    data = json.dumps(context, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """
+    LLM answers keyed by normalized question, model and a fingerprint of
+    the context retrieved for it. A graph change alters the retrieved rows
+    (or at least the database_stats block), so stale answers are never
+    found rather than explicitly invalidated.
+
+    The newest `max_entries` answers are kept in memory (LRU) for `ttl`
+    seconds (0: no expiry); `max_entries=0` disables the cache. With a
+    `path`, answers are also kept in that SQLite file, so they survive
+    restarts and are shared between processes.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, path=None):
+        self.max_entries = max_entries if max_entries is not None else config.ANSWER_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else config.ANSWER_CACHE_TTL
+        self.path = path if path is not None else config.ANSWER_CACHE_PATH
+        self.entries = OrderedDict()  # key -> (expires_at, answer)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lock = threading.Lock()
+        self.conn = None
+        if self.path and self.max_entries:
+            try:
+                self.conn = sqlite3.connect(self.path, check_same_thread=False)
+                self.conn.execute("CREATE TABLE IF NOT EXISTS answers "
+                                  "(key TEXT PRIMARY KEY, answer TEXT, expires_at REAL, used_at REAL)")
+                self.conn.execute("DELETE FROM answers WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Answer cache file unavailable, keeping answers in memory: {e}")
+                self.conn = None
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(question, context, model=None):
+        return hashlib.sha256(
+            f"{model}\n{normalize_question(question)}\n{context_fingerprint(context)}".encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key):
+        """Cached answer for a key, or None on a miss"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None and self.conn is not None:
+                entry = self._load(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, answer = entry
+            if expires_at is not None and now >= expires_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+            if self.conn is not None:
+                self._execute("UPDATE answers SET used_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return answer
+
+    def put(self, key, answer):
+        if not self.enabled or not answer:
+            return
+        now = time.time()
+        entry = (now + self.ttl if self.ttl else None, answer)
+        with self.lock:
+            self._remember(key, entry)
+            if self.conn is not None:
+                self._execute("INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)", (key, answer, entry[0], now))
+                # Same bound on disk, least recently used first out
+                self._execute("DELETE FROM answers WHERE key NOT IN "
+                              "(SELECT key FROM answers ORDER BY used_at DESC LIMIT ?)", (self.max_entries,))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.conn is not None:
+                self._execute("DELETE FROM answers")
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key):
+        try:
+            row = self.conn.execute("SELECT expires_at, answer FROM answers WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Answer cache read failed: {e}")
+            return None
+        return tuple(row) if row else None
+
+    def _drop(self, key):
+        self.entries.pop(key, None)
+        if self.conn is not None:
+            self._execute("DELETE FROM answers WHERE key = ?", (key,))
+
+    def _execute(self, sql, params):
+        try:
+            self.conn.execute(sql, params)
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Answer cache write failed: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -1,10 +1,18 @@
 import streamlit as st
+import config
 from database import Database
+from async_database import AsyncDatabase
+from query_cache import QueryCache
+from query_metrics import QueryMetrics
+from slow_query_log import SlowQueryLog
+from graph_stats import GraphStats
+from answer_cache import AnswerCache
+import queries
 from graph_rag import GraphRAG
 import plotly.express as px
 import pandas as pd
 from datetime import datetime
-from pyvis.network import Network
+from network_viz import create_network
 import streamlit.components.v1 as components
 
 st.set_page_config(
@@ -84,11 +92,52 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Initialize
+@st.cache_resource
+def get_query_metrics():
+    # One recorder for the whole server, so the Performance page covers every session
+    return QueryMetrics()
+
+@st.cache_resource
+def get_slow_query_log():
+    # One rotating log file per server
+    return SlowQueryLog()
+
+@st.cache_resource
+def get_graph_stats():
+    # One materialized store per server, kept current by every session's writes
+    return GraphStats()
+
+@st.cache_resource
+def get_async_database():
+    # One async driver and event-loop thread per server, shared by every session's GraphRAG
+    # (also the fallback when a compiled retrieval plan fails or times out)
+    if not config.RAG_ASYNC:
+        return None
+    try:
+        return AsyncDatabase(metrics=get_query_metrics(), slow_log=get_slow_query_log())
+    except Exception as e:
+        print(f"⚠️ Async retrieval unavailable: {e}")
+        return None
+
+@st.cache_resource
+def get_answer_cache():
+    # Detectives ask the same questions; one answer cache for every session
+    return AnswerCache()
+
+@st.cache_resource
+def prewarm_queries(_db):
+    # Plan every catalog query once per server, before the first user request
+    return queries.prewarm(_db)
+
 if 'db' not in st.session_state:
-    st.session_state.db = Database()
+    # Dashboard and chat reads repeat on every rerun; cache them per session
+    st.session_state.db = Database(cache=QueryCache(), metrics=get_query_metrics(),
+                                   slow_log=get_slow_query_log(), stats=get_graph_stats())
+    prewarm_queries(st.session_state.db)
 
 if 'rag' not in st.session_state:
-    st.session_state.rag = GraphRAG()
+    st.session_state.rag = GraphRAG(st.session_state.db, async_db=get_async_database(),
+                                    answer_cache=get_answer_cache())
 
 if 'chat_messages' not in st.session_state:
     st.session_state.chat_messages = []
@@ -105,29 +154,30 @@ with st.sidebar:
     page = st.radio("Navigation", [
         "🏠 Dashboard",
         "💬 Ask AI Assistant",
-        "🕸️ Network Visualization"
+        "🕸️ Network Visualization",
+        "📈 Performance"
     ])
     
     st.markdown("---")
     
     try:
-        stats = st.session_state.db.query("""
-            MATCH (c:Crime) WITH count(c) as crimes
-            MATCH (p:Person) WITH crimes, count(p) as persons
-            MATCH (l:Location) WITH crimes, persons, count(l) as locations
-            MATCH (o:Organization)
-            RETURN crimes, persons, locations, count(o) as organizations
-        """)[0]
+        stats = st.session_state.db.stats
         
         st.markdown("### 📊 Database")
-        st.metric("🚨 Crimes", stats['crimes'])
-        st.metric("👥 Persons", stats['persons'])
-        st.metric("📍 Locations", stats['locations'])
-        st.metric("🏢 Orgs", stats['organizations'])
+        st.metric("🚨 Crimes", stats.count("Crime"))
+        st.metric("👥 Persons", stats.count("Person"))
+        st.metric("📍 Locations", stats.count("Location"))
+        st.metric("🏢 Orgs", stats.count("Organization"))
         
         st.markdown("---")
         st.success("✅ Connected")
         
+        cache = st.session_state.db.cache.stats()
+        st.caption(f"⚡ Query cache: {cache['hit_rate']:.0%} hits "
+                   f"({cache['hits']}/{cache['hits'] + cache['misses']}), "
+                   f"{cache['entries']} entries, {cache['bytes'] / 1024:.0f} KB, "
+                   f"{cache['evictions']} evicted")
+        
     except Exception as e:
         st.error("⚠️ Database Error")
 
@@ -138,18 +188,12 @@ if page == "🏠 Dashboard":
     col1, col2, col3, col4 = st.columns(4)
     
     try:
-        stats = st.session_state.db.query("""
-            MATCH (c:Crime) WITH count(c) as crimes
-            MATCH (p:Person) WITH crimes, count(p) as persons
-            MATCH (l:Location) WITH crimes, persons, count(l) as locations
-            MATCH ()-[r:PARTY_TO]->()
-            RETURN crimes, persons, locations, count(r) as connections
-        """)[0]
+        stats = st.session_state.db.stats
         
-        col1.metric("📊 Total Crimes", stats['crimes'])
-        col2.metric("👥 Total Suspects", stats['persons'])
-        col3.metric("📍 Locations", stats['locations'])
-        col4.metric("🔗 Connections", stats['connections'])
+        col1.metric("📊 Total Crimes", stats.count("Crime"))
+        col2.metric("👥 Total Suspects", stats.count("Person"))
+        col3.metric("📍 Locations", stats.count("Location"))
+        col4.metric("🔗 Connections", stats.relationship_count("PARTY_TO"))
     except Exception as e:
         st.error(f"Error: {e}")
     
@@ -159,15 +203,9 @@ if page == "🏠 Dashboard":
     
     with col_a:
         st.subheader("🔥 Crime Hotspots")
-        hotspots = st.session_state.db.query("""
-            MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
-            RETURN l.name as location, count(c) as crimes
-            ORDER BY crimes DESC
-            LIMIT 10
-        """)
+        df = pd.DataFrame(st.session_state.db.stats.hotspots(10), columns=['location', 'district', 'crimes'])
         
-        if hotspots:
-            df = pd.DataFrame(hotspots)
+        if not df.empty:
             fig = px.bar(df, x='location', y='crimes', 
                         color='crimes',
                         color_continuous_scale='Reds')
@@ -176,27 +214,16 @@ if page == "🏠 Dashboard":
     
     with col_b:
         st.subheader("📊 Crime Types")
-        types = st.session_state.db.query("""
-            MATCH (c:Crime)
-            RETURN c.type as type, count(*) as count
-            ORDER BY count DESC
-            LIMIT 10
-        """)
+        df2 = pd.DataFrame(st.session_state.db.stats.crime_types(10), columns=['type', 'count'])
         
-        if types:
-            df2 = pd.DataFrame(types)
+        if not df2.empty:
             fig2 = px.pie(df2, names='type', values='count', hole=0.4)
             st.plotly_chart(fig2, use_container_width=True)
     
     st.markdown("---")
     st.subheader("📰 Recent Activity")
     
-    recent = st.session_state.db.query("""
-        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
-        RETURN c.type as type, c.date as date, c.time as time, l.name as location
-        ORDER BY c.date DESC, c.time DESC
-        LIMIT 5
-    """)
+    recent = st.session_state.db.read_named("dashboard.recent")
     
     if recent:
         for crime in recent:
@@ -263,6 +290,11 @@ elif page == "💬 Ask AI Assistant":
                     </div>
                 """, unsafe_allow_html=True)
             else:
+                if 'latency' in message:
+                    latency = message['latency']
+                    timestamp += f" · first words {latency['ttft_ms'] / 1000:.1f}s · done {latency['total_ms'] / 1000:.1f}s"
+                    if latency.get('cached'):
+                        timestamp += " · 💾 cached"
                 st.markdown(f"""
                     <div style='text-align: left;'>
                         <div class='assistant-message'>
@@ -322,32 +354,34 @@ elif page == "💬 Ask AI Assistant":
             "content": user_input
         })
         
-        # Get response
-        with st.spinner("🔍 Analyzing..."):
-            try:
-                result = st.session_state.rag.ask_with_context(
+        # Stream the answer as it's generated
+        try:
+            with st.chat_message("assistant", avatar="🤖"):
+                answer = st.write_stream(st.session_state.rag.ask_stream(
                     user_input, 
                     st.session_state.conversation_context[-10:]
-                )
-                
-                st.session_state.chat_messages.append({
-                    "role": "assistant",
-                    "content": result['answer'],
-                    "sources": result.get('sources', []),
-                    "timestamp": datetime.now().strftime("%H:%M")
-                })
-                
-                st.session_state.conversation_context.append({
-                    "role": "assistant",
-                    "content": result['answer']
-                })
-            except Exception as e:
-                st.session_state.chat_messages.append({
-                    "role": "assistant",
-                    "content": f"⚠️ Error: {str(e)}\n\nPlease try another question.",
-                    "sources": [],
-                    "timestamp": datetime.now().strftime("%H:%M")
-                })
+                ))
+            turn = st.session_state.rag.turns[-1]
+            
+            st.session_state.chat_messages.append({
+                "role": "assistant",
+                "content": answer,
+                "sources": turn['sources'],
+                "latency": turn,
+                "timestamp": datetime.now().strftime("%H:%M")
+            })
+            
+            st.session_state.conversation_context.append({
+                "role": "assistant",
+                "content": answer
+            })
+        except Exception as e:
+            st.session_state.chat_messages.append({
+                "role": "assistant",
+                "content": f"⚠️ Error: {str(e)}\n\nPlease try another question.",
+                "sources": [],
+                "timestamp": datetime.now().strftime("%H:%M")
+            })
         
         st.rerun()
     
@@ -367,33 +401,34 @@ elif page == "💬 Ask AI Assistant":
             "content": user_input
         })
         
-        # Get response
-        with st.spinner("🔍 Analyzing..."):
-            try:
-                result = st.session_state.rag.ask_with_context(
+        # Stream the answer as it's generated
+        try:
+            with st.chat_message("assistant", avatar="🤖"):
+                answer = st.write_stream(st.session_state.rag.ask_stream(
                     user_input, 
                     st.session_state.conversation_context[-10:]
-                )
-                
-                st.session_state.chat_messages.append({
-                    "role": "assistant",
-                    "content": result['answer'],
-                    "sources": result.get('sources', []),
-                    "timestamp": datetime.now().strftime("%H:%M")
-                })
-                
-                st.session_state.conversation_context.append({
-                    "role": "assistant",
-                    "content": result['answer']
-                })
-                
-            except Exception as e:
-                st.session_state.chat_messages.append({
-                    "role": "assistant",
-                    "content": f"⚠️ Error: {str(e)}\n\nPlease try rephrasing your question.",
-                    "sources": [],
-                    "timestamp": datetime.now().strftime("%H:%M")
-                })
+                ))
+            turn = st.session_state.rag.turns[-1]
+            
+            st.session_state.chat_messages.append({
+                "role": "assistant",
+                "content": answer,
+                "sources": turn['sources'],
+                "latency": turn,
+                "timestamp": datetime.now().strftime("%H:%M")
+            })
+            
+            st.session_state.conversation_context.append({
+                "role": "assistant",
+                "content": answer
+            })
+        except Exception as e:
+            st.session_state.chat_messages.append({
+                "role": "assistant",
+                "content": f"⚠️ Error: {str(e)}\n\nPlease try rephrasing your question.",
+                "sources": [],
+                "timestamp": datetime.now().strftime("%H:%M")
+            })
         
         st.rerun()
 
@@ -418,13 +453,8 @@ elif page == "🕸️ Network Visualization":
     
     # Person selector for focused view
     if focus == "Specific Person":
-        persons = st.session_state.db.query("""
-            MATCH (p:Person)
-            RETURN DISTINCT p.name as name
-            ORDER BY name
-        """)
-        if persons:
-            person_list = [p['name'] for p in persons]
+        person_list = [p['name'] for p in st.session_state.db.stream_named("network.persons")]
+        if person_list:
             st.info(f"📊 Found {len(person_list)} persons in database")
             selected_person = st.selectbox("Select Person", person_list)
     
@@ -433,147 +463,19 @@ elif page == "🕸️ Network Visualization":
     if generate:
         with st.spinner("🎨 Generating network..."):
             try:
-                # Build query
+                # Pick the catalog query for the focus
                 if focus == "Specific Person":
-                    query = f"""
-                    MATCH (p:Person {{name: '{selected_person}'}})-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
-                    OPTIONAL MATCH (p)-[:MEMBER_OF]->(o:Organization)
-                    OPTIONAL MATCH (p)-[:KNOWS]-(p2:Person)
-                    RETURN p.name as person, c.id as crime_id, c.type as crime_type,
-                           l.name as location, o.name as organization,
-                           collect(DISTINCT p2.name)[0..10] as connections
-                    LIMIT {network_size}
-                    """
+                    query_name, params = "network.person_graph", {"person": selected_person, "limit": network_size}
                 elif focus == "Gang Networks":
-                    query = f"""
-                    MATCH (p:Person)-[:MEMBER_OF]->(o:Organization)
-                    MATCH (p)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
-                    RETURN p.name as person, o.name as organization,
-                           c.id as crime_id, c.type as crime_type, l.name as location
-                    LIMIT {network_size}
-                    """
+                    query_name, params = "network.gang_graph", {"limit": network_size}
                 else:
-                    query = f"""
-                    MATCH (p:Person)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
-                    OPTIONAL MATCH (p)-[:MEMBER_OF]->(o:Organization)
-                    RETURN p.name as person, c.id as crime_id, c.type as crime_type,
-                           l.name as location, o.name as organization
-                    LIMIT {network_size}
-                    """
+                    query_name, params = "network.graph", {"limit": network_size}
                 
-                data = st.session_state.db.query(query)
+                html, node_count = create_network(st.session_state.db, query_name, params)
                 
-                if data:
-                    # Create network with Neo4j styling
-                    net = Network(height='700px', width='100%', 
-                                bgcolor='#ffffff', font_color='black')
-                    
-                    # Neo4j-style physics
-                    net.set_options("""
-                    {
-                        "nodes": {
-                            "borderWidth": 2,
-                            "font": {"size": 14, "face": "Arial"},
-                            "shadow": true
-                        },
-                        "edges": {
-                            "smooth": {"type": "continuous"},
-                            "arrows": {"to": {"enabled": true, "scaleFactor": 0.5}},
-                            "color": {"inherit": false}
-                        },
-                        "physics": {
-                            "barnesHut": {
-                                "gravitationalConstant": -30000,
-                                "centralGravity": 0.3,
-                                "springLength": 150,
-                                "damping": 0.09
-                            },
-                            "stabilization": {"iterations": 200}
-                        },
-                        "interaction": {
-                            "hover": true,
-                            "tooltipDelay": 100,
-                            "navigationButtons": true
-                        }
-                    }
-                    """)
-                    
-                    # Neo4j color palette
-                    COLORS = {
-                        'Person': '#FFA07A',
-                        'Crime': '#9FC5E8',
-                        'Location': '#B4D7A8',
-                        'Organization': '#E69138'
-                    }
-                    
-                    nodes_added = set()
-                    
-                    # Add nodes
-                    for record in data:
-                        person = record.get('person')
-                        crime_id = record.get('crime_id')
-                        crime_type = record.get('crime_type')
-                        location = record.get('location')
-                        org = record.get('organization')
-                        
-                        # Person
-                        if person and person not in nodes_added:
-                            net.add_node(person, label=person, 
-                                       color=COLORS['Person'], size=30,
-                                       title=f"Person: {person}")
-                            nodes_added.add(person)
-                        
-                        # Crime
-                        if crime_id and crime_id not in nodes_added:
-                            net.add_node(crime_id, label=crime_type,
-                                       color=COLORS['Crime'], size=25,
-                                       title=f"Crime: {crime_type}")
-                            nodes_added.add(crime_id)
-                        
-                        # Location
-                        if location and location not in nodes_added:
-                            net.add_node(location, label=location,
-                                       color=COLORS['Location'], size=25,
-                                       title=f"Location: {location}")
-                            nodes_added.add(location)
-                        
-                        # Organization
-                        if org and org not in nodes_added:
-                            net.add_node(org, label=org,
-                                       color=COLORS['Organization'], size=35,
-                                       title=f"Organization: {org}")
-                            nodes_added.add(org)
-                        
-                        # Edges
-                        if person and crime_id:
-                            net.add_edge(person, crime_id, color='#848484', width=2)
-                        
-                        if crime_id and location:
-                            net.add_edge(crime_id, location, color='#848484', width=2)
-                        
-                        if person and org:
-                            net.add_edge(person, org, color='#E69138', width=3)
-                    
-                    # Add social connections
-                    knows = st.session_state.db.query("""
-                        MATCH (p1:Person)-[:KNOWS]-(p2:Person)
-                        WHERE EXISTS((p1)-[:PARTY_TO]->(:Crime))
-                        RETURN p1.name as p1, p2.name as p2
-                        LIMIT 30
-                    """)
-                    
-                    for k in knows:
-                        if k['p1'] in nodes_added and k['p2'] in nodes_added:
-                            net.add_edge(k['p1'], k['p2'], 
-                                       color='#D3D3D3', width=1.5, dashes=True)
-                    
-                    # Save
-                    net.save_graph('network.html')
-                    
-                    with open('network.html', 'r') as f:
-                        st.session_state.network_html = f.read()
-                    
-                    st.success(f"✅ Generated {len(nodes_added)} nodes")
+                if html:
+                    st.session_state.network_html = html
+                    st.success(f"✅ Generated {node_count} nodes")
                     
             except Exception as e:
                 st.error(f"⚠️ Error generating network: {str(e)}")
@@ -592,6 +494,80 @@ elif page == "🕸️ Network Visualization":
     else:
         st.info("👆 Click 'Generate' to visualize the network")
 
+# ========== QUERY PERFORMANCE ==========
+elif page == "📈 Performance":
+    st.title("📈 Query Performance")
+    st.markdown("### Where Cypher time goes, by caller")
+    
+    metrics = get_query_metrics()
+    summary = metrics.summary()
+    
+    if summary:
+        df = pd.DataFrame(summary)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("🔢 Calls", int(df['calls'].sum()))
+        col2.metric("⏱️ Total Time", f"{df['total_ms'].sum() / 1000:.2f}s")
+        col3.metric("⚡ Served from Cache", int(df['cached'].sum()))
+        
+        st.markdown("---")
+        st.subheader("🐢 Slowest Callers")
+        fig = px.bar(df.head(15), x='total_ms', y='label', orientation='h',
+                    color='p95_ms', color_continuous_scale='Reds',
+                    labels={'total_ms': 'Total ms', 'label': '', 'p95_ms': 'p95 ms'})
+        fig.update_layout(height=450, yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(df.round(2), use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+        st.subheader("📊 Latency Histogram")
+        selected = st.selectbox("Caller", df['label'].tolist())
+        hist = pd.DataFrame(metrics.histogram(selected), columns=['bucket', 'calls'])
+        fig2 = px.bar(hist, x='bucket', y='calls')
+        st.plotly_chart(fig2, use_container_width=True)
+        
+        st.markdown("---")
+        slow_log = get_slow_query_log()
+        st.subheader(f"🐢 Slow Queries (over {slow_log.threshold_ms:.0f} ms)")
+        if slow_log.entries:
+            for entry in reversed(slow_log.entries):
+                flags = f" — ⚠️ {len(entry['flags'])} issue(s)" if entry['flags'] else ""
+                with st.expander(f"{entry['label'] or entry['cypher'][:60]} · {entry['wall_ms']} ms{flags}"):
+                    for flag in entry['flags']:
+                        st.warning(flag)
+                    st.code(entry['cypher'], language='cypher')
+                    if entry['plan']:
+                        st.caption(f"{entry['plan_mode']} plan")
+                        st.code(entry['plan'])
+        else:
+            st.caption("None so far")
+        
+        st.markdown("---")
+        col_a, col_b, col_c = st.columns(3)
+        col_a.download_button("⬇️ Export JSON", metrics.to_json(), "query_metrics.json", "application/json")
+        col_b.download_button("⬇️ Export CSV", metrics.to_csv(), "query_metrics.csv", "text/csv")
+        if col_c.button("🔄 Reset"):
+            metrics.reset()
+            st.rerun()
+    else:
+        st.info("👆 No queries recorded yet; use the dashboard or the assistant first")
+    
+    # Assistant turns of this session: where a detective's wait goes
+    turns = list(st.session_state.rag.turns) if 'rag' in st.session_state else []
+    if turns:
+        st.markdown("---")
+        st.subheader("💬 Assistant Latency")
+        turns_df = pd.DataFrame(turns)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("🔍 Retrieval (median)", f"{turns_df['retrieval_ms'].median():.0f} ms")
+        col2.metric("⚡ First Words (median)", f"{turns_df['ttft_ms'].median() / 1000:.2f}s")
+        col3.metric("✅ Full Answer (median)", f"{turns_df['total_ms'].median() / 1000:.2f}s")
+        answer_stats = get_answer_cache().stats()
+        st.caption(f"💾 Answer cache: {answer_stats['hits']} hits, {answer_stats['misses']} misses "
+                   f"({answer_stats['hit_rate']:.0%}), {answer_stats['entries']} answers kept")
+        st.dataframe(turns_df[['question', 'retrieval_ms', 'ttft_ms', 'total_ms', 'cached', 'streamed', 'fallback']].round(1),
+                    use_container_width=True, hide_index=True)
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,140 @@
+from neo4j import AsyncGraphDatabase
+import asyncio
+import config
+import threading
+import time
+
+
+class AsyncDatabase:
+    """
+    Async Neo4j driver running on its own event-loop thread, so synchronous
+    callers (Streamlit, GraphRAG) can fan a batch of reads out concurrently.
+    """
+
+    def __init__(self, pool_size=None, acquisition_timeout=None, connection_lifetime=None, metrics=None,
+                 slow_log=None):
+        # Optional QueryMetrics and SlowQueryLog, usually shared with the sync Database
+        self.metrics = metrics
+        self.slow_log = slow_log
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        try:
+            self.driver = self._run(self._connect(
+                pool_size or config.NEO4J_POOL_SIZE,
+                acquisition_timeout or config.NEO4J_ACQUISITION_TIMEOUT,
+                connection_lifetime or config.NEO4J_CONNECTION_LIFETIME
+            ))
+        except Exception:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            raise
+
+    async def _connect(self, pool_size, acquisition_timeout, connection_lifetime):
+        # Created on the loop thread, which owns its connections
+        return AsyncGraphDatabase.driver(
+            config.NEO4J_URI,
+            auth=(config.NEO4J_USER, config.NEO4J_PASSWORD),
+            max_connection_pool_size=pool_size,
+            connection_acquisition_timeout=acquisition_timeout,
+            max_connection_lifetime=connection_lifetime,
+            max_transaction_retry_time=config.NEO4J_RETRY_TIME
+        )
+
+    def _run(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
+
+    def close(self):
+        self._run(self.driver.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    @staticmethod
+    async def _fetch(tx, cypher, params):
+        started = time.perf_counter()
+        result = await tx.run(cypher, params)
+        rows = [dict(record) async for record in result]
+        summary = await result.consume()
+        return rows, (time.perf_counter() - started, summary.result_available_after,
+                      summary.result_consumed_after)
+
+    async def read(self, cypher, params=None, label=None):
+        """Read in a managed transaction; transient errors are retried by the driver"""
+        started = time.perf_counter()
+        try:
+            async with self.driver.session() as session:
+                rows, timing = await session.execute_read(self._fetch, cypher, params or {})
+        except (Exception, asyncio.CancelledError) as e:
+            # CancelledError is a BaseException: a read cancelled at the retrieval deadline
+            self._record(label, cypher, time.perf_counter() - started, error=e, params=params)
+            raise
+        self._record(label, cypher, time.perf_counter() - started, len(rows), timing, params=params)
+        return rows
+
+    def _record(self, label, cypher, wall, rows=0, timing=(None, None, None), cached=False, error=None,
+                params=None):
+        if self.metrics is not None:
+            self.metrics.record(label, cypher, wall, rows, *timing, cached=cached, error=error)
+        if self.slow_log is not None and not cached:
+            # Only queues the entry; the log's own thread plans it
+            self.slow_log.observe(label, cypher, params, wall, error)
+
+    async def _gather(self, plan, labels, max_concurrency, deadline):
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(key, cypher, params):
+            async with semaphore:
+                return await self.read(cypher, params, labels.get(key))
+
+        tasks = {key: asyncio.ensure_future(bounded(key, cypher, params)) for key, cypher, params in plan}
+        if not tasks:
+            return {}, {}, []
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+
+        results, failed, timed_out = {}, {}, []
+        for key, task in tasks.items():
+            if task in pending:
+                timed_out.append(key)
+            elif task.exception() is not None:
+                failed[key] = task.exception()
+            else:
+                results[key] = task.result()
+        return results, failed, timed_out
+
+    def read_all(self, plan, cache=None, max_concurrency=None, deadline=None, labels=None):
+        """
+        Run independent (key, cypher, params) reads concurrently, at most
+        `max_concurrency` at a time, for up to `deadline` seconds.
+
+        Returns (results, failed, timed_out): rows per key for reads that
+        finished, the exception per key for reads that failed, and the keys
+        still running at the deadline (cancelled, so partial results return).
+        A Database QueryCache, if given, is consulted first and filled after.
+        `labels` maps keys to metric labels.
+        """
+        max_concurrency = max_concurrency or config.RAG_MAX_CONCURRENCY
+        labels = labels or {}
+        results = {}
+        todo = []
+        version = cache.version if cache is not None else None
+        for key, cypher, params in plan:
+            started = time.perf_counter()
+            rows = cache.get(cache.key(cypher, params)) if cache is not None else None
+            if rows is None:
+                todo.append((key, cypher, params))
+            else:
+                self._record(labels.get(key), cypher, time.perf_counter() - started, len(rows), cached=True)
+                results[key] = rows
+
+        fetched, failed, timed_out = self._run(self._gather(todo, labels, max_concurrency, deadline))
+        statements = {key: (cypher, params) for key, cypher, params in todo}
+        for key, rows in fetched.items():
+            if cache is not None:
+                cache.put(cache.key(*statements[key]), rows, version=version)
+            results[key] = rows
+
+        # Keep plan order, which the context (and the prompt) follows
+        ordered = {key: results[key] for key, _, _ in plan if key in results}
+        return ordered, failed, timed_out
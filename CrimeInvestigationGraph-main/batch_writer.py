@@ -0,0 +1,194 @@
+import config
+import re
+import threading
+import time
+
+# String literals (left alone) or a $parameter (rewritten to a row field)
+_PARAMETER = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\$(\w+)")
+
+
+def replace_parameters(cypher, replace):
+    """Substitute replace(name) for every $name in `cypher` outside string literals"""
+    return _PARAMETER.sub(lambda match: replace(match.group(1)) if match.group(1) else match.group(0), cypher)
+
+
+# String literals (left alone), STARTS WITH / ENDS WITH (string operators, left
+# alone) or a WITH clause, which must carry the row variable to later clauses
+_WITH = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b(?:STARTS|ENDS)\s+WITH\b|\b(WITH\s+(?:DISTINCT\s+)?)(?!\*)",
+                   re.IGNORECASE)
+
+
+def unwind_template(cypher):
+    """
+    Rewrite a single-row write so it applies a whole $rows list:
+    `MERGE (c:Crime {id: $id})` -> `UNWIND $rows AS row MERGE (c:Crime {id: row.id})`.
+    WITH clauses also pass the row on (`WITH c` -> `WITH row, c`). A
+    statement already using a `row` variable gets `batch_row` instead.
+    """
+    var = "batch_row" if re.search(r"\brow\b", cypher) else "row"
+    body = _WITH.sub(lambda match: f"{match.group(1)}{var}, " if match.group(1) else match.group(0), cypher)
+    return f"UNWIND $rows AS {var}\n" + replace_parameters(body, lambda name: f"{var}.{name}")
+
+
+# (single-row statement, expected unwind_template output); `python batch_writer.py` checks them
+TEMPLATE_EXAMPLES = [
+    ("MERGE (c:Crime {id: $id}) SET c.status = $status",
+     "UNWIND $rows AS row\nMERGE (c:Crime {id: row.id}) SET c.status = row.status"),
+    ("MATCH (p:Person {id: $id}) SET p.note = 'costs $5', p.alias = \"$alias\"",
+     "UNWIND $rows AS row\nMATCH (p:Person {id: row.id}) SET p.note = 'costs $5', p.alias = \"$alias\""),
+    ("MATCH (p:Person {id: $id}) SET p.note = 'it\\'s $x'",
+     "UNWIND $rows AS row\nMATCH (p:Person {id: row.id}) SET p.note = 'it\\'s $x'"),
+    ("UNWIND $names AS row MERGE (p:Person {name: row}) SET p.source = $source",
+     "UNWIND $rows AS batch_row\nUNWIND batch_row.names AS row MERGE (p:Person {name: row}) SET p.source = batch_row.source"),
+    ("MERGE (c:Crime {id: $id}) SET c += $props WITH c WHERE $location IS NOT NULL "
+     "MATCH (l:Location {name: $location}) MERGE (c)-[:OCCURRED_AT]->(l)",
+     "UNWIND $rows AS row\nMERGE (c:Crime {id: row.id}) SET c += row.props WITH row, c WHERE row.location IS NOT NULL "
+     "MATCH (l:Location {name: row.location}) MERGE (c)-[:OCCURRED_AT]->(l)"),
+    ("MATCH (p:Person) WHERE p.name STARTS WITH $prefix WITH DISTINCT p SET p.flag = $flag",
+     "UNWIND $rows AS row\nMATCH (p:Person) WHERE p.name STARTS WITH row.prefix WITH DISTINCT row, p SET p.flag = row.flag"),
+    ("MATCH (c:Crime {id: $id}) WITH * SET c.seen = 'WITH x'",
+     "UNWIND $rows AS row\nMATCH (c:Crime {id: row.id}) WITH * SET c.seen = 'WITH x'"),
+]
+
+
+def check_templates():
+    """Run TEMPLATE_EXAMPLES through unwind_template; returns the number that differ"""
+    failed = 0
+    for cypher, expected in TEMPLATE_EXAMPLES:
+        actual = unwind_template(cypher)
+        if actual != expected:
+            failed += 1
+            print(f"❌ {cypher}\n   expected: {expected}\n   got:      {actual}")
+    print(f"{'❌' if failed else '✅'} {len(TEMPLATE_EXAMPLES) - failed}/{len(TEMPLATE_EXAMPLES)} unwind templates as expected")
+    return failed
+
+
+class BatchFailure:
+    """A batch that failed to commit: its statement, rows and the error"""
+
+    def __init__(self, cypher, rows, error):
+        self.cypher = cypher
+        self.rows = rows
+        self.error = error
+
+    def __repr__(self):
+        return f"BatchFailure({len(self.rows)} rows, {self.error!r})"
+
+
+class BatchWriter:
+    """
+    Coalesces single-row writes into UNWIND batches.
+
+    write(cypher, params) has the signature of Database.write but only
+    queues the row; rows are grouped by statement and committed as one
+    UNWIND transaction once `batch_size` rows of a statement are waiting or
+    the oldest has waited `flush_interval` seconds, and on flush()/close()
+    (or leaving a `with` block). A failed batch doesn't stop the others: it
+    is kept in `failures` and passed to `on_failure`.
+
+    Statements are flushed in the order they were first queued; call
+    flush() where a later write depends on an earlier one being committed.
+    Meant for per-row MERGE/SET/CREATE statements: one that aggregates
+    (e.g. WITH count(*)) would aggregate across the whole batch.
+    """
+
+    def __init__(self, db, batch_size=None, flush_interval=None, on_failure=None, label="batch_writer"):
+        self.db = db
+        self.batch_size = batch_size or config.WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.WRITE_FLUSH_SECONDS
+        self.on_failure = on_failure
+        self.label = label
+        self.pending = {}    # cypher -> (first queued at, [params])
+        self.templates = {}  # cypher -> UNWIND statement
+        self.failures = []
+        self.batches = 0
+        self.rows = 0
+        self.lock = threading.Lock()
+        # Serializes commits, so batches of one statement land in order
+        self.flush_lock = threading.Lock()
+        self.closed = threading.Event()
+        self.thread = None
+        if self.flush_interval:
+            self.thread = threading.Thread(target=self._flush_periodically, daemon=True)
+            self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, cypher, params=None, label=None):
+        """Queue one write; `label` is accepted for Database.write compatibility"""
+        if self.closed.is_set():
+            raise RuntimeError("BatchWriter is closed")
+        with self.lock:
+            queued = self.pending.get(cypher)
+            if queued is None:
+                queued = self.pending[cypher] = (time.monotonic(), [])
+            queued[1].append(params or {})
+            full = len(queued[1]) >= self.batch_size
+        if full:
+            self._flush([cypher])
+
+    def flush(self):
+        """Commit everything queued; returns the number of failed batches"""
+        with self.lock:
+            statements = list(self.pending)
+        return self._flush(statements)
+
+    def _flush(self, statements):
+        failed = 0
+        with self.flush_lock:
+            for cypher in statements:
+                with self.lock:
+                    queued = self.pending.pop(cypher, None)
+                if queued is None:
+                    continue
+                rows = queued[1]
+                for start in range(0, len(rows), self.batch_size):
+                    failed += not self._commit(cypher, rows[start:start + self.batch_size])
+        return failed
+
+    def _commit(self, cypher, rows):
+        template = self.templates.get(cypher)
+        if template is None:
+            template = self.templates[cypher] = unwind_template(cypher)
+        try:
+            self.db.write(template, {"rows": rows}, label=self.label)
+        except Exception as e:
+            failure = BatchFailure(cypher, rows, e)
+            self.failures.append(failure)
+            print(f"⚠️ Batch of {len(rows)} writes failed: {e}")
+            if self.on_failure:
+                self.on_failure(failure)
+            return False
+        self.batches += 1
+        self.rows += len(rows)
+        return True
+
+    def _flush_periodically(self):
+        while not self.closed.wait(self.flush_interval / 2):
+            now = time.monotonic()
+            with self.lock:
+                due = [cypher for cypher, (queued_at, _) in self.pending.items()
+                       if now - queued_at >= self.flush_interval]
+            if due:
+                self._flush(due)
+
+    def close(self):
+        """Stop the flush timer and commit whatever is still queued"""
+        self.closed.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.flush()
+
+    def stats(self):
+        with self.lock:
+            queued = sum(len(rows) for _, rows in self.pending.values())
+        return {"batches": self.batches, "rows": self.rows, "queued": queued, "failed_batches": len(self.failures)}
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(1 if check_templates() else 0)
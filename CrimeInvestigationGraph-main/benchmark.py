@@ -0,0 +1,257 @@
+from load_data import load_dataset
+from scale_generator import generate_scaled_dataset
+from llm_stub import StubClient
+from query_metrics import QueryMetrics
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+# Questions per retrieval category, covering every branch of the planner
+QUESTIONS = {
+    "organizations": ["Which criminal organizations operate in Chicago?",
+                      "Who are the members of the gang West Side Crew?"],
+    "evidence": ["What evidence do we have?", "Is there forensic proof linking suspects?"],
+    "investigators": ["Which detective is assigned to the most cases?"],
+    "modus_operandi": ["Which crimes share a similar method or signature?"],
+    "vehicles_weapons": ["Were any stolen cars or guns involved?"],
+    "location": ["What crimes happened in Pilsen?", "Who are the suspects in Englewood and Loop?"],
+    "person": ["Who does Michael Johnson know?"],
+    "patterns": ["Where are the hotspots with the most crime?",
+                 "Who are the repeat offenders and how are they connected?"],
+}
+
+# Map layer combinations: (name, show_heatmap, show_connections, show_clusters)
+MAP_LAYERS = [
+    ("markers", False, False, False),
+    ("heatmap", True, False, False),
+    ("connections", False, True, False),
+    ("clusters", False, False, True),
+    ("all", True, True, True),
+]
+
+
+def timed(fn, repeat):
+    """Run fn `repeat` times; wall-clock stats in milliseconds plus the last result"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    stats = {"min_ms": min(times), "median_ms": statistics.median(times),
+             "mean_ms": statistics.mean(times), "runs": repeat}
+    return stats, result
+
+
+def open_database(backend):
+    if backend == "neo4j":
+        from database import Database
+        return Database(metrics=QueryMetrics())
+    from memory_graph import MemoryDatabase
+    return MemoryDatabase(metrics=QueryMetrics())
+
+
+def bench_load(db, backend, scale, seed, batch_size):
+    """Generate and load one scale; rows/s for the whole dataset"""
+    if backend == "neo4j":
+        from schema import ensure_schema
+        db.clear_all()
+        ensure_schema(db)
+    else:
+        db.clear_all()
+
+    dataset = generate_scaled_dataset(scale, seed=seed)
+    rows = [0]
+
+    def counting(stream):
+        for row in stream:
+            rows[0] += 1
+            yield row
+
+    counted = {"nodes": {label: counting(stream) for label, stream in dataset["nodes"].items()},
+               "relationships": {name: counting(stream) for name, stream in dataset["relationships"].items()}}
+    started = time.perf_counter()
+    load_dataset(db, counted, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    return {"rows": rows[0], "seconds": elapsed, "rows_per_s": rows[0] / elapsed if elapsed else None}
+
+
+def bench_retrieval(rag, repeat):
+    """
+    _smart_retrieve latency per question category, a full ask with the stub
+    LLM, and a streamed ask's time to first answer text
+    """
+    results = {}
+    for category, questions in QUESTIONS.items():
+        retrieve = []
+        ask = []
+        first_token = []
+        for question in questions:
+            stats, context = timed(lambda: rag._smart_retrieve(question, []), repeat)
+            retrieve.append(stats["median_ms"])
+            stats, _ = timed(lambda: rag.ask_with_context(question, []), repeat)
+            ask.append(stats["median_ms"])
+            ttft = []
+            for _ in range(repeat):
+                for _ in rag.ask_stream(question, []):
+                    pass
+                ttft.append(rag.turns[-1]["ttft_ms"])
+            first_token.append(statistics.median(ttft))
+        results[category] = {"retrieve_median_ms": statistics.mean(retrieve),
+                             "ask_median_ms": statistics.mean(ask),
+                             "stream_ttft_median_ms": statistics.mean(first_token),
+                             "questions": len(questions)}
+    return results
+
+
+def bench_network(db, repeat):
+    from network_viz import create_3d_network, create_network
+
+    results = {}
+    people = db.read_named("network.persons")
+    person = people[0]["name"] if people else ""
+    builds = {
+        "explorer_all": ("network.graph", {"limit": 100}),
+        "explorer_gangs": ("network.gang_graph", {"limit": 100}),
+        "explorer_person": ("network.person_graph", {"person": person, "limit": 100}),
+    }
+    for name, (query_name, params) in builds.items():
+        results[name], _ = timed(lambda: create_network(db, query_name, params), repeat)
+    results["3d_all"], _ = timed(lambda: create_3d_network(db, limit=100), repeat)
+    results["3d_by_type"], _ = timed(lambda: create_3d_network(db, crime_type="Theft", limit=100), repeat)
+    return results
+
+
+def bench_map(crimes, repeat):
+    from enhanced_map import create_advanced_crime_map
+
+    results = {}
+    for name, heatmap, connections, clusters in MAP_LAYERS:
+        # Rendering to HTML is part of what the browser waits for
+        results[name], _ = timed(lambda: create_advanced_crime_map(
+            crimes, show_heatmap=heatmap, show_connections=connections, show_clusters=clusters
+        ).get_root().render(), repeat)
+    return results
+
+
+def bench_ml(db, repeat):
+    from predictive import crime_frame, predict_crime_hotspots
+
+    # Columnar read straight into the vectorized pooling, as the predictor is meant to be fed
+    stats, hotspots = timed(lambda: predict_crime_hotspots(crime_frame(db)), repeat)
+    stats["hotspots"] = len(hotspots) if hotspots else 0
+    return stats
+
+
+def run_scale(args, scale):
+    print(f"\n📏 Scale {scale:g} ({args.backend})")
+    from graph_rag import GraphRAG
+    from answer_cache import AnswerCache
+    from enhanced_map import map_crimes
+
+    db = open_database(args.backend)
+    rag = None
+    result = {}
+    try:
+        result["load"] = bench_load(db, args.backend, scale, args.seed, args.batch_size)
+        print(f"   📦 load: {result['load']['rows']:,} rows at {result['load']['rows_per_s']:,.0f} rows/s")
+
+        # Repeated asks must reach the LLM, so the answer cache is off
+        rag = GraphRAG(db, client=StubClient(), answer_cache=AnswerCache(max_entries=0))
+        result["retrieval"] = bench_retrieval(rag, args.repeat)
+        print("   💬 retrieval done")
+
+        result["network"] = bench_network(db, args.repeat)
+        print("   🕸️ network done")
+
+        crimes = list(map_crimes(db))
+        result["crimes"] = len(crimes)
+        result["map"] = bench_map(crimes, args.repeat)
+        print("   🗺️ map done")
+
+        result["predict_hotspots"] = bench_ml(db, args.repeat)
+        print("   🔮 hotspots done")
+
+        result["queries"] = db.metrics.summary()
+    finally:
+        if rag is not None:
+            rag.close()
+        db.close()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except Exception:
+        return None
+
+
+def _flatten(result, prefix=""):
+    """{"a": {"b_ms": 1}} -> {"a.b_ms": 1} for the timing fields"""
+    flat = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif key.endswith("_ms") or key == "rows_per_s":
+            flat[prefix + key] = value
+    return flat
+
+
+def compare(baseline_path, current):
+    """Print every timing that moved more than 10% against a baseline run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n📊 Against {baseline_path} (commit {baseline.get('commit')})")
+    for scale, result in current["scales"].items():
+        old = _flatten(baseline["scales"].get(scale, {}))
+        for key, value in _flatten(result).items():
+            if key.startswith("queries.") or key not in old or not old[key] or value is None:
+                continue
+            change = value / old[key] - 1
+            # Throughput regresses when it drops, latency when it grows
+            worse = change < 0 if key.endswith("rows_per_s") else change > 0
+            if abs(change) > 0.10:
+                print(f"   {'🔴' if worse else '🟢'} scale {scale} {key}: {old[key]:,.1f} → {value:,.1f} ({change:+.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading, retrieval, rendering and ML at several scales")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10, 50],
+                        help="ScaleGenerator scale factors to run")
+    parser.add_argument("--backend", choices=["memory", "neo4j"], default="memory",
+                        help="memory_graph.MemoryDatabase, or the configured Neo4j (which is cleared!)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing; the median is compared")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000, help="loader rows per transaction")
+    parser.add_argument("--output", help="results file (default benchmark-<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "scales": {f"{scale:g}": run_scale(args, scale) for scale in args.scales}
+    }
+
+    output = args.output or f"benchmark-{commit or 'local'}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"\n💾 Results written to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
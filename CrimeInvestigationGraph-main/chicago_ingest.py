@@ -0,0 +1,231 @@
+from batch_writer import BatchWriter, unwind_template
+from database import Database
+from schema import ensure_schema
+from sklearn.neighbors import BallTree
+import pandas as pd
+import numpy as np
+import config
+import argparse
+import io
+import queue
+import sys
+import threading
+import time
+
+# Columns of the City of Chicago "Crimes - 2001 to Present" extract that we map
+COLUMNS = {
+    "ID": "string",
+    "Case Number": "string",
+    "Date": "string",
+    "Block": "string",
+    "Primary Type": "string",
+    "Description": "string",
+    "Location Description": "string",
+    "Arrest": "boolean",
+    "Domestic": "boolean",
+    "District": "Int64",
+    "Latitude": "float64",
+    "Longitude": "float64",
+}
+
+DATE_FORMAT = "%m/%d/%Y %I:%M:%S %p"
+EARTH_RADIUS_KM = 6371.0
+
+# Same severity buckets as the synthetic generator
+SEVERE_TYPES = {"Assault", "Robbery", "Weapons Violation", "Homicide", "Criminal Sexual Assault", "Kidnapping"}
+MINOR_TYPES = {"Theft", "Criminal Trespass"}
+
+# One incident; live updates write it per row through a BatchWriter
+CRIME_WRITE = """
+    MERGE (c:Crime {id: $id})
+    SET c += $props
+    WITH c
+    WHERE $location IS NOT NULL
+    MATCH (l:Location {name: $location})
+    MERGE (c)-[:OCCURRED_AT]->(l)
+"""
+
+# The same write over a whole $rows batch, for bulk ingest
+CRIME_STATEMENT = unwind_template(CRIME_WRITE)
+
+# Sentinel telling the writer the reader has finished
+_DONE = object()
+
+
+class LocationIndex:
+    """Nearest-Location lookup on a haversine BallTree built from the graph"""
+
+    def __init__(self, db, max_distance_km=5.0):
+        rows = db.query("""
+            MATCH (l:Location)
+            WHERE l.latitude IS NOT NULL AND l.longitude IS NOT NULL
+            RETURN l.name as name, l.latitude as lat, l.longitude as lon
+        """)
+        if not rows:
+            raise RuntimeError("No Location nodes with coordinates; load locations first")
+        self.names = np.array([r['name'] for r in rows], dtype=object)
+        self.tree = BallTree(np.radians([[r['lat'], r['lon']] for r in rows]), metric="haversine")
+        self.max_distance = max_distance_km / EARTH_RADIUS_KM
+
+    def nearest(self, lat, lon):
+        """Vectorized snap; returns a name per point, or None if missing/too far"""
+        result = np.full(len(lat), None, dtype=object)
+        valid = ~(np.isnan(lat) | np.isnan(lon))
+        if valid.any():
+            points = np.radians(np.column_stack([lat[valid], lon[valid]]))
+            distance, index = self.tree.query(points, k=1)
+            names = self.names[index[:, 0]]
+            names[distance[:, 0] > self.max_distance] = None
+            result[valid] = names
+        return result
+
+
+def _severity(crime_type):
+    if crime_type in SEVERE_TYPES:
+        return "severe"
+    if crime_type in MINOR_TYPES:
+        return "minor"
+    return "moderate"
+
+
+def to_rows(chunk, locations):
+    """Map one CSV chunk onto Crime rows for CRIME_STATEMENT"""
+    chunk = chunk.dropna(subset=["ID", "Primary Type"])
+    when = pd.to_datetime(chunk["Date"], format=DATE_FORMAT, errors="coerce")
+    crime_type = chunk["Primary Type"].str.title()
+    frame = pd.DataFrame({
+        "id": "CPD" + chunk["ID"],
+        "type": crime_type,
+        "date": when.dt.strftime("%Y-%m-%d"),
+        "time": when.dt.strftime("%H:%M"),
+        "case_number": chunk["Case Number"],
+        "severity": crime_type.map(_severity),
+        "status": np.where(chunk["Arrest"].fillna(False), "solved", "reported"),
+        "description": chunk["Description"].str.capitalize() + " at " + chunk["Block"].fillna("unknown block"),
+        "premises": chunk["Location Description"],
+        "domestic": chunk["Domestic"],
+        "police_district": chunk["District"],
+        "latitude": chunk["Latitude"],
+        "longitude": chunk["Longitude"],
+        "source": "chicago_data_portal",
+    })
+    snapped = locations.nearest(chunk["Latitude"].to_numpy(dtype=float, na_value=np.nan),
+                                chunk["Longitude"].to_numpy(dtype=float, na_value=np.nan))
+
+    # Drop missing values so SET += never writes nulls
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    for props, location in zip(records, snapped):
+        yield {
+            "id": props["id"],
+            "location": location,
+            "props": {k: v for k, v in props.items() if v is not None}
+        }
+
+
+def _read(path, chunk_size, locations, out, limit):
+    """Reader thread: parse chunks and hand them over; blocks while the writer is behind"""
+    try:
+        read = 0
+        for chunk in pd.read_csv(path, usecols=list(COLUMNS), dtype=COLUMNS, chunksize=chunk_size):
+            if limit is not None:
+                chunk = chunk.head(limit - read)
+            out.put(list(to_rows(chunk, locations)))
+            read += len(chunk)
+            if limit is not None and read >= limit:
+                break
+    except Exception as e:
+        out.put(e)
+    finally:
+        out.put(_DONE)
+
+
+def ingest(db, path, chunk_size=50000, batch_size=None, queue_depth=4, limit=None):
+    """
+    Stream a Chicago crimes CSV into the graph.
+
+    A reader thread parses `chunk_size` rows at a time into a bounded queue;
+    the writer sends them as UNWIND batches. When the writer falls behind the
+    queue fills and the reader blocks, so at most `queue_depth` chunks are in
+    memory whatever the file size.
+    """
+    batch_size = batch_size or config.LOAD_BATCH_SIZE
+    locations = LocationIndex(db)
+    chunks = queue.Queue(maxsize=queue_depth)
+    reader = threading.Thread(target=_read, args=(path, chunk_size, locations, chunks, limit), daemon=True)
+    reader.start()
+
+    written = 0
+    started = time.perf_counter()
+    while True:
+        item = chunks.get()
+        if item is _DONE:
+            break
+        if isinstance(item, Exception):
+            raise item
+        written += db.write_batches(CRIME_STATEMENT, item, batch_size)
+        rate = written / max(time.perf_counter() - started, 1e-9)
+        print(f"   ✅ {written:,} crimes ({rate:,.0f} rows/s, {chunks.qsize()} chunks queued)")
+
+    reader.join()
+    return written
+
+
+def follow(db, stream, batch_size=None, flush_interval=None):
+    """
+    Apply a live feed of incidents: CSV lines with the extract's header,
+    new or updated (e.g. an arrest turning a crime "solved"), read as they
+    arrive. Each incident is one CRIME_WRITE on a BatchWriter, which commits
+    them in UNWIND batches once `batch_size` are waiting or every
+    `flush_interval` seconds, so a slow trickle still lands promptly.
+    Returns (incidents written, failed batches).
+    """
+    locations = LocationIndex(db)
+    header = stream.readline()
+    with BatchWriter(db, batch_size, flush_interval, label="chicago_follow") as writer:
+        for line in stream:
+            if not line.strip():
+                continue
+            chunk = pd.read_csv(io.StringIO(header + line), usecols=list(COLUMNS), dtype=COLUMNS)
+            for row in to_rows(chunk, locations):
+                writer.write(CRIME_WRITE, row)
+    return writer.rows, len(writer.failures)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the City of Chicago crimes CSV into Neo4j")
+    parser.add_argument("path", help="CSV extract from the Chicago data portal ('-' for stdin with --follow)")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="CSV rows parsed at a time")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help=f"rows per transaction (default {config.LOAD_BATCH_SIZE}, "
+                             f"or {config.WRITE_BATCH_SIZE} with --follow)")
+    parser.add_argument("--queue-depth", type=int, default=4, help="parsed chunks allowed to wait for the writer")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many CSV rows")
+    parser.add_argument("--follow", action="store_true",
+                        help="apply the CSV as a live feed of incident updates, line by line, until it ends")
+    parser.add_argument("--flush-interval", type=float, default=config.WRITE_FLUSH_SECONDS,
+                        help="with --follow, longest an update waits before its batch is committed (seconds)")
+    args = parser.parse_args()
+
+    db = Database()
+    ensure_schema(db)
+    if args.follow:
+        print(f"👀 Following {args.path}")
+        stream = sys.stdin if args.path == "-" else open(args.path, newline="")
+        try:
+            written, failed = follow(db, stream, args.batch_size, args.flush_interval)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        print(f"🎉 Applied {written:,} incident updates" + (f", ⚠️ {failed} batches failed" if failed else ""))
+        db.close()
+        return
+
+    print(f"🚀 Ingesting {args.path}")
+    started = time.perf_counter()
+    total = ingest(db, args.path, args.chunk_size, args.batch_size, args.queue_depth, args.limit)
+    print(f"🎉 Ingested {total:,} crimes in {time.perf_counter() - started:.1f}s")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
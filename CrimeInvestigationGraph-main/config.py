@@ -9,3 +9,73 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_BASE_URL = "https://openrouter.ai/api/v1"
 MODEL_NAME = "openai/gpt-oss-20b:free"
+
+# Rows per transaction for load_data.py --bulk
+LOAD_BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "5000"))
+
+# Concurrent write transactions for the parallel relationship loader. Fixed,
+# not this machine's core count: what matters is how much concurrent write
+# load the Neo4j server takes; raise it toward the server's cores if it keeps up
+LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", "4"))
+
+# Progress file for load_data.py --incremental, removed once a run completes
+INGEST_CHECKPOINT = os.getenv("INGEST_CHECKPOINT", ".ingest_checkpoint.json")
+
+# Driver connection pool; one pool is shared by every session of a Database
+NEO4J_POOL_SIZE = int(os.getenv("NEO4J_POOL_SIZE", "50"))
+NEO4J_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60"))
+NEO4J_CONNECTION_LIFETIME = float(os.getenv("NEO4J_CONNECTION_LIFETIME", "3600"))
+
+# Seconds Database.read/write keep retrying transient errors before giving up
+NEO4J_RETRY_TIME = float(os.getenv("NEO4J_RETRY_TIME", "30"))
+
+# Records pulled per round trip by Database.stream
+STREAM_FETCH_SIZE = int(os.getenv("STREAM_FETCH_SIZE", "1000"))
+
+# Opt-in read cache (Database(cache=QueryCache())): memory bound and default TTL
+QUERY_CACHE_MB = int(os.getenv("QUERY_CACHE_MB", "64"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "300"))
+
+# GraphRAG retrieval: run independent reads concurrently on the async driver,
+# at most RAG_MAX_CONCURRENCY at once, returning whatever finished by the deadline
+RAG_ASYNC = os.getenv("RAG_ASYNC", "true").lower() == "true"
+RAG_MAX_CONCURRENCY = int(os.getenv("RAG_MAX_CONCURRENCY", "8"))
+RAG_DEADLINE_SECONDS = float(os.getenv("RAG_DEADLINE_SECONDS", "5"))
+# Run a turn's whole retrieval plan as one Cypher statement (one round trip);
+# false, or a failed or timed-out plan, sends each retrieval separately,
+# concurrently when RAG_ASYNC
+RAG_COMPILED_PLAN = os.getenv("RAG_COMPILED_PLAN", "true").lower() == "true"
+# Share of RAG_DEADLINE_SECONDS the compiled plan may take before the server
+# aborts it; the rest is left for the fallback reads
+RAG_PLAN_DEADLINE_SHARE = float(os.getenv("RAG_PLAN_DEADLINE_SHARE", "0.5"))
+# Estimated tokens of retrieved data sent to the LLM per turn
+LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "1500"))
+
+# BatchWriter: rows per UNWIND batch, and seconds a queued write may wait
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "500"))
+WRITE_FLUSH_SECONDS = float(os.getenv("WRITE_FLUSH_SECONDS", "1"))
+
+# Slow-query log: statements over SLOW_QUERY_MS are logged with their plan
+# (PROFILE for reads when SLOW_QUERY_PROFILE, else EXPLAIN) to a rotating file
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+SLOW_QUERY_PROFILE = os.getenv("SLOW_QUERY_PROFILE", "true").lower() == "true"
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")
+SLOW_QUERY_LOG_MB = float(os.getenv("SLOW_QUERY_LOG_MB", "10"))
+
+# GraphRAG entity dictionary: reload names at least this often (writes through
+# the app's Database reload it immediately)
+ENTITY_REFRESH_SECONDS = float(os.getenv("ENTITY_REFRESH_SECONDS", "300"))
+
+# Graph statistics store: rebuilt at least this often, to catch writes from
+# other processes (writes through a Database update it as they commit)
+GRAPH_STATS_REFRESH_SECONDS = float(os.getenv("GRAPH_STATS_REFRESH_SECONDS", "300"))
+
+# GraphRAG: answered turns whose latency (retrieval, first token, total) is kept
+RAG_TURN_HISTORY = int(os.getenv("RAG_TURN_HISTORY", "200"))
+
+# GraphRAG answer cache: LLM answers by normalized question and retrieved
+# context, newest ANSWER_CACHE_SIZE kept (0 disables) for ANSWER_CACHE_TTL
+# seconds (0: until evicted); ANSWER_CACHE_PATH also keeps them in SQLite
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "256"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", "")
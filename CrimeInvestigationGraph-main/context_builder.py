@@ -0,0 +1,108 @@
+import config
+import re
+
+# Word pieces, numbers and single punctuation marks, roughly as a BPE tokenizer splits text
+_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+# Question words that say nothing about which rows matter
+_STOPWORDS = {"about", "what", "which", "where", "when", "with", "there", "their", "them", "they",
+              "that", "this", "those", "have", "does", "from", "show", "tell", "give", "list", "were"}
+
+
+def estimate_tokens(text):
+    """
+    Local estimate of a text's LLM token count: one token per number,
+    punctuation mark or word of up to 4 letters, one more per 4 letters
+    beyond (and per 3 digits). Needs no tokenizer files or network.
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        tokens += 1 + (len(piece) - 1) // 4 if piece.isalpha() else 1 + (len(piece) - 1) // 3
+    return tokens
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.2f}".rstrip("0").rstrip(".")
+    if isinstance(value, dict):
+        return ", ".join(f"{k}={_cell(v)}" for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ", ".join(_cell(v) for v in value)
+    return " ".join(str(value).replace("|", "/").split())
+
+
+def _terms(question, entities):
+    """(entity names, other question words), lowercased"""
+    names = {name.lower() for names in (entities or {}).values() for name in names if name}
+    words = {w for w in re.findall(r"[a-z0-9]+", question.lower()) if len(w) >= 4 and w not in _STOPWORDS}
+    return names, words - names
+
+
+def _rank(rows, names, words):
+    """Rows most relevant first: entity mentions count 3, question words 1; ties keep query order"""
+    def score(row):
+        text = " ".join(_cell(v) for v in row.values()).lower()
+        return 3 * sum(name in text for name in names) + sum(word in text for word in words)
+    scored = [(score(row), i, row) for i, row in enumerate(rows)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [row for _, _, row in scored], (scored[0][0] if scored else 0)
+
+
+def build_context(context, question="", entities=None, max_tokens=None):
+    """
+    Serialize retrieved context for the LLM prompt within `max_tokens`
+    (default LLM_CONTEXT_TOKENS).
+
+    Each block becomes a pipe-separated table: one header line with the
+    column names, then one line per row, so keys aren't repeated per row.
+    Rows are ranked by how many of the question's entities and words they
+    mention, and blocks with the best matches come first. Rows are then
+    taken round-robin, each block's next-best row per round, until the
+    budget is spent. Block titles say how many rows were left out.
+    """
+    max_tokens = max_tokens or config.LLM_CONTEXT_TOKENS
+    names, words = _terms(question, entities)
+
+    lines = []
+    blocks = []
+    for key, value in context.items():
+        if not value:
+            continue
+        title = key.replace('_', ' ').title()
+        if isinstance(value, dict):
+            # Single-record blocks (database_stats) are always sent
+            lines.append(f"## {title}: " + "; ".join(f"{k}: {_cell(v)}" for k, v in value.items()))
+            continue
+        rows, best = _rank(value, names, words)
+        columns = list(rows[0])
+        blocks.append({"title": title, "header": "|".join(columns), "columns": columns,
+                       "rows": rows, "best": best, "taken": []})
+    blocks.sort(key=lambda block: -block["best"])
+
+    used = sum(estimate_tokens(line) + 1 for line in lines)
+    open_blocks = list(blocks)
+    while open_blocks:
+        for block in list(open_blocks):
+            row = block["rows"][len(block["taken"])]
+            line = "|".join(_cell(row.get(c)) for c in block["columns"])
+            cost = estimate_tokens(line) + 1
+            if not block["taken"]:
+                # Title (with its "n of m rows" note) and column header
+                cost += estimate_tokens(f"## {block['title']} (999 of 999 rows)\n{block['header']}") + 2
+            if used + cost > max_tokens:
+                open_blocks.remove(block)
+                continue
+            used += cost
+            block["taken"].append(line)
+            if len(block["taken"]) == len(block["rows"]):
+                open_blocks.remove(block)
+
+    for block in blocks:
+        if not block["taken"]:
+            continue
+        shown, total = len(block["taken"]), len(block["rows"])
+        note = f"{total} rows" if shown == total else f"{shown} of {total} rows"
+        lines.append(f"## {block['title']} ({note})\n{block['header']}\n" + "\n".join(block["taken"]))
+    return "\n".join(lines)
@@ -0,0 +1,160 @@
+from database import Database
+from graph_model import NODE_KEYS, RELATIONSHIP_STAGES
+from itertools import chain
+import argparse
+import csv
+import gzip
+import json
+import os
+
+MANIFEST = "manifest.json"
+
+# Python types that need a typed column in the import header (strings are the default)
+TYPE_SUFFIX = {bool: "boolean", int: "int", float: "float"}
+
+
+def _open(path, compress):
+    if compress:
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    return open(path, "w", newline="", encoding="utf-8")
+
+
+def _column(name, value):
+    suffix = TYPE_SUFFIX.get(type(value))
+    return f"{name}:{suffix}" if suffix else name
+
+
+def _value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _write_files(out_dir, stem, header, rows, compress):
+    """Write a header file plus a data file, streaming rows; returns (paths, count)"""
+    header_path = os.path.join(out_dir, f"{stem}_header.csv")
+    data_path = os.path.join(out_dir, f"{stem}.csv" + (".gz" if compress else ""))
+
+    with open(header_path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(header)
+
+    count = 0
+    with _open(data_path, compress) as f:
+        writer = csv.writer(f)
+        for row in rows:
+            writer.writerow([_value(v) for v in row])
+            count += 1
+
+    return [os.path.abspath(header_path), os.path.abspath(data_path)], count
+
+
+def write_nodes(out_dir, label, rows, compress=False):
+    """Export one label as `neo4j-admin import` node files"""
+    key = NODE_KEYS[label]
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None, 0
+
+    props = [p for p in first if p != key]
+    header = [f"{key}:ID({label})"] + [_column(p, first[p]) for p in props]
+    values = ([row[key]] + [row.get(p) for p in props] for row in chain([first], rows))
+    return _write_files(out_dir, label.lower(), header, values, compress)
+
+
+def write_relationships(out_dir, stage, rows, compress=False):
+    """Export one relationship stage as `neo4j-admin import` relationship files"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None, 0
+
+    header = [f":START_ID({stage['start']})", f":END_ID({stage['end']})"]
+    header += [_column(p, first[p]) for p in stage["props"]]
+    values = ([row["start"], row["end"]] + [row.get(p) for p in stage["props"]]
+              for row in chain([first], rows))
+    return _write_files(out_dir, stage["name"], header, values, compress)
+
+
+def export_dataset(dataset, out_dir, compress=False, database="neo4j"):
+    """
+    Stream a generated dataset into CSV files for `neo4j-admin database import`.
+
+    Writes a manifest with the expected node/relationship counts and the import
+    command, and returns it.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"nodes": {}, "relationships": {}}
+    args = []
+
+    print(f"📤 Exporting nodes to {out_dir}...")
+    for label in NODE_KEYS:
+        paths, count = write_nodes(out_dir, label, dataset["nodes"][label], compress)
+        if paths:
+            args.append(f"--nodes={label}={','.join(paths)}")
+            manifest["nodes"][label] = count
+        print(f"   ✅ {label}: {count:,} rows")
+
+    print("📤 Exporting relationships...")
+    for stage in RELATIONSHIP_STAGES:
+        paths, count = write_relationships(out_dir, stage, dataset["relationships"][stage["name"]], compress)
+        if paths:
+            args.append(f"--relationships={stage['type']}={','.join(paths)}")
+            rel_type = stage["type"]
+            manifest["relationships"][rel_type] = manifest["relationships"].get(rel_type, 0) + count
+        print(f"   ✅ {stage['name']} ({stage['type']}): {count:,} rows")
+
+    manifest["command"] = " ".join(["neo4j-admin database import full", "--overwrite-destination"] + args + [database])
+
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\n🧾 Import with (database stopped):\n{manifest['command']}")
+    return manifest
+
+
+def verify_import(db, manifest):
+    """
+    Compare an imported graph with the counts recorded at export time,
+    grouped the same way as load_data's FINAL DATABASE STATISTICS.
+    """
+    nodes = {s['label']: s['count'] for s in db.query("""
+        MATCH (n)
+        WITH labels(n)[0] as label, count(n) as count
+        RETURN label, count
+    """)}
+    rels = {s['rel_type']: s['count'] for s in db.query("""
+        MATCH ()-[r]->()
+        WITH type(r) as rel_type, count(r) as count
+        RETURN rel_type, count
+    """)}
+
+    mismatches = []
+    for kind, expected, actual in (("node", manifest["nodes"], nodes), ("relationship", manifest["relationships"], rels)):
+        for name in sorted(set(expected) | set(actual)):
+            if expected.get(name, 0) != actual.get(name, 0):
+                mismatches.append(f"{kind} {name}: expected {expected.get(name, 0)}, found {actual.get(name, 0)}")
+
+    if mismatches:
+        print("❌ Imported graph does not match the export:")
+        for m in mismatches:
+            print(f"   {m}")
+        return False
+
+    print(f"✅ Imported graph matches the export "
+          f"({sum(nodes.values()):,} nodes, {sum(rels.values()):,} relationships)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check an imported graph against an export manifest")
+    parser.add_argument("--verify", metavar="DIR", required=True, help="export directory containing manifest.json")
+    args = parser.parse_args()
+
+    with open(os.path.join(args.verify, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    db = Database()
+    ok = verify_import(db, manifest)
+    db.close()
+    raise SystemExit(0 if ok else 1)
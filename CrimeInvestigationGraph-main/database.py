@@ -1,21 +1,391 @@
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, READ_ACCESS, WRITE_ACCESS, unit_of_work
+from itertools import islice
 import config
+import queries
+import re
+import time
+
+# Clauses that make an auto-commit query() a write, which invalidates the cache
+WRITE_CLAUSES = re.compile(
+    r"\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|FOREACH)\b|\bLOAD\s+CSV\b|\bIN\s+TRANSACTIONS\b",
+    re.IGNORECASE
+)
+
+# Schema DDL matches WRITE_CLAUSES but changes no data
+SCHEMA_STATEMENT = re.compile(r"^\s*(CREATE|DROP)\s+(\w+\s+)?(CONSTRAINT|INDEX)\b", re.IGNORECASE)
+
+
+def columns_from_rows(rows):
+    """(keys, columns) from a list of row dicts"""
+    keys = list(rows[0]) if rows else []
+    return keys, [[row[key] for row in rows] for key in keys]
+
+
+def to_frame(keys, columns, dtypes=None):
+    """pandas DataFrame from (keys, columns); `dtypes` maps columns to numpy dtypes"""
+    import numpy as np
+    import pandas as pd
+
+    dtypes = dtypes or {}
+    data = {key: np.asarray(column, dtype=dtypes[key]) if key in dtypes else column
+            for key, column in zip(keys, columns)}
+    return pd.DataFrame(data, columns=keys)
+
+
+def to_arrow(keys, columns, dtypes=None):
+    """pyarrow Table from (keys, columns); nulls stay null in typed columns"""
+    import numpy as np
+    import pyarrow as pa
+
+    dtypes = dtypes or {}
+    return pa.table({key: pa.array(column, type=pa.from_numpy_dtype(np.dtype(dtypes[key])) if key in dtypes else None)
+                     for key, column in zip(keys, columns)})
+
 
 class Database:
-    def __init__(self):
+    def __init__(self, pool_size=None, acquisition_timeout=None, connection_lifetime=None,
+                 cache=None, metrics=None, slow_log=None, stats=None):
+        # Optional QueryCache for read()/read_many() results
+        self.cache = cache
+        # Optional QueryMetrics recording every call, tagged by `label`
+        self.metrics = metrics
+        # Optional SlowQueryLog; plans its slow statements through this driver
+        self.slow_log = slow_log
+        if slow_log is not None and slow_log.db is None:
+            slow_log.db = self
+        # Materialized graph aggregates, kept current by write_batches; pass
+        # one GraphStats to share it between Databases on the same graph
+        if stats is None:
+            from graph_stats import GraphStats
+            stats = GraphStats()
+        self.stats = stats
+        if stats.db is None:
+            stats.db = self
+        self.pool_size = pool_size or config.NEO4J_POOL_SIZE
+        self.acquisition_timeout = acquisition_timeout or config.NEO4J_ACQUISITION_TIMEOUT
+        self.connection_lifetime = connection_lifetime or config.NEO4J_CONNECTION_LIFETIME
         self.driver = GraphDatabase.driver(
             config.NEO4J_URI,
-            auth=(config.NEO4J_USER, config.NEO4J_PASSWORD)
+            auth=(config.NEO4J_USER, config.NEO4J_PASSWORD),
+            max_connection_pool_size=self.pool_size,
+            connection_acquisition_timeout=self.acquisition_timeout,
+            max_connection_lifetime=self.connection_lifetime,
+            max_transaction_retry_time=config.NEO4J_RETRY_TIME
         )
-    
+
     def close(self):
         self.driver.close()
+
+    def query(self, cypher, params=None, label=None):
+        """Auto-commit query; needed for CALL ... IN TRANSACTIONS, otherwise prefer read/write"""
+        started = time.perf_counter()
+        try:
+            with self.driver.session() as session:
+                rows, timing = self._fetch(session, cypher, params or {})
+        except Exception as e:
+            self._record(label, cypher, time.perf_counter() - started, error=e, params=params)
+            raise
+        finally:
+            if WRITE_CLAUSES.search(cypher) and not SCHEMA_STATEMENT.match(cypher):
+                self.invalidate()
+        self._record(label, cypher, time.perf_counter() - started, len(rows), timing, params=params)
+        return rows
+
+    def invalidate(self, stats_current=False):
+        """
+        Drop cached reads; every write path through Database calls this.
+        Graph statistics are rebuilt on their next read unless the write
+        already updated them (`stats_current`).
+        """
+        if self.cache is not None:
+            self.cache.invalidate()
+        if not stats_current:
+            self.stats.invalidate()
+
+    def stream(self, cypher, params=None, fetch_size=None, label=None):
+        """
+        Yield records as dicts while the session stays open, pulling
+        `fetch_size` records per round trip instead of materializing the
+        result. Consume or close the generator to release the connection.
+        Not retried: records already yielded cannot be taken back.
+        """
+        fetch_size = fetch_size or config.STREAM_FETCH_SIZE
+        started = time.perf_counter()
+        rows = 0
+        timing = (None, None, None)
+        with self.driver.session(default_access_mode=READ_ACCESS, fetch_size=fetch_size) as session:
+            try:
+                result = session.run(cypher, params or {})
+                for record in result:
+                    rows += 1
+                    yield dict(record)
+                summary = result.consume()
+                timing = (time.perf_counter() - started, summary.result_available_after,
+                          summary.result_consumed_after)
+            finally:
+                self._record(label, cypher, time.perf_counter() - started, rows, timing, params=params)
+
+    def read(self, cypher, params=None, ttl=None, label=None, timeout=None):
+        """
+        Read in a managed transaction; transient errors are retried by the driver.
+        With a cache, results are reused for `ttl` seconds (default: the cache's).
+        `timeout` (seconds) has the server abort the transaction past it.
+        """
+        return self.read_many([(cypher, params)], ttl, label, timeout)[0]
+
+    def read_named(self, name, params=None, ttl=None):
+        """read() a catalog query (queries.py) by name; the name is its metrics label"""
+        return self.read(queries.cypher(name), params, ttl, label=name)
+
+    def stream_named(self, name, params=None, fetch_size=None):
+        """stream() a catalog query by name"""
+        return self.stream(queries.cypher(name), params, fetch_size, label=name)
+
+    def columns(self, cypher, params=None, fetch_size=None, cached=True, label=None):
+        """
+        Read a result as (keys, columns), one list per column, filled straight
+        from the record stream without a dict per row. Runs in a managed
+        transaction pulling `fetch_size` records per round trip. With
+        `cached` and a cache, hits are served from (and misses fill) the
+        cache that read() uses.
+        """
+        key = self.cache.key(cypher, params) if cached and self.cache is not None else None
+        if key is not None:
+            started = time.perf_counter()
+            rows = self.cache.get(key)
+            if rows is not None:
+                self._record(label, cypher, time.perf_counter() - started, len(rows), cached=True)
+                return columns_from_rows(rows)
+            version = self.cache.version
+
+        started = time.perf_counter()
+        try:
+            with self.driver.session(fetch_size=fetch_size or config.STREAM_FETCH_SIZE) as session:
+                keys, columns, timing = session.execute_read(self._fetch_columns, cypher, params or {})
+        except Exception as e:
+            self._record(label, cypher, time.perf_counter() - started, error=e, params=params)
+            raise
+        rows = len(columns[0]) if columns else 0
+        self._record(label, cypher, time.perf_counter() - started, rows, timing, params=params)
+        if key is not None:
+            self.cache.put(key, [dict(zip(keys, values)) for values in zip(*columns)], version=version)
+        return keys, columns
+
+    @staticmethod
+    def _fetch_columns(tx, cypher, params):
+        started = time.perf_counter()
+        result = tx.run(cypher, params)
+        keys = list(result.keys())
+        columns = [[] for _ in keys]
+        appends = [column.append for column in columns]
+        for record in result:
+            # Records are tuples in key order
+            for append, value in zip(appends, record):
+                append(value)
+        summary = result.consume()
+        return keys, columns, (time.perf_counter() - started, summary.result_available_after,
+                               summary.result_consumed_after)
+
+    def query_frame(self, cypher, params=None, dtypes=None, fetch_size=None, cached=True, label=None):
+        """Read a result as a pandas DataFrame; see columns()"""
+        return to_frame(*self.columns(cypher, params, fetch_size, cached, label), dtypes)
+
+    def query_arrow(self, cypher, params=None, dtypes=None, fetch_size=None, cached=True, label=None):
+        """Read a result as a pyarrow Table (pyarrow is only needed here); see columns()"""
+        return to_arrow(*self.columns(cypher, params, fetch_size, cached, label), dtypes)
+
+    def frame_named(self, name, params=None, fetch_size=None, cached=True):
+        """query_frame() a catalog query, typed by queries.COLUMN_TYPES"""
+        return self.query_frame(queries.cypher(name), params, queries.COLUMN_TYPES.get(name),
+                                fetch_size, cached, label=name)
+
+    def arrow_named(self, name, params=None, fetch_size=None, cached=True):
+        """query_arrow() a catalog query, typed by queries.COLUMN_TYPES"""
+        return self.query_arrow(queries.cypher(name), params, queries.COLUMN_TYPES.get(name),
+                                fetch_size, cached, label=name)
+
+    def write(self, cypher, params=None, label=None):
+        """Write in a managed transaction; transient errors are retried by the driver"""
+        return self.write_many([(cypher, params)], label)[0]
+
+    def read_many(self, statements, ttl=None, label=None, timeout=None):
+        """
+        Run several (cypher, params) reads in one transaction, so they share a
+        session, a round of retries and a consistent snapshot.
+        Returns one list of records per statement.
+        """
+        results = [None] * len(statements)
+        if self.cache is not None:
+            keys = [self.cache.key(cypher, params) for cypher, params in statements]
+            for i, key in enumerate(keys):
+                started = time.perf_counter()
+                results[i] = self.cache.get(key)
+                if results[i] is not None:
+                    self._record(label, statements[i][0], time.perf_counter() - started,
+                                 len(results[i]), cached=True)
+
+        missing = [i for i, rows in enumerate(results) if rows is None]
+        if missing:
+            version = self.cache.version if self.cache is not None else None
+            fetched = self._run_many(READ_ACCESS, [statements[i] for i in missing], label, timeout)
+            for i, rows in zip(missing, fetched):
+                if self.cache is not None:
+                    self.cache.put(keys[i], rows, ttl, version)
+                results[i] = rows
+        return results
+
+    def write_many(self, statements, label=None):
+        """Run several (cypher, params) writes atomically in one transaction"""
+        try:
+            return self._run_many(WRITE_ACCESS, statements, label)
+        finally:
+            self.invalidate()
+
+    def _run_many(self, access, statements, label, timeout=None):
+        """Run statements in one managed transaction, recording each"""
+        started = time.perf_counter()
+        # A managed transaction takes its timeout from the function, not from a Query
+        work = unit_of_work(timeout=timeout)(self._fetch_many) if timeout else self._fetch_many
+        try:
+            with self.driver.session() as session:
+                execute = session.execute_read if access == READ_ACCESS else session.execute_write
+                fetched = execute(work, statements)
+        except Exception as e:
+            self._record(label, statements[0][0], time.perf_counter() - started, error=e,
+                         params=statements[0][1])
+            raise
+        for (cypher, params), (rows, timing) in zip(statements, fetched):
+            # Statements sharing a transaction are timed by their own run and consume
+            wall = time.perf_counter() - started if len(statements) == 1 else timing[0]
+            self._record(label, cypher, wall, len(rows), timing, params=params)
+        return [rows for rows, _ in fetched]
+
+    @staticmethod
+    def _fetch(tx, cypher, params):
+        """Rows plus (consume seconds, result_available_after, result_consumed_after)"""
+        started = time.perf_counter()
+        result = tx.run(cypher, params)
+        rows = [dict(record) for record in result]
+        summary = result.consume()
+        return rows, (time.perf_counter() - started, summary.result_available_after,
+                      summary.result_consumed_after)
+
+    @staticmethod
+    def _fetch_many(tx, statements):
+        return [Database._fetch(tx, cypher, params or {}) for cypher, params in statements]
+
+    def _record(self, label, cypher, wall, rows=0, timing=(None, None, None), cached=False, error=None,
+                params=None):
+        if self.metrics is not None:
+            self.metrics.record(label, cypher, wall, rows, *timing, cached=cached, error=error)
+        if self.slow_log is not None and not cached:
+            self.slow_log.observe(label, cypher, params, wall, error)
+
+    def write_batches(self, cypher, rows, batch_size=1000, on_batch=None, label=None):
+        """
+        Feed rows to an `UNWIND $rows` statement in chunks, one explicit
+        write transaction per chunk, all on a single session.
+        `on_batch(row_count, counters)` is called after each commit, and
+        each committed chunk is folded into `stats`.
+        Returns the number of rows written.
+        """
+        rows = iter(rows)
+        written = 0
+        stats_current = True
+        try:
+            with self.driver.session() as session:
+                while True:
+                    chunk = list(islice(rows, batch_size))
+                    if not chunk:
+                        break
+                    started = time.perf_counter()
+                    summary = session.execute_write(self._run_chunk, cypher, chunk)
+                    # One row is enough to plan the batch statement
+                    self._record(label, cypher, time.perf_counter() - started, len(chunk),
+                                 (None, summary.result_available_after, summary.result_consumed_after),
+                                 params={"rows": chunk[:1]})
+                    written += len(chunk)
+                    counters = summary.counters
+                    stats_current = self.stats.apply(cypher, chunk,
+                                                     counters.nodes_created + counters.relationships_created,
+                                                     counters.properties_set) and stats_current
+                    if on_batch:
+                        on_batch(len(chunk), counters)
+        finally:
+            self.invalidate(stats_current)
+        return written
+    
+    @staticmethod
+    def _run_chunk(tx, cypher, rows):
+        return tx.run(cypher, rows=rows).consume()
+    
+    def _purge_rounds(self, count_cypher, delete_cypher, params, what):
+        """Run a batched delete statement until nothing matches, printing progress"""
+        total = self.query(count_cypher, params, label=f"purge.count_{what}")[0]['n']
+        if not total:
+            return 0
+        deleted = 0
+        started = time.perf_counter()
+        while True:
+            n = self.query(delete_cypher, params, label=f"purge.delete_{what}")[0]['deleted']
+            if not n:
+                break
+            deleted += n
+            rate = deleted / max(time.perf_counter() - started, 1e-9)
+            print(f"   🗑️  {deleted:,}/{total:,} {what} deleted ({rate:,.0f}/s)")
+        return deleted
+    
+    def purge(self, label=None, where=None, params=None, batch_size=10000, round_size=None):
+        """
+        Delete nodes and their relationships in batches of `batch_size`, each
+        in its own transaction, so the transaction heap stays small.
+        
+        Optionally restrict to a label and/or a predicate on `n`, e.g.
+        purge("Crime", "n.date < $before", {"before": "2024-03-01"}).
+        Progress is printed after every round of `round_size` nodes.
+        Returns the number of nodes deleted.
+        """
+        match = f"MATCH (n:{label})" if label else "MATCH (n)"
+        predicate = f"WHERE {where}" if where else ""
+        round_size = round_size or batch_size * 10
+        deleted = self._purge_rounds(
+            f"{match} {predicate} RETURN count(n) as n",
+            f"""
+                {match} {predicate}
+                WITH n LIMIT {int(round_size)}
+                CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+                RETURN count(*) as deleted
+            """,
+            params or {},
+            "nodes"
+        )
+        if not label and not where:
+            # The graph is empty: nothing to rebuild the statistics from
+            self.stats.clear()
+        return deleted
+    
+    def purge_relationships(self, rel_type=None, batch_size=10000, round_size=None):
+        """Delete relationships in batches, optionally of one type only"""
+        rel = f"[r:{rel_type}]" if rel_type else "[r]"
+        round_size = round_size or batch_size * 10
+        return self._purge_rounds(
+            f"MATCH ()-{rel}->() RETURN count(r) as n",
+            f"""
+                MATCH ()-{rel}->()
+                WITH r LIMIT {int(round_size)}
+                CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+                RETURN count(*) as deleted
+            """,
+            {},
+            "relationships"
+        )
     
-    def query(self, cypher, params=None):
-        with self.driver.session() as session:
-            result = session.run(cypher, params or {})
-            return [dict(record) for record in result]
+    def purge_crimes_before(self, date, batch_size=10000):
+        """Retention: delete crimes (and their relationships) dated before YYYY-MM-DD"""
+        return self.purge("Crime", "n.date < $before", {"before": date}, batch_size=batch_size)
     
-    def clear_all(self):
-        self.query("MATCH (n) DETACH DELETE n")
+    def clear_all(self, batch_size=10000):
+        # Relationships first, so no single node deletion drags a dense node's edges along
+        self.purge_relationships(batch_size=batch_size)
+        self.purge(batch_size=batch_size)
         print("🗑️  Database cleared")
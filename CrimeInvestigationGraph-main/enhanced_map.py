@@ -1,10 +1,87 @@
 import folium
 from folium import plugins
-import pandas as pd
+from folium.plugins import MarkerCluster
 
-def create_advanced_crime_map(crimes_data, show_heatmap=False, show_connections=False, show_clusters=False):
+# A browser map slows down past a few thousand markers
+MAX_MARKERS = 2000
+
+
+def map_crimes(db, fetch_size=None):
+    """Stream every crime with the fields the markers show"""
+    return db.stream_named("map.crimes", fetch_size=fetch_size)
+
+
+def _add_markers(group, crime, color):
+    """Pulsing circle plus icon marker for one crime"""
+    # Detailed popup
+    popup_html = f"""
+    <div style='width: 280px; font-family: Arial; background: white; padding: 15px; border-radius: 8px;'>
+        <h3 style='color: {color}; margin: 0 0 10px 0; border-bottom: 2px solid {color}; padding-bottom: 5px;'>
+            🚨 {crime['crime_type']}
+        </h3>
+        <table style='width: 100%; font-size: 13px;'>
+            <tr><td style='padding: 3px 0;'><b>📍 Location:</b></td><td>{crime['location']}</td></tr>
+            <tr><td style='padding: 3px 0;'><b>📅 Date:</b></td><td>{crime['date']}</td></tr>
+            <tr><td style='padding: 3px 0;'><b>🕐 Time:</b></td><td>{crime['time']}</td></tr>
+            <tr><td style='padding: 3px 0;'><b>🔖 Case #:</b></td><td>{crime['case_number']}</td></tr>
+            <tr><td style='padding: 3px 0;'><b>🆔 ID:</b></td><td>{crime['crime_id']}</td></tr>
+        </table>
+    </div>
+    """
+
+    # Pulsing circle marker with animation
+    folium.CircleMarker(
+        location=[crime['lat'], crime['lon']],
+        radius=10,
+        popup=folium.Popup(popup_html, max_width=300),
+        tooltip=f"<b>{crime['crime_type']}</b><br>{crime['location']}<br>{crime['date']}",
+        color=color,
+        fill=True,
+        fillColor=color,
+        fillOpacity=0.7,
+        weight=3,
+        className='pulsing-marker'
+    ).add_to(group)
+
+    # Add icon marker
+    folium.Marker(
+        location=[crime['lat'], crime['lon']],
+        popup=folium.Popup(popup_html, max_width=300),
+        tooltip=f"{crime['crime_type']} - Click for details",
+        icon=folium.Icon(
+            color='red' if 'Assault' in crime['crime_type'] or 'Battery' in crime['crime_type'] else 'blue',
+            icon='exclamation-sign',
+            prefix='glyphicon'
+        )
+    ).add_to(group)
+
+
+def _add_connection(group, crime1, crime2, distance, color):
+    """Dashed line between two same-type crimes"""
+    # Animated polyline
+    folium.PolyLine(
+        locations=[
+            [crime1['lat'], crime1['lon']],
+            [crime2['lat'], crime2['lon']]
+        ],
+        color=color,
+        weight=3,
+        opacity=0.6,
+        popup=f"<b>Pattern Detected:</b><br>{crime2['crime_type']}<br>Distance: ~{distance*100:.1f}km",
+        tooltip=f"Connected: {crime2['crime_type']}",
+        dash_array='10, 5'
+    ).add_to(group)
+
+
+def create_advanced_crime_map(crimes_data, show_heatmap=False, show_connections=False, show_clusters=False,
+                              max_markers=MAX_MARKERS):
     """
     Create an advanced crime map with multiple visualization layers
+
+    `crimes_data` may be any iterable, including a Database.stream() result;
+    it is read once. Every crime feeds the heatmap, cluster and connection
+    layers, but only the first `max_markers` get individual markers (None for
+    no limit).
     """
     
     # Base map - Light mode
@@ -34,58 +111,59 @@ def create_advanced_crime_map(crimes_data, show_heatmap=False, show_connections=
     
     # Feature Group for regular markers
     marker_group = folium.FeatureGroup(name='Crime Markers')
-    
-    # Add markers with custom icons
+    marker_cluster = MarkerCluster(name='Crime Clusters') if show_clusters else None
+    connection_group = folium.FeatureGroup(name='Crime Connections') if show_connections else None
+
+    # Single pass over the crimes, so a streamed result is never held in memory:
+    # the heatmap is pooled by grid cell and individual markers stop at `max_markers`
+    heat = {}
+    nearby = {}
+    markers = 0
+    connected_count = 0
+
     for crime in crimes_data:
-        color = crime_colors.get(crime['crime_type'], '#666666')
-        
-        # Detailed popup
-        popup_html = f"""
-        <div style='width: 280px; font-family: Arial; background: white; padding: 15px; border-radius: 8px;'>
-            <h3 style='color: {color}; margin: 0 0 10px 0; border-bottom: 2px solid {color}; padding-bottom: 5px;'>
-                🚨 {crime['crime_type']}
-            </h3>
-            <table style='width: 100%; font-size: 13px;'>
-                <tr><td style='padding: 3px 0;'><b>📍 Location:</b></td><td>{crime['location']}</td></tr>
-                <tr><td style='padding: 3px 0;'><b>📅 Date:</b></td><td>{crime['date']}</td></tr>
-                <tr><td style='padding: 3px 0;'><b>🕐 Time:</b></td><td>{crime['time']}</td></tr>
-                <tr><td style='padding: 3px 0;'><b>🔖 Case #:</b></td><td>{crime['case_number']}</td></tr>
-                <tr><td style='padding: 3px 0;'><b>🆔 ID:</b></td><td>{crime['crime_id']}</td></tr>
-            </table>
-        </div>
-        """
-        
-        # Pulsing circle marker with animation
-        folium.CircleMarker(
-            location=[crime['lat'], crime['lon']],
-            radius=10,
-            popup=folium.Popup(popup_html, max_width=300),
-            tooltip=f"<b>{crime['crime_type']}</b><br>{crime['location']}<br>{crime['date']}",
-            color=color,
-            fill=True,
-            fillColor=color,
-            fillOpacity=0.7,
-            weight=3,
-            className='pulsing-marker'
-        ).add_to(marker_group)
-        
-        # Add icon marker
-        folium.Marker(
-            location=[crime['lat'], crime['lon']],
-            popup=folium.Popup(popup_html, max_width=300),
-            tooltip=f"{crime['crime_type']} - Click for details",
-            icon=folium.Icon(
-                color='red' if 'Assault' in crime['crime_type'] or 'Battery' in crime['crime_type'] else 'blue',
-                icon='exclamation-sign',
-                prefix='glyphicon'
-            )
-        ).add_to(marker_group)
-    
+        if show_heatmap:
+            cell = (round(crime['lat'], 4), round(crime['lon'], 4))
+            heat[cell] = heat.get(cell, 0) + 1
+
+        # CONNECTION LINES: same type crimes within 1km, found through a 0.01° grid
+        if show_connections and connected_count < 100:
+            gx, gy = int(crime['lat'] // 0.01), int(crime['lon'] // 0.01)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for other in nearby.get((crime['crime_type'], gx + dx, gy + dy), []):
+                        if connected_count >= 100:  # Limit connections
+                            break
+                        lat_diff = abs(crime['lat'] - other['lat'])
+                        lon_diff = abs(crime['lon'] - other['lon'])
+                        distance = (lat_diff**2 + lon_diff**2)**0.5
+                        if distance < 0.01:
+                            _add_connection(connection_group, other, crime, distance,
+                                            crime_colors.get(crime['crime_type'], '#666666'))
+                            connected_count += 1
+            # A cell never needs more than 100 points to reach the connection limit
+            bucket = nearby.setdefault((crime['crime_type'], gx, gy), [])
+            if len(bucket) < 100:
+                bucket.append({'lat': crime['lat'], 'lon': crime['lon'], 'crime_type': crime['crime_type']})
+
+        # CLUSTER LAYER: every crime; clustering is what keeps that cheap to draw
+        if show_clusters:
+            folium.Marker(
+                location=[crime['lat'], crime['lon']],
+                popup=f"<b>{crime['crime_type']}</b><br>{crime['location']}",
+                icon=folium.Icon(color='red', icon='info-sign')
+            ).add_to(marker_cluster)
+
+        # Individual markers stop at `max_markers`
+        if max_markers is None or markers < max_markers:
+            markers += 1
+            _add_markers(marker_group, crime, crime_colors.get(crime['crime_type'], '#666666'))
+
     marker_group.add_to(m)
-    
+
     # HEATMAP LAYER
     if show_heatmap:
-        heat_data = [[crime['lat'], crime['lon']] for crime in crimes_data]
+        heat_data = [[lat, lon, count] for (lat, lon), count in heat.items()]
         plugins.HeatMap(
             heat_data,
             name='Crime Heatmap',
@@ -101,68 +179,13 @@ def create_advanced_crime_map(crimes_data, show_heatmap=False, show_connections=
                 1.0: 'red'
             }
         ).add_to(m)
-    
-    # CLUSTER LAYER
+
     if show_clusters:
-        from folium.plugins import MarkerCluster
-        
-        marker_cluster = MarkerCluster(name='Crime Clusters').add_to(m)
-        
-        for crime in crimes_data:
-            color = crime_colors.get(crime['crime_type'], '#666666')
-            
-            folium.Marker(
-                location=[crime['lat'], crime['lon']],
-                popup=f"<b>{crime['crime_type']}</b><br>{crime['location']}",
-                icon=folium.Icon(color='red', icon='info-sign')
-            ).add_to(marker_cluster)
-    
-    # CONNECTION LINES
-    if show_connections and len(crimes_data) > 1:
-        # Group crimes by type and location
-        crime_groups = {}
-        
-        for crime in crimes_data:
-            key = (crime['crime_type'], round(crime['lat'], 3), round(crime['lon'], 3))
-            if key not in crime_groups:
-                crime_groups[key] = []
-            crime_groups[key].append(crime)
-        
-        # Find patterns
-        connection_group = folium.FeatureGroup(name='Crime Connections')
-        
-        crime_list = list(crimes_data)
-        connected_count = 0
-        
-        for i, crime1 in enumerate(crime_list):
-            for crime2 in crime_list[i+1:]:
-                # Same type crimes within 1km
-                if crime1['crime_type'] == crime2['crime_type']:
-                    lat_diff = abs(crime1['lat'] - crime2['lat'])
-                    lon_diff = abs(crime1['lon'] - crime2['lon'])
-                    distance = (lat_diff**2 + lon_diff**2)**0.5
-                    
-                    if distance < 0.01 and connected_count < 100:  # Limit connections
-                        color = crime_colors.get(crime1['crime_type'], '#666666')
-                        
-                        # Animated polyline
-                        folium.PolyLine(
-                            locations=[
-                                [crime1['lat'], crime1['lon']],
-                                [crime2['lat'], crime2['lon']]
-                            ],
-                            color=color,
-                            weight=3,
-                            opacity=0.6,
-                            popup=f"<b>Pattern Detected:</b><br>{crime1['crime_type']}<br>Distance: ~{distance*100:.1f}km",
-                            tooltip=f"Connected: {crime1['crime_type']}",
-                            dash_array='10, 5'
-                        ).add_to(connection_group)
-                        
-                        connected_count += 1
-        
+        marker_cluster.add_to(m)
+
+    if show_connections:
         connection_group.add_to(m)
-    
+
     # Add CSS for pulsing animation
     pulse_css = """
     <style>
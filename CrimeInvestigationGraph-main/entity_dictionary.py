@@ -0,0 +1,140 @@
+from collections import deque
+import config
+import threading
+import time
+
+# Entity kind -> catalog query returning the names to recognize
+SOURCES = {
+    "locations": "rag.entities.locations",
+    "organizations": "rag.entities.organizations",
+    "crime_types": "rag.entities.crime_types",
+    "persons": "rag.entities.persons",
+    "plates": "rag.entities.plates",
+    "mo": "rag.entities.mo",
+}
+
+# Recognized even before any crime of the type is loaded
+KNOWN_CRIME_TYPES = [
+    "Theft", "Battery", "Criminal Damage", "Assault", "Burglary",
+    "Motor Vehicle Theft", "Robbery", "Deceptive Practice",
+    "Criminal Trespass", "Narcotics", "Weapons Violation"
+]
+
+
+class Automaton:
+    """
+    Aho-Corasick matcher: finds every occurrence of every pattern in one
+    pass over the text, however many patterns there are.
+    Patterns and text are compared lowercased.
+    """
+
+    def __init__(self, patterns):
+        # patterns: {pattern: [payload, ...]}
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, payloads in patterns.items():
+            state = 0
+            for char in pattern.lower():
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].extend((len(pattern), payload) for payload in payloads)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        todo = deque(self.goto[0].values())
+        while todo:
+            state = todo.popleft()
+            for char, next_state in self.goto[state].items():
+                todo.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def find(self, text):
+        """Yield (start, end, payload) for every match, in order of end position"""
+        state = 0
+        for i, char in enumerate(text.lower()):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, payload in self.output[state]:
+                yield i + 1 - length, i + 1, payload
+
+
+def _is_word_edge(text, i):
+    return i <= 0 or i >= len(text) or not (text[i - 1].isalnum() and text[i].isalnum())
+
+
+class EntityDictionary:
+    """
+    Every location, organization, crime type, person name, license plate
+    and modus operandi description in the graph, compiled into one
+    Automaton so a question (or a whole conversation) is scanned once.
+
+    Names are reloaded when the database's read cache version moves (a
+    write through the same Database) or after `ttl` seconds (loads from
+    other processes).
+    """
+
+    def __init__(self, db, ttl=None):
+        self.db = db
+        self.ttl = ttl if ttl is not None else config.ENTITY_REFRESH_SECONDS
+        self.automaton = None
+        self.version = None
+        self.loaded_at = 0
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def _current_version(self):
+        cache = getattr(self.db, "cache", None)
+        return cache.version if cache is not None else None
+
+    def _stale(self):
+        return (self.automaton is None or self.version != self._current_version()
+                or time.monotonic() - self.loaded_at >= self.ttl)
+
+    def refresh(self):
+        """Reload every name list and rebuild the automaton"""
+        version = self._current_version()
+        patterns = {}
+        counts = {}
+        for kind, query_name in SOURCES.items():
+            try:
+                names = [row["name"] for row in self.db.read_named(query_name)]
+            except Exception as e:
+                print(f"⚠️ Could not load {kind} for entity matching: {e}")
+                names = []
+            if kind == "crime_types":
+                names += KNOWN_CRIME_TYPES
+            counts[kind] = 0
+            for name in dict.fromkeys(n for n in names if n and n.strip()):
+                patterns.setdefault(name.lower(), []).append((kind, name))
+                counts[kind] += 1
+        self.automaton = Automaton(patterns)
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.counts = counts
+
+    def find(self, text):
+        """
+        {kind: [names]} for every whole-word mention in `text`, each name
+        once, in order of first mention.
+        """
+        with self.lock:
+            if self._stale():
+                self.refresh()
+            automaton = self.automaton
+        text = text.lower()
+        found = {kind: {} for kind in SOURCES}
+        for start, end, (kind, name) in automaton.find(text):
+            if _is_word_edge(text, start) and _is_word_edge(text, end):
+                found[kind].setdefault(name, start)
+        return {kind: sorted(names, key=names.get) for kind, names in found.items()}
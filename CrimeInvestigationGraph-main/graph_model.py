@@ -0,0 +1,144 @@
+import hashlib
+import json
+
+# ============================================================================
+# GRAPH LAYOUT
+# ============================================================================
+# Shared by the loaders, GraphStats and the in-memory backend; imports nothing
+# from the project, so Database can depend on it without pulling in loaders.
+
+# Node labels in load order, with the property each one is matched on
+NODE_KEYS = {
+    "Location": "name",
+    "Organization": "id",
+    "Investigator": "id",
+    "ModusOperandi": "id",
+    "Person": "id",
+    "Vehicle": "id",
+    "Weapon": "id",
+    "Crime": "id",
+    "Evidence": "id",
+}
+
+# Relationship stages in load order. Each row carries `start`/`end` keys plus
+# the listed properties, which are part of the MERGE pattern.
+RELATIONSHIP_STAGES = [
+    {"name": "occurred_at", "type": "OCCURRED_AT", "start": "Crime", "end": "Location",
+     "props": [], "directed": True, "message": "Linking crimes to locations"},
+    {"name": "party_to", "type": "PARTY_TO", "start": "Person", "end": "Crime",
+     "props": ["role"], "directed": True, "message": "Linking persons to crimes"},
+    {"name": "member_of", "type": "MEMBER_OF", "start": "Person", "end": "Organization",
+     "props": ["rank", "since"], "directed": True, "message": "Creating organization memberships"},
+    {"name": "operates_in", "type": "OPERATES_IN", "start": "Organization", "end": "Location",
+     "props": ["activity_level"], "directed": True, "message": "Linking organizations to territories"},
+    {"name": "matches_mo", "type": "MATCHES_MO", "start": "Crime", "end": "ModusOperandi",
+     "props": ["similarity"], "directed": True, "message": "Linking crimes to modus operandi"},
+    {"name": "investigated_by", "type": "INVESTIGATED_BY", "start": "Crime", "end": "Investigator",
+     "props": ["assigned_date"], "directed": True, "message": "Assigning investigators to crimes"},
+    {"name": "has_evidence", "type": "HAS_EVIDENCE", "start": "Crime", "end": "Evidence",
+     "props": [], "directed": True, "message": "Linking evidence to crimes"},
+    {"name": "links_to", "type": "LINKS_TO", "start": "Evidence", "end": "Person",
+     "props": ["confidence"], "directed": True, "message": "Linking evidence to suspects"},
+    {"name": "involved_vehicle", "type": "INVOLVED_VEHICLE", "start": "Crime", "end": "Vehicle",
+     "props": ["role"], "directed": True, "message": "Linking vehicles to crimes"},
+    {"name": "owns_vehicle", "type": "OWNS", "start": "Person", "end": "Vehicle",
+     "props": [], "directed": True, "message": "Linking vehicles to owners"},
+    {"name": "used_weapon", "type": "USED_WEAPON", "start": "Crime", "end": "Weapon",
+     "props": [], "directed": True, "message": "Linking weapons to crimes"},
+    {"name": "owns_weapon", "type": "OWNS", "start": "Person", "end": "Weapon",
+     "props": [], "directed": True, "message": "Linking weapons to owners"},
+    {"name": "knows", "type": "KNOWS", "start": "Person", "end": "Person",
+     "props": ["relationship", "strength"], "directed": False, "message": "Creating social networks"},
+    {"name": "family_rel", "type": "FAMILY_REL", "start": "Person", "end": "Person",
+     "props": ["relation"], "directed": False, "message": "Creating family connections"},
+    {"name": "similar_to", "type": "SIMILAR_TO", "start": "Crime", "end": "Crime",
+     "props": ["similarity_score"], "directed": True, "message": "Creating crime series patterns"},
+    {"name": "frequents", "type": "FREQUENTS", "start": "Person", "end": "Location",
+     "props": ["frequency"], "directed": True, "message": "Tracking location frequencies"},
+]
+
+
+def distinct_rows(stage, rows):
+    """
+    Yield the first row for each pair of endpoints: a stage links two nodes
+    at most once, however its properties vary, so the bulk and incremental
+    loaders (and CSV imports) build the same relationships
+    """
+    seen = set()
+    for row in rows:
+        key = (row["start"], row["end"]) if stage["directed"] else frozenset((row["start"], row["end"]))
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+
+# ============================================================================
+# CYPHER
+# ============================================================================
+def node_statement(label):
+    """UNWIND statement that creates one node per row"""
+    return f"UNWIND $rows AS row CREATE (n:{label}) SET n = row"
+
+
+def relationship_statement(stage):
+    """UNWIND statement that merges one relationship per row"""
+    start_key = NODE_KEYS[stage["start"]]
+    end_key = NODE_KEYS[stage["end"]]
+    props = ", ".join(f"{p}: row.{p}" for p in stage["props"])
+    rel = f"[:{stage['type']} {{{props}}}]" if props else f"[:{stage['type']}]"
+    arrow = "->" if stage["directed"] else "-"
+    return f"""
+        UNWIND $rows AS row
+        MATCH (a:{stage['start']} {{{start_key}: row.start}})
+        MATCH (b:{stage['end']} {{{end_key}: row.end}})
+        MERGE (a)-{rel}{arrow}(b)
+    """
+
+
+def content_hash(row):
+    """Stable fingerprint of a row's properties"""
+    payload = json.dumps(row, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def upsert_statement(label):
+    """
+    MERGE nodes on their natural key and only SET properties when the stored
+    content hash differs, so unchanged rows cost a lookup and no write.
+    """
+    key = NODE_KEYS[label]
+    return f"""
+        UNWIND $rows AS row
+        MERGE (n:{label} {{{key}: row.key}})
+        WITH n, row
+        WHERE n.content_hash IS NULL OR n.content_hash <> row.hash
+        SET n = row.props, n.content_hash = row.hash
+    """
+
+
+def relationship_upsert_statement(stage):
+    """
+    MERGE relationships on type and endpoints only, then SET their properties
+    when the stored content hash differs: a changed property (KNOWS.strength,
+    PARTY_TO.role, ...) updates the existing relationship instead of adding
+    a parallel one.
+    """
+    start_key = NODE_KEYS[stage["start"]]
+    end_key = NODE_KEYS[stage["end"]]
+    arrow = "->" if stage["directed"] else "-"
+    return f"""
+        UNWIND $rows AS row
+        MATCH (a:{stage['start']} {{{start_key}: row.start}})
+        MATCH (b:{stage['end']} {{{end_key}: row.end}})
+        MERGE (a)-[r:{stage['type']}]{arrow}(b)
+        WITH r, row
+        WHERE r.content_hash IS NULL OR r.content_hash <> row.hash
+        SET r += row.props, r.content_hash = row.hash
+    """
+
+
+def relationship_upsert_rows(stage, rows):
+    """{start, end, hash, props} rows for relationship_upsert_statement"""
+    for row in rows:
+        props = {p: row[p] for p in stage["props"]}
+        yield {"start": row["start"], "end": row["end"], "hash": content_hash(props), "props": props}
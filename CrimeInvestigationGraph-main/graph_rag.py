@@ -1,24 +1,60 @@
 import config
 from database import Database
-import json
+from async_database import AsyncDatabase
+from entity_dictionary import EntityDictionary, SOURCES as ENTITY_KINDS
+from retrieval_planner import STATS_READS, compile_plan, plan_retrieval
+from context_builder import build_context
+from answer_cache import AnswerCache
+from collections import deque
+import queries
 import re
+import time
 
 class GraphRAG:
-    def __init__(self):
-        self.db = Database()
+    def __init__(self, db=None, async_db=None, client=None, answer_cache=None):
+        # Share the caller's Database (and its connection pool) when given one
+        self.db = db or Database()
+        
+        # Concurrent retrieval when plans aren't compiled into one statement,
+        # or when the compiled one fails or times out; sequential reads
+        # without it. A shared one (app.py passes one per server) is left
+        # open by close()
+        self.async_db = async_db
+        self.owns_async_db = False
+        # Only a Neo4j-backed Database has a server to fan out to
+        if self.async_db is None and config.RAG_ASYNC and isinstance(self.db, Database):
+            try:
+                self.async_db = AsyncDatabase(metrics=self.db.metrics, slow_log=self.db.slow_log)
+                self.owns_async_db = True
+            except Exception as e:
+                print(f"⚠️ Async retrieval unavailable: {e}")
+        # Graph entity names, matched in one pass and reloaded when the graph changes
+        self.entities = EntityDictionary(self.db)
         self.model = config.MODEL_NAME
         
-        # Try to initialize OpenAI
-        try:
-            from openai import OpenAI
-            self.client = OpenAI(
-                api_key=config.OPENAI_API_KEY,
-                base_url=config.OPENAI_BASE_URL
-            )
-            self.use_llm = True
-        except Exception as e:
-            print(f"⚠️ LLM unavailable: {e}")
-            self.use_llm = False
+        # An OpenAI-compatible client may be passed in (e.g. llm_stub.StubClient)
+        self.client = client
+        if self.client is None:
+            # Try to initialize OpenAI
+            try:
+                from openai import OpenAI
+                self.client = OpenAI(
+                    api_key=config.OPENAI_API_KEY,
+                    base_url=config.OPENAI_BASE_URL
+                )
+            except Exception as e:
+                print(f"⚠️ LLM unavailable: {e}")
+        self.use_llm = self.client is not None
+        # LLM answers by question and retrieved context; may be shared between sessions
+        self.answer_cache = answer_cache if answer_cache is not None else AnswerCache()
+        # Latency of recent turns, newest last (see _record_turn)
+        self.turns = deque(maxlen=config.RAG_TURN_HISTORY)
+    
+    def close(self):
+        """Stop the async driver and its event-loop thread, if this GraphRAG started them"""
+        if self.async_db is not None and self.owns_async_db:
+            self.async_db.close()
+        self.async_db = None
     
     def ask(self, question):
         """Original ask method for backward compatibility"""
@@ -32,331 +68,210 @@ class GraphRAG:
             question: Current user question
             conversation_history: List of previous {role, content} messages
         """
+        started = time.perf_counter()
+        
         # Step 1: RETRIEVE - Get ALL relevant data
-        context = self._smart_retrieve(question, conversation_history)
+        entities = self._conversation_entities(question, conversation_history)
+        context = self._smart_retrieve(question, conversation_history, entities)
+        retrieved = time.perf_counter()
         
         # Step 2: GENERATE answer with conversation awareness
-        if self.use_llm:
+        fallback = not self.use_llm
+        cache_key = self.answer_cache.key(question, context, self.model)
+        answer = self.answer_cache.get(cache_key) if self.use_llm else None
+        cached = answer is not None
+        if self.use_llm and not cached:
             try:
                 answer = self._generate_with_llm_conversational(
                     question, 
                     context, 
-                    conversation_history
+                    conversation_history,
+                    entities
                 )
+                self.answer_cache.put(cache_key, answer)
             except Exception as e:
                 print(f"⚠️ LLM failed: {e}")
-                answer = self._generate_fallback(question, context)
-        else:
+                fallback = True
+        if fallback:
             answer = self._generate_fallback(question, context)
         
+        # Nothing is shown before the whole answer is, so first token = total
+        finished = time.perf_counter()
+        self._record_turn(question, answer, context, started, retrieved, finished, finished,
+                          streamed=False, fallback=fallback, cached=cached)
         return {
             'answer': answer,
             'sources': list(context.keys())
         }
     
-    def _smart_retrieve(self, question, conversation_history):
-        """ENHANCED retrieval with conversation awareness"""
-        context = {}
-        q = question.lower()
-        
-        # Check conversation history for entity references
-        entities_from_history = self._extract_entities_from_history(conversation_history)
-        
-        # Extract entities from question
-        locations = self._extract_locations(question)
-        crime_types = self._extract_crime_types(question)
-        person_names = self._extract_person_names(question)
-        organizations = self._extract_organizations(question)
-        
-        # Merge with historical entities for follow-up questions
-        if entities_from_history:
-            locations.extend(entities_from_history.get('locations', []))
-            person_names.extend(entities_from_history.get('persons', []))
-            organizations.extend(entities_from_history.get('organizations', []))
-        
-        # Remove duplicates
-        locations = list(set(locations))
-        person_names = list(set(person_names))
-        organizations = list(set(organizations))
-        
-        # ALWAYS get basic stats
-        try:
-            context['database_stats'] = {
-                'total_crimes': self.db.query("MATCH (c:Crime) RETURN count(c) as n")[0]['n'],
-                'total_persons': self.db.query("MATCH (p:Person) RETURN count(p) as n")[0]['n'],
-                'total_locations': self.db.query("MATCH (l:Location) RETURN count(l) as n")[0]['n'],
-                'total_organizations': self.db.query("MATCH (o:Organization) RETURN count(o) as n")[0]['n'],
-                'total_evidence': self.db.query("MATCH (e:Evidence) RETURN count(e) as n")[0]['n']
-            }
-        except:
-            context['database_stats'] = {'error': 'Could not fetch stats'}
-        
-        # ========== ORGANIZATION QUERIES ==========
-        if any(w in q for w in ['organization', 'gang', 'crew', 'syndicate', 'cartel', 'ring']) or organizations:
-            try:
-                context['all_organizations'] = self.db.query("""
-                    MATCH (o:Organization)
-                    RETURN o.name as name, o.type as type, 
-                           o.territory as territory, o.members_count as members,
-                           o.activity_level as activity
-                    ORDER BY o.members_count DESC
-                """)
-                
-                context['organization_members'] = self.db.query("""
-                    MATCH (p:Person)-[r:MEMBER_OF]->(o:Organization)
-                    RETURN o.name as organization, p.name as member,
-                           p.age as age, r.rank as rank
-                    ORDER BY o.name, r.rank
-                    LIMIT 50
-                """)
-            except Exception as e:
-                print(f"Error fetching organizations: {e}")
-        
-        # Specific organization query
-        if organizations:
-            for org in organizations[:3]:
-                try:
-                    org_crimes = self.db.query(f"""
-                        MATCH (p:Person)-[:MEMBER_OF]->(o:Organization {{name: '{org}'}})
-                        MATCH (p)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
-                        RETURN c.type as crime_type, c.date as date,
-                               l.name as location, p.name as member
-                        ORDER BY c.date DESC
-                        LIMIT 30
-                    """)
-                    
-                    if org_crimes:
-                        context[f'org_{org}_crimes'] = org_crimes
-                except Exception as e:
-                    print(f"Error fetching {org} crimes: {e}")
-        
-        # ========== EVIDENCE QUERIES ==========
-        if any(w in q for w in ['evidence', 'proof', 'forensic', 'dna', 'fingerprint']):
-            try:
-                context['all_evidence'] = self.db.query("""
-                    MATCH (e:Evidence)
-                    RETURN e.id as id, e.type as type, e.description as description,
-                           e.significance as significance, e.verified as verified
-                    ORDER BY 
-                        CASE e.significance 
-                            WHEN 'critical' THEN 1
-                            WHEN 'high' THEN 2
-                            WHEN 'medium' THEN 3
-                            ELSE 4
-                        END
-                    LIMIT 30
-                """)
-                
-                context['evidence_person_links'] = self.db.query("""
-                    MATCH (e:Evidence)-[r:LINKS_TO]->(p:Person)
-                    RETURN e.id as evidence_id, e.description as evidence,
-                           p.name as suspect, r.confidence as confidence
-                    ORDER BY r.confidence DESC
-                    LIMIT 30
-                """)
-            except Exception as e:
-                print(f"Error fetching evidence: {e}")
-        
-        # ========== INVESTIGATOR QUERIES ==========
-        if any(w in q for w in ['investigator', 'detective', 'officer', 'assigned']):
-            try:
-                context['all_investigators'] = self.db.query("""
-                    MATCH (i:Investigator)
-                    RETURN i.name as name, i.badge_number as badge,
-                           i.department as department, i.specialization as specialization,
-                           i.cases_solved as solved, i.active_cases as active
-                    ORDER BY i.cases_solved DESC
-                """)
-            except Exception as e:
-                print(f"Error fetching investigators: {e}")
-        
-        # ========== MO PATTERNS ==========
-        if any(w in q for w in ['modus operandi', 'mo', 'pattern', 'method', 'signature', 'similar']):
-            try:
-                context['all_mo_patterns'] = self.db.query("""
-                    MATCH (m:ModusOperandi)
-                    RETURN m.id as id, m.description as description,
-                           m.signature_element as signature, m.frequency as frequency
-                    ORDER BY m.frequency DESC
-                """)
-                
-                context['crimes_by_mo'] = self.db.query("""
-                    MATCH (c:Crime)-[r:MATCHES_MO]->(m:ModusOperandi)
-                    RETURN m.description as mo, c.id as crime_id, 
-                           c.type as crime_type, r.similarity as similarity
-                    ORDER BY r.similarity DESC
-                    LIMIT 40
-                """)
-            except Exception as e:
-                print(f"Error fetching MO patterns: {e}")
-        
-        # ========== VEHICLES ==========
-        if any(w in q for w in ['vehicle', 'car', 'truck', 'getaway', 'stolen']):
-            try:
-                context['all_vehicles'] = self.db.query("""
-                    MATCH (v:Vehicle)
-                    RETURN v.id as id, v.make as make, v.model as model,
-                           v.year as year, v.color as color, 
-                           v.license_plate as plate, v.reported_stolen as stolen
-                    ORDER BY v.reported_stolen DESC
-                    LIMIT 30
-                """)
-            except Exception as e:
-                print(f"Error fetching vehicles: {e}")
-        
-        # ========== WEAPONS ==========
-        if any(w in q for w in ['weapon', 'gun', 'firearm', 'knife', 'armed']):
+    def ask_stream(self, question, conversation_history):
+        """
+        Streaming version of ask_with_context: a generator of answer text
+        pieces, yielded as the LLM produces them (a cached or fallback
+        answer comes as one piece). Once it is exhausted, self.turns[-1]
+        holds the turn's full answer, sources and timings.
+        """
+        started = time.perf_counter()
+        entities = self._conversation_entities(question, conversation_history)
+        context = self._smart_retrieve(question, conversation_history, entities)
+        retrieved = time.perf_counter()
+        
+        pieces = []
+        first_token = None
+        fallback = not self.use_llm
+        cache_key = self.answer_cache.key(question, context, self.model)
+        cached_answer = self.answer_cache.get(cache_key) if self.use_llm else None
+        if cached_answer is not None:
+            first_token = time.perf_counter()
+            pieces.append(cached_answer)
+            yield cached_answer
+        elif self.use_llm:
+            messages = self._llm_messages(question, context, conversation_history, entities)
             try:
-                context['all_weapons'] = self.db.query("""
-                    MATCH (w:Weapon)
-                    RETURN w.id as id, w.type as type, w.make as make,
-                           w.model as model, w.recovered as recovered
-                    LIMIT 30
-                """)
+                for piece in self._stream_llm(messages):
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    pieces.append(piece)
+                    yield piece
+                # Only complete answers are cached
+                self.answer_cache.put(cache_key, "".join(pieces))
             except Exception as e:
-                print(f"Error fetching weapons: {e}")
+                print(f"⚠️ LLM failed: {e}")
+                # Fall back only if nothing has been shown yet
+                fallback = not pieces
+        if fallback:
+            answer = self._generate_fallback(question, context)
+            first_token = time.perf_counter()
+            pieces.append(answer)
+            yield answer
         
-        # ========== LOCATION-SPECIFIC ==========
-        if locations:
-            for location in locations[:3]:
-                try:
-                    context[f'crimes_in_{location}'] = self.db.query(f"""
-                        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
-                        WHERE l.name =~ '(?i).*{location}.*'
-                        RETURN c.id as crime_id, c.type as crime_type, 
-                               c.date as date, c.severity as severity
-                        ORDER BY c.date DESC
-                        LIMIT 30
-                    """)
-                    
-                    context[f'suspects_in_{location}'] = self.db.query(f"""
-                        MATCH (p:Person)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
-                        WHERE l.name =~ '(?i).*{location}.*'
-                        WITH p, count(DISTINCT c) as crime_count
-                        RETURN p.name as name, p.age as age, p.risk_score as risk_score,
-                               crime_count
-                        ORDER BY crime_count DESC
-                        LIMIT 20
-                    """)
-                except Exception as e:
-                    print(f"Error fetching {location} data: {e}")
+        self._record_turn(question, "".join(pieces), context, started, retrieved,
+                          first_token or time.perf_counter(), time.perf_counter(),
+                          streamed=True, fallback=fallback, cached=cached_answer is not None)
+    
+    def _record_turn(self, question, answer, context, started, retrieved, first_token, finished,
+                     streamed, fallback, cached=False):
+        """Keep one turn's answer, sources and latency; times from time.perf_counter()"""
+        self.turns.append({
+            'timestamp': time.time(),
+            'question': question,
+            'answer': answer,
+            'sources': list(context.keys()),
+            'streamed': streamed,
+            'fallback': fallback,
+            'cached': cached,
+            'retrieval_ms': (retrieved - started) * 1000,
+            # From the question to the first answer text, retrieval included
+            'ttft_ms': (first_token - started) * 1000,
+            'total_ms': (finished - started) * 1000
+        })
+    
+    def _smart_retrieve(self, question, conversation_history, entities=None):
+        """ENHANCED retrieval with conversation awareness"""
+        if entities is None:
+            entities = self._conversation_entities(question, conversation_history)
+        plan = plan_retrieval(question, entities)
+        return self._assemble(self._execute(plan))
+    
+    def _conversation_entities(self, question, conversation_history):
+        """Entities of the question, then of recent history for follow-up questions"""
+        entities = self._extract_entities(question)
+        entities_from_history = self._extract_entities_from_history(conversation_history)
         
-        # ========== PERSON-SPECIFIC ==========
-        if person_names:
-            for name in person_names[:3]:
+        # Question entities first; history only adds ones not already mentioned
+        for kind in ('locations', 'persons', 'organizations'):
+            entities[kind] = list(dict.fromkeys(entities[kind] + entities_from_history[kind]))
+        return entities
+    
+    def _execute(self, plan):
+        """
+        Run a retrieval plan (see retrieval_planner). STATS_READS entries are
+        looked up in the graph statistics; the rest run as one compiled
+        statement on Neo4j (aborted by the server after its
+        RAG_PLAN_DEADLINE_SHARE of the per-turn deadline), else concurrently
+        on the async driver when available (partial results once the rest of
+        the deadline passes), else one by one. Returns {context_key: rows}
+        for the reads that succeeded.
+        """
+        results = {}
+        for key, name, params, _ in plan:
+            if name in STATS_READS:
                 try:
-                    context[f'{name}_connections'] = self.db.query(f"""
-                        MATCH (p:Person)-[:KNOWS*1..2]-(connected:Person)
-                        WHERE p.name =~ '(?i).*{name}.*'
-                        RETURN DISTINCT connected.name as name, 
-                               connected.age as age,
-                               connected.criminal_record as has_record
-                        LIMIT 30
-                    """)
+                    results[key] = STATS_READS[name](self.db.stats, params)
                 except Exception as e:
-                    print(f"Error fetching {name} connections: {e}")
-        
-        # ========== PATTERNS ==========
-        if any(w in q for w in ['hotspot', 'dangerous', 'where', 'most crime']):
+                    print(f"Error fetching {key}: {e}")
+        plan = [entry for entry in plan if entry[1] not in STATS_READS]
+        if not plan:
+            return results
+        
+        deadline = config.RAG_DEADLINE_SECONDS
+        if config.RAG_COMPILED_PLAN and isinstance(self.db, Database):
+            cypher, params, aliases = compile_plan(plan)
+            # The fallback keeps its own share, so a timed-out plan still gets answered
+            plan_deadline = deadline * config.RAG_PLAN_DEADLINE_SHARE
+            deadline -= plan_deadline
             try:
-                context['hotspots'] = self.db.query("""
-                    MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
-                    RETURN l.name as location, l.district as district,
-                           count(c) as crimes
-                    ORDER BY crimes DESC
-                    LIMIT 15
-                """)
+                row = self.db.read(cypher, params, label="rag.plan", timeout=plan_deadline)[0]
+                results.update({key: row[alias] for alias, key in aliases.items()})
+                return results
             except Exception as e:
-                print(f"Error fetching hotspots: {e}")
-        
-        if any(w in q for w in ['repeat', 'offender', 'criminal', 'suspect']):
-            try:
-                context['repeat_offenders'] = self.db.query("""
-                    MATCH (p:Person)-[:PARTY_TO]->(c:Crime)
-                    WITH p, count(c) as crimes
-                    WHERE crimes >= 2
-                    OPTIONAL MATCH (p)-[:MEMBER_OF]->(o:Organization)
-                    RETURN p.name as name, p.age as age, crimes,
-                           o.name as organization
-                    ORDER BY crimes DESC
-                    LIMIT 20
-                """)
-            except Exception as e:
-                print(f"Error fetching repeat offenders: {e}")
-        
-        if any(w in q for w in ['network', 'connected', 'know', 'associate']):
+                print(f"⚠️ Compiled retrieval failed, reading one by one: {e}")
+        
+        limits = {key: limit for key, _, _, limit in plan}
+        if self.async_db is not None:
+            fetched, failed, timed_out = self.async_db.read_all(
+                [(key, queries.cypher(name), params) for key, name, params, _ in plan],
+                cache=self.db.cache,
+                max_concurrency=config.RAG_MAX_CONCURRENCY,
+                deadline=deadline,
+                labels={key: name for key, name, _, _ in plan}
+            )
+            for key, error in failed.items():
+                print(f"Error fetching {key}: {error}")
+            if timed_out:
+                print(f"⏱️ Retrieval deadline passed; skipped {', '.join(timed_out)}")
+            results.update({key: rows[:limits[key]] for key, rows in fetched.items()})
+            return results
+        
+        for key, name, params, limit in plan:
             try:
-                context['criminal_networks'] = self.db.query("""
-                    MATCH (p1:Person)-[:KNOWS]-(p2:Person)
-                    WHERE EXISTS((p1)-[:PARTY_TO]->(:Crime))
-                      AND EXISTS((p2)-[:PARTY_TO]->(:Crime))
-                    RETURN p1.name as person1, p2.name as person2
-                    LIMIT 30
-                """)
+                results[key] = self.db.read_named(name, params)[:limit]
             except Exception as e:
-                print(f"Error fetching networks: {e}")
-        
+                print(f"Error fetching {key}: {e}")
+        return results
+    
+    def _assemble(self, results):
+        """Shape executed retrievals into the context dict the generators expect"""
+        stats = results.pop('database_stats', None)
+        context = {'database_stats': stats[0] if stats else {'error': 'Could not fetch stats'}}
+        
+        for key, rows in results.items():
+            # Organization crime lists are only worth sending when non-empty
+            if key.startswith('org_') and not rows:
+                continue
+            context[key] = rows
         return context
     
     def _extract_entities_from_history(self, conversation_history):
         """Extract entities mentioned in previous conversation"""
-        entities = {
-            'locations': [],
-            'persons': [],
-            'organizations': []
-        }
-        
-        if not conversation_history:
-            return entities
-        
-        # Look at last 2-3 exchanges
-        recent_history = conversation_history[-6:] if len(conversation_history) > 6 else conversation_history
-        
-        for msg in recent_history:
-            content = msg.get('content', '')
-            
-            # Extract locations
-            entities['locations'].extend(self._extract_locations(content))
-            
-            # Extract person names
-            entities['persons'].extend(self._extract_person_names(content))
-            
-            # Extract organizations
-            entities['organizations'].extend(self._extract_organizations(content))
-        
-        return entities
+        # Look at last 2-3 exchanges, scanned as one text
+        recent_history = conversation_history[-6:] if conversation_history else []
+        return self._extract_entities("\n".join(msg.get('content', '') for msg in recent_history))
     
-    def _extract_locations(self, question):
-        """Extract location names from question"""
+    def _extract_entities(self, text):
+        """
+        Known graph entities mentioned in `text` ({kind: [names]}, see
+        EntityDictionary). Capitalized name pairs stand in for 'persons'
+        only when no person names could be loaded.
+        """
         try:
-            all_locations = self.db.query("MATCH (l:Location) RETURN l.name as name")
-            locations_found = []
-            q_lower = question.lower()
-            
-            for loc in all_locations:
-                if loc['name'].lower() in q_lower:
-                    locations_found.append(loc['name'])
-            
-            return locations_found
-        except:
-            return []
-    
-    def _extract_crime_types(self, question):
-        """Extract crime types from question"""
-        crime_types_known = [
-            "Theft", "Battery", "Criminal Damage", "Assault", "Burglary",
-            "Motor Vehicle Theft", "Robbery", "Deceptive Practice",
-            "Criminal Trespass", "Narcotics", "Weapons Violation"
-        ]
-        
-        found_types = []
-        q_lower = question.lower()
-        
-        for ctype in crime_types_known:
-            if ctype.lower() in q_lower:
-                found_types.append(ctype)
-        
-        return found_types
+            entities = self.entities.find(text)
+        except Exception as e:
+            print(f"⚠️ Entity matching failed: {e}")
+            entities = {kind: [] for kind in ENTITY_KINDS}
+        if not self.entities.counts.get('persons'):
+            entities['persons'] = self._extract_person_names(text)
+        return entities
     
     def _extract_person_names(self, question):
         """Extract potential person names from question"""
@@ -370,23 +285,33 @@ class GraphRAG:
         
         return potential_names
     
-    def _extract_organizations(self, question):
-        """Extract organization names from question"""
-        try:
-            all_orgs = self.db.query("MATCH (o:Organization) RETURN o.name as name")
-            orgs_found = []
-            q_lower = question.lower()
-            
-            for org in all_orgs:
-                if org['name'].lower() in q_lower:
-                    orgs_found.append(org['name'])
-            
-            return orgs_found
-        except:
-            return []
-    
-    def _generate_with_llm_conversational(self, question, context, conversation_history):
+    def _generate_with_llm_conversational(self, question, context, conversation_history, entities=None):
         """Generate answer using LLM with conversation awareness"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._llm_messages(question, context, conversation_history, entities),
+            temperature=0.7,
+            max_tokens=1000
+        )
+        
+        return response.choices[0].message.content
+    
+    def _stream_llm(self, messages):
+        """Yield the LLM's answer text piece by piece as it is generated"""
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1000,
+            stream=True
+        )
+        for chunk in stream:
+            # Some servers send chunks without choices (e.g. usage) or without text
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _llm_messages(self, question, context, conversation_history, entities=None):
+        """Chat messages for the LLM: system prompt, recent history, question with context"""
         
         system_prompt = """You are a conversational crime investigation AI assistant. You're having a natural dialogue with a detective.
 
@@ -443,27 +368,16 @@ CONVERSATION MEMORY:
                 "content": msg['content']
             })
         
-        # Format context
+        # Format context: ranked, compact tables within LLM_CONTEXT_TOKENS
         context_str = "\n**Retrieved Data from Knowledge Graph:**\n\n"
-        for key, value in context.items():
-            if value:
-                context_str += f"\n**{key.replace('_', ' ').title()}:**\n"
-                context_str += f"{json.dumps(value, indent=2, default=str)[:1500]}\n"
+        context_str += build_context(context, question, entities)
         
         # Add current question with context
         messages.append({
             "role": "user",
             "content": f"{question}\n\n{context_str}\n\nIMPORTANT: Respond in natural conversational paragraphs, NOT tables or lists. End with a follow-up question."
         })
-        
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1000
-        )
-        
-        return response.choices[0].message.content
+        return messages
     
     def _generate_fallback(self, question, context):
         """Generate detailed answer without LLM"""
@@ -477,9 +391,14 @@ CONVERSATION MEMORY:
                 answer += f"  Territory: {org['territory']} | Members: {org['members']}\n"
             answer += "\n"
         
-        if 'organization_members' in context and context['organization_members']:
+        # Every gang's members, or those of the organizations named
+        members = context.get('organization_members') or [
+            member for key, rows in context.items()
+            if key.startswith('org_') and key.endswith('_members') for member in rows
+        ]
+        if members:
             answer += "**👥 Key Members:**\n\n"
-            for member in context['organization_members'][:10]:
+            for member in members[:10]:
                 answer += f"- {member['member']} ({member['rank']}) - {member['organization']}\n"
             answer += "\n"
         
@@ -518,8 +437,51 @@ CONVERSATION MEMORY:
         
         return answer
 
+def check_compiled_fallback():
+    """
+    Offline check: a compiled plan that times out must still be answered by
+    the async fallback. Reads are faked, so no server is needed; returns
+    True when every planned read came back with rows.
+    """
+    import asyncio
+
+    class TimedOutDatabase(Database):
+        def __init__(self):
+            self.cache = None
+            self.timeouts = []
+
+        def read(self, cypher, params=None, ttl=None, label=None, timeout=None):
+            # Uses up its whole share, as a plan the server aborts would
+            self.timeouts.append(timeout)
+            time.sleep(timeout)
+            raise TimeoutError("transaction timed out")
+
+    async def read(cypher, params=None, label=None):
+        await asyncio.sleep(0.05)
+        return [{"label": label}]
+
+    plan = [("organizations", "rag.all_organizations", {}, 10), ("evidence", "rag.all_evidence", {}, 10)]
+    rag = GraphRAG.__new__(GraphRAG)
+    rag.db = TimedOutDatabase()
+    rag.async_db = AsyncDatabase()
+    rag.async_db.read = read
+    try:
+        results = rag._execute(plan)
+    finally:
+        rag.async_db.close()
+    ok = (config.RAG_COMPILED_PLAN and rag.db.timeouts and rag.db.timeouts[0] < config.RAG_DEADLINE_SECONDS
+          and all(results.get(key) for key, _, _, _ in plan))
+    print(f"{'✅' if ok else '❌'} compiled plan timed out after {rag.db.timeouts[0] if rag.db.timeouts else '-'}s; "
+          f"fallback returned {sorted(key for key, rows in results.items() if rows)}")
+    return bool(ok)
+
+
 # Test
 if __name__ == "__main__":
+    import sys
+    if "--check-fallback" in sys.argv:
+        sys.exit(0 if check_compiled_fallback() else 1)
+
     print("Testing Conversational Graph RAG")
     print("="*60)
     
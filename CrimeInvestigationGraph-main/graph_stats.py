@@ -0,0 +1,275 @@
+from graph_model import (
+    NODE_KEYS, RELATIONSHIP_STAGES, distinct_rows, node_statement, relationship_statement,
+    relationship_upsert_statement, upsert_statement
+)
+from collections import Counter
+import config
+import heapq
+import queries
+import threading
+import time
+
+
+def _normalize(cypher):
+    return " ".join(cypher.split())
+
+
+# load_data / incremental_load statements whose rows say exactly what they add
+_STATEMENTS = {_normalize(node_statement(label)): ("create", label) for label in NODE_KEYS}
+_STATEMENTS.update({_normalize(upsert_statement(label)): ("upsert", label) for label in NODE_KEYS})
+_STATEMENTS.update({_normalize(relationship_statement(stage)): ("merge", stage) for stage in RELATIONSHIP_STAGES})
+_STATEMENTS.update({_normalize(relationship_upsert_statement(stage)): ("upsert_relationship", stage)
+                    for stage in RELATIONSHIP_STAGES})
+
+# Labels whose properties feed an aggregate, so rewriting one changes the stats
+_TRACKED_PROPERTIES = {"Crime", "Location"}
+
+
+def _hour(time_value):
+    # Same as Cypher's substring(c.time, 0, 2)
+    return time_value[:2] if isinstance(time_value, str) else None
+
+
+def _top(counts, limit):
+    return heapq.nlargest(limit, counts.items(), key=lambda item: item[1])
+
+
+class GraphStats:
+    """
+    Materialized aggregates over the graph: nodes per label, relationships
+    per type, crimes per location, district, type and hour, and crimes per
+    person (for repeat offenders). Readers get dictionary lookups instead
+    of count queries.
+
+    The store is built with one pass of the stats.* catalog queries on
+    first use. Database.write_batches then folds every committed chunk of
+    load_data/incremental_load rows into it, and clearing the graph resets
+    it to empty; any other write marks it stale. A stale store, or one
+    older than `ttl` seconds (to pick up writes made by other processes),
+    is rebuilt on a background thread while readers keep getting the
+    current aggregates; only the first build blocks a reader.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl if ttl is not None else config.GRAPH_STATS_REFRESH_SECONDS
+        # Database the store is built from; set by Database(stats=...)
+        self.db = None
+        self.stale = True
+        self.built_at = 0
+        self.rebuilds = 0
+        self.applied = 0
+        # Bumped by every write; a rebuild that raced one stays stale
+        self.version = 0
+        self.refreshing = False
+        self.lock = threading.RLock()
+        # Serializes rebuilds, which run without holding `lock`
+        self.build_lock = threading.Lock()
+        self._set(self._empty())
+
+    @staticmethod
+    def _empty():
+        return {
+            "labels": Counter(),
+            "relationships": Counter(),
+            "location_crimes": Counter(),
+            "districts": {},  # location name -> district
+            "district_crimes": Counter(),
+            "type_crimes": Counter(),
+            "hour_crimes": Counter(),
+            "offenses": Counter(),  # person id -> PARTY_TO relationships
+            "repeat": 0,  # persons party to 2 or more crimes
+        }
+
+    def _set(self, aggregates):
+        for name, value in aggregates.items():
+            setattr(self, name, value)
+
+    def invalidate(self):
+        """Rebuild soon; for writes whose effect isn't known"""
+        with self.lock:
+            self.version += 1
+            self.stale = True
+
+    def clear(self):
+        """The graph was emptied: reset to an empty, current store instead of rebuilding"""
+        with self.lock:
+            self.version += 1
+            self._set(self._empty())
+            self.stale = False
+            self.built_at = time.monotonic()
+
+    def rebuild(self):
+        """Recompute every aggregate from the graph, then swap them in"""
+        with self.build_lock:
+            with self.lock:
+                version = self.version
+            started = time.perf_counter()
+            store = self._empty()
+            try:
+                for row in self.db.query(queries.cypher("stats.labels"), label="stats.labels"):
+                    store["labels"][row["label"]] = row["count"]
+                for row in self.db.query(queries.cypher("stats.relationships"), label="stats.relationships"):
+                    store["relationships"][row["type"]] = row["count"]
+                for row in self.db.query(queries.cypher("stats.locations"), label="stats.locations"):
+                    store["districts"][row["location"]] = row["district"]
+                    if row["crimes"]:
+                        store["location_crimes"][row["location"]] = row["crimes"]
+                        store["district_crimes"][row["district"]] += row["crimes"]
+                for row in self.db.query(queries.cypher("stats.crimes"), label="stats.crimes"):
+                    store["type_crimes"][row["type"]] += row["count"]
+                    store["hour_crimes"][row["hour"]] += row["count"]
+                for row in self.db.query(queries.cypher("stats.offenses"), label="stats.offenses"):
+                    store["offenses"][row["person"]] = row["crimes"]
+                    store["repeat"] += row["crimes"] >= 2
+            except Exception:
+                with self.lock:
+                    self.stale = True
+                raise
+            with self.lock:
+                self._set(store)
+                # A write landed mid-rebuild: its rows may be missing, so go again
+                self.stale = self.version != version
+                self.built_at = time.monotonic()
+                self.rebuilds += 1
+            print(f"📊 Graph statistics rebuilt in {time.perf_counter() - started:.2f}s")
+
+    def _fresh(self):
+        if not self.built_at:
+            # Nothing to serve yet
+            with self.build_lock:
+                built = self.built_at
+            if not built:
+                self.rebuild()
+            return
+        with self.lock:
+            if self.refreshing or not (self.stale or time.monotonic() - self.built_at >= self.ttl):
+                return
+            self.refreshing = True
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"⚠️ Graph statistics rebuild failed: {e}")
+        finally:
+            self.refreshing = False
+
+    # ------------------------------------------------------------ writes
+    def apply(self, cypher, rows, created=None, properties_set=0):
+        """
+        Fold one committed write_batches chunk into the aggregates.
+        `created` is the nodes plus relationships the chunk created (None:
+        one per row). Returns False, leaving the store stale, when the
+        statement or its effect on the aggregates can't be known.
+        """
+        kind, target = _STATEMENTS.get(_normalize(cypher), (None, None))
+        with self.lock:
+            self.version += 1
+            if self.stale:
+                return False
+            if kind == "create" and created in (None, len(rows)):
+                self._add_nodes(target, rows)
+            elif kind == "upsert" and created == len(rows):
+                self._add_nodes(target, [row["props"] for row in rows])
+            elif kind == "upsert" and created == 0 and not (properties_set and target in _TRACKED_PROPERTIES):
+                pass  # Only unchanged or untracked nodes
+            elif kind == "upsert_relationship" and created is not None:
+                # Property updates don't touch the aggregates; only new relationships do
+                rows = list(distinct_rows(target, rows))
+                if created == len(rows):
+                    self._add_relationships(target, rows)
+                elif created:
+                    self.stale = True
+            elif kind == "merge":
+                # MERGE creates nothing for rows already in the graph or missing an end node
+                rows = list(distinct_rows(target, rows))
+                if created is None:
+                    created = len(rows)
+                if created == len(rows):
+                    self._add_relationships(target, rows)
+                elif created:
+                    self.stale = True
+            else:
+                self.stale = True
+            self.applied += not self.stale
+            return not self.stale
+
+    def _add_nodes(self, label, rows):
+        self.labels[label] += len(rows)
+        if label == "Location":
+            for row in rows:
+                self.districts[row.get("name")] = row.get("district")
+        elif label == "Crime":
+            for row in rows:
+                self.type_crimes[row.get("type")] += 1
+                self.hour_crimes[_hour(row.get("time"))] += 1
+
+    def _add_relationships(self, stage, rows):
+        self.relationships[stage["type"]] += len(rows)
+        if stage["type"] == "OCCURRED_AT":
+            for row in rows:
+                self.location_crimes[row["end"]] += 1
+                self.district_crimes[self.districts.get(row["end"])] += 1
+        elif stage["type"] == "PARTY_TO":
+            for row in rows:
+                self.offenses[row["start"]] += 1
+                self.repeat += self.offenses[row["start"]] == 2
+
+    # ------------------------------------------------------------- reads
+    def count(self, label):
+        """Nodes with a label"""
+        self._fresh()
+        return self.labels[label]
+
+    def relationship_count(self, rel_type):
+        self._fresh()
+        return self.relationships[rel_type]
+
+    def repeat_offenders(self):
+        """Persons party to two or more crimes"""
+        self._fresh()
+        return self.repeat
+
+    def hotspots(self, limit=10):
+        """[{location, district, crimes}] for the locations with the most crimes"""
+        self._fresh()
+        with self.lock:
+            return [{"location": location, "district": self.districts.get(location), "crimes": n}
+                    for location, n in _top(self.location_crimes, limit)]
+
+    def crime_types(self, limit=10):
+        """[{type, count}], most common first"""
+        self._fresh()
+        with self.lock:
+            return [{"type": crime_type, "count": n} for crime_type, n in _top(self.type_crimes, limit)]
+
+    def districts_by_crimes(self):
+        """[{district, crimes}], most crimes first"""
+        self._fresh()
+        with self.lock:
+            return [{"district": district, "crimes": n}
+                    for district, n in _top(self.district_crimes, len(self.district_crimes)) if n]
+
+    def hourly_pattern(self):
+        """[{hour, count}] by hour ("00".."23"), crimes without a time last"""
+        self._fresh()
+        with self.lock:
+            return [{"hour": hour, "count": n}
+                    for hour, n in sorted(self.hour_crimes.items(), key=lambda item: (item[0] is None, item[0] or ""))
+                    if n]
+
+    def summary(self):
+        """The GraphRAG database_stats context entry"""
+        self._fresh()
+        with self.lock:
+            return {
+                "total_crimes": self.labels["Crime"],
+                "total_persons": self.labels["Person"],
+                "total_locations": self.labels["Location"],
+                "total_organizations": self.labels["Organization"],
+                "total_evidence": self.labels["Evidence"],
+                "repeat_offenders": self.repeat,
+                "crimes_by_district": {district: n for district, n in _top(self.district_crimes, len(self.district_crimes))
+                                       if n and district is not None},
+            }
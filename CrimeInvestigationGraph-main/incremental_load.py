@@ -0,0 +1,107 @@
+from graph_model import NODE_KEYS, RELATIONSHIP_STAGES, content_hash, relationship_upsert_rows, relationship_upsert_statement, upsert_statement
+from load_data import report_stage
+from itertools import islice
+import config
+import json
+import os
+import time
+
+
+class Checkpoint:
+    """
+    Progress of one ingestion run, saved after every committed batch.
+    A checkpoint left by a different run (other seed/source) is ignored.
+    """
+
+    def __init__(self, path, run_id):
+        self.path = path
+        self.run_id = run_id
+        self.state = {"run_id": run_id, "stages": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("run_id") == run_id:
+                self.state = saved
+
+    @property
+    def resuming(self):
+        return bool(self.state["stages"])
+
+    def rows_done(self, stage):
+        return self.state["stages"].get(stage, {}).get("rows", 0)
+
+    def is_complete(self, stage):
+        return self.state["stages"].get(stage, {}).get("complete", False)
+
+    def advance(self, stage, rows):
+        entry = self.state["stages"].setdefault(stage, {"rows": 0, "complete": False})
+        entry["rows"] += rows
+        self._save()
+
+    def complete(self, stage):
+        self.state["stages"].setdefault(stage, {"rows": 0})["complete"] = True
+        self._save()
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+
+def _run_stage(db, checkpoint, stage, cypher, rows, batch_size):
+    """Write one stage from where the checkpoint left off"""
+    if checkpoint.is_complete(stage):
+        print(f"   ⏭️  {stage}: already loaded")
+        return
+
+    skip = checkpoint.rows_done(stage)
+    if skip:
+        print(f"   ↪️  {stage}: resuming after {skip:,} rows")
+
+    touched = {"created": 0, "properties_set": 0}
+
+    def on_batch(count, counters):
+        touched["created"] += counters.nodes_created + counters.relationships_created
+        touched["properties_set"] += counters.properties_set
+        checkpoint.advance(stage, count)
+
+    started = time.perf_counter()
+    written = db.write_batches(cypher, islice(rows, skip, None), batch_size, on_batch=on_batch)
+    checkpoint.complete(stage)
+    report_stage(stage, written, time.perf_counter() - started)
+    print(f"      {touched['created']:,} created, {touched['properties_set']:,} properties written")
+
+
+def load_incremental(db, dataset, run_id, batch_size=None, checkpoint_path=None):
+    """
+    Upsert a dataset into an existing graph without clearing it.
+
+    Nodes are merged on their natural key and rewritten only when their
+    content hash changed; relationships are merged on their endpoints and
+    their properties updated the same way. Progress is checkpointed
+    per batch, so rerunning the same run_id after an interruption resumes.
+    """
+    batch_size = batch_size or config.LOAD_BATCH_SIZE
+    checkpoint = Checkpoint(checkpoint_path or config.INGEST_CHECKPOINT, run_id)
+    if checkpoint.resuming:
+        print(f"🔁 Resuming interrupted run {run_id}")
+
+    print(f"📦 Upserting nodes ({batch_size:,} rows per transaction)...")
+    for label in NODE_KEYS:
+        key = NODE_KEYS[label]
+        rows = ({"key": row[key], "hash": content_hash(row), "props": row}
+                for row in dataset["nodes"][label])
+        _run_stage(db, checkpoint, label, upsert_statement(label), rows, batch_size)
+
+    print("🔗 Merging relationships...")
+    for stage in RELATIONSHIP_STAGES:
+        rows = relationship_upsert_rows(stage, dataset["relationships"][stage["name"]])
+        _run_stage(db, checkpoint, stage["name"], relationship_upsert_statement(stage), rows, batch_size)
+
+    checkpoint.clear()
+    print("✅ Incremental load complete")
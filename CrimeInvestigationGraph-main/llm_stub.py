@@ -0,0 +1,97 @@
+import hashlib
+import time
+
+# Vocabulary for generated answers; picked by prompt hash so output is repeatable
+WORDS = ("the", "crime", "suspect", "network", "location", "organization", "evidence",
+         "pattern", "district", "members", "recent", "activity", "linked", "reported",
+         "investigation", "shows", "several", "incidents", "near", "and")
+
+
+class _Message:
+    def __init__(self, content):
+        self.role = "assistant"
+        self.content = content
+
+
+class _Choice:
+    def __init__(self, content):
+        self.index = 0
+        self.message = _Message(content)
+        self.finish_reason = "stop"
+
+
+class _Completion:
+    def __init__(self, model, content):
+        self.model = model
+        self.choices = [_Choice(content)]
+
+
+class _Delta:
+    def __init__(self, content):
+        self.role = "assistant"
+        self.content = content
+
+
+class _ChunkChoice:
+    def __init__(self, content, finish_reason):
+        self.index = 0
+        self.delta = _Delta(content)
+        self.finish_reason = finish_reason
+
+
+class _Chunk:
+    def __init__(self, model, content, finish_reason=None):
+        self.model = model
+        self.choices = [_ChunkChoice(content, finish_reason)]
+
+
+class _Completions:
+    def __init__(self, stub):
+        self.stub = stub
+
+    def create(self, model=None, messages=None, temperature=None, max_tokens=None, **kwargs):
+        self.stub.calls += 1
+        content = self.stub.answer(messages or [], max_tokens)
+        if kwargs.get("stream"):
+            return self._stream(model, content)
+        if self.stub.delay:
+            time.sleep(self.stub.delay * len(content.split()))
+        return _Completion(model, content)
+
+    def _stream(self, model, content):
+        # One chunk per word (with its leading space), like a token stream
+        for i, word in enumerate(content.split(" ")):
+            if self.stub.delay:
+                time.sleep(self.stub.delay)
+            yield _Chunk(model, word if i == 0 else " " + word)
+        yield _Chunk(model, None, "stop")
+
+
+class _Chat:
+    def __init__(self, stub):
+        self.completions = _Completions(stub)
+
+
+class StubClient:
+    """
+    Local stand-in for the OpenAI client: `chat.completions.create` returns
+    a deterministic answer derived from the prompt, so GraphRAG runs (and
+    benchmarks) without network access or model variance. With
+    `stream=True` it returns the answer as chunks, one word each, whose
+    `choices[0].delta.content` carries the text.
+    `delay` seconds are spent per generated word to mimic model latency.
+    """
+
+    def __init__(self, words=120, delay=0.0):
+        self.words = words
+        self.delay = delay
+        self.calls = 0
+        self.chat = _Chat(self)
+
+    def answer(self, messages, max_tokens=None):
+        prompt = "\n".join(str(m.get("content", "")) for m in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        count = min(self.words, max_tokens or self.words)
+        words = [WORDS[digest[i % len(digest)] % len(WORDS)] for i in range(count)]
+        question = messages[-1]["content"].split("\n", 1)[0] if messages else ""
+        return f"Stub answer to: {question}\n\n" + " ".join(words)
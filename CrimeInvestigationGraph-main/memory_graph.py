@@ -0,0 +1,992 @@
+from graph_model import (
+    NODE_KEYS, RELATIONSHIP_STAGES, distinct_rows, node_statement, relationship_statement,
+    relationship_upsert_statement, upsert_statement
+)
+from schema import RANGE_INDEXES
+from collections import Counter, defaultdict
+from database import columns_from_rows, to_arrow, to_frame
+from queries import COLUMN_TYPES, QUERIES
+from itertools import islice
+import argparse
+import heapq
+import sys
+import time
+
+
+def _normalize(cypher):
+    return " ".join(cypher.split())
+
+
+# Catalog text -> name, so read(QUERIES[name]) works like read_named(name)
+_CATALOG_NAMES = {_normalize(text): name for name, text in QUERIES.items()}
+
+# load_data's and incremental_load's UNWIND statements -> what they write
+_LOAD_STATEMENTS = {_normalize(node_statement(label)): ("node", label) for label in NODE_KEYS}
+_LOAD_STATEMENTS.update({_normalize(relationship_statement(stage)): ("relationship", stage)
+                         for stage in RELATIONSHIP_STAGES})
+_LOAD_STATEMENTS.update({_normalize(upsert_statement(label)): ("upsert", label) for label in NODE_KEYS})
+_LOAD_STATEMENTS.update({_normalize(relationship_upsert_statement(stage)): ("upsert_relationship", stage)
+                         for stage in RELATIONSHIP_STAGES})
+
+
+class _Counters:
+    """The neo4j SummaryCounters fields the loaders read"""
+
+    def __init__(self, nodes_created=0, relationships_created=0, properties_set=0):
+        self.nodes_created = nodes_created
+        self.relationships_created = relationships_created
+        self.properties_set = properties_set
+
+
+class UnsupportedCypher(ValueError):
+    """
+    Raised by MemoryDatabase for Cypher it doesn't evaluate. It runs the
+    queries.py catalog reads and the load_data / incremental_load UNWIND
+    write statements (whatever their entry point: query, write, write_many
+    or write_batches), and purges by label; nothing else.
+    """
+
+
+def _sort_key(value):
+    # Cypher orders null after every value ascending, before them descending
+    return (value is None, value)
+
+
+def _order(rows, keys, limit=None):
+    """ORDER BY [(field, descending)] ... LIMIT over dict rows"""
+    rows = rows if isinstance(rows, list) else list(rows)
+    directions = {desc for _, desc in keys}
+    if limit is not None and len(directions) == 1:
+        pick = heapq.nlargest if directions == {True} else heapq.nsmallest
+        return pick(limit, rows, key=lambda r: tuple(_sort_key(r[f]) for f, _ in keys))
+    for field, desc in reversed(keys):
+        rows.sort(key=lambda r: _sort_key(r[field]), reverse=desc)
+    return rows[:limit] if limit is not None else rows
+
+
+def _limit(rows, limit):
+    """LIMIT over a row generator"""
+    out = []
+    for row in rows:
+        if len(out) >= limit:
+            break
+        out.append(row)
+    return out
+
+
+class MemoryGraph:
+    """
+    In-process property graph with the load_data schema.
+
+    Nodes are props dicts addressed by integer id. Each relationship type has
+    its own outgoing/incoming adjacency lists, natural keys (NODE_KEYS) have
+    unique hash indexes, and the schema.py range-indexed properties have
+    non-unique hash indexes.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.props = []          # id -> properties
+        self.labels = []         # id -> label
+        self.by_label = defaultdict(list)
+        self.keys = {label: {} for label in NODE_KEYS}
+        self.indexes = {(label, prop): defaultdict(list) for label, prop in RANGE_INDEXES}
+        self.out = defaultdict(lambda: defaultdict(list))   # type -> id -> [(other, rel props)]
+        self.inc = defaultdict(lambda: defaultdict(list))
+        self.rel_counts = Counter()
+        self.deleted = set()
+
+    def add_node(self, label, props):
+        key = NODE_KEYS.get(label)
+        if key is not None and props.get(key) in self.keys[label]:
+            node = self.keys[label][props[key]]
+            self._unindex(node)
+            self.props[node] = dict(props)
+        else:
+            node = len(self.props)
+            self.props.append(dict(props))
+            self.labels.append(label)
+            self.by_label[label].append(node)
+            if key is not None:
+                self.keys[label][props.get(key)] = node
+        for (index_label, prop), index in self.indexes.items():
+            if index_label == label and props.get(prop) is not None:
+                index[props[prop]].append(node)
+        return node
+
+    def _unindex(self, node):
+        label, props = self.labels[node], self.props[node]
+        for (index_label, prop), index in self.indexes.items():
+            if index_label == label and props.get(prop) in index:
+                index[props[prop]].remove(node)
+
+    def node(self, label, key_value):
+        """Node id by natural key, or None"""
+        node = self.keys[label].get(key_value)
+        return None if node is None or node in self.deleted else node
+
+    def add_relationship(self, rel_type, start, end, props=None):
+        props = props or {}
+        self.out[rel_type][start].append((end, props))
+        self.inc[rel_type][end].append((start, props))
+        self.rel_counts[rel_type] += 1
+
+    def nodes(self, label):
+        return (n for n in self.by_label[label] if n not in self.deleted)
+
+    def lookup(self, label, prop, value):
+        """Nodes with label and prop = value, through an index when there is one"""
+        if NODE_KEYS.get(label) == prop:
+            node = self.node(label, value)
+            return [] if node is None else [node]
+        index = self.indexes.get((label, prop))
+        if index is not None:
+            return [n for n in index.get(value, []) if n not in self.deleted]
+        return [n for n in self.nodes(label) if self.props[n].get(prop) == value]
+
+    def outgoing(self, node, rel_type):
+        return [(m, r) for m, r in self.out[rel_type].get(node, ()) if m not in self.deleted]
+
+    def incoming(self, node, rel_type):
+        return [(m, r) for m, r in self.inc[rel_type].get(node, ()) if m not in self.deleted]
+
+    def both(self, node, rel_type):
+        """Undirected pattern (a)-[:TYPE]-(b): a self-loop is matched once per direction"""
+        return self.outgoing(node, rel_type) + self.incoming(node, rel_type)
+
+    def all_relationships(self, node):
+        """(type, other) for (n)-[r]-(other) over every type"""
+        for rel_type in list(self.out):
+            for other, _ in self.outgoing(node, rel_type):
+                yield rel_type, other
+            for other, _ in self.incoming(node, rel_type):
+                yield rel_type, other
+
+    def count(self, label):
+        return len(self.by_label[label]) - sum(1 for n in self.deleted if self.labels[n] == label)
+
+    def delete(self, nodes):
+        """DETACH DELETE: relationships to deleted nodes are skipped on traversal"""
+        nodes = set(nodes) - self.deleted
+        gone = self.deleted | nodes
+        for node in nodes:
+            for rel_type in self.out:
+                # Relationships to nodes deleted by an earlier call were already
+                # subtracted; ones within this call are counted at their start
+                self.rel_counts[rel_type] -= sum(1 for m, _ in self.out[rel_type].get(node, ())
+                                                 if m not in self.deleted)
+                self.rel_counts[rel_type] -= sum(1 for m, _ in self.inc[rel_type].get(node, ()) if m not in gone)
+            self._unindex(node)
+            key = NODE_KEYS.get(self.labels[node])
+            if key is not None:
+                self.keys[self.labels[node]].pop(self.props[node].get(key), None)
+        self.deleted |= nodes
+        return len(nodes)
+
+    def add_stage(self, stage, rows):
+        """Add a RELATIONSHIP_STAGES stage's {start, end, props...} rows; returns the relationships added"""
+        start_keys, end_keys = self.keys[stage["start"]], self.keys[stage["end"]]
+        count = 0
+        for row in rows:
+            start, end = start_keys.get(row["start"]), end_keys.get(row["end"])
+            if start is not None and end is not None:
+                self.add_relationship(stage["type"], start, end, {p: row[p] for p in stage["props"]})
+                count += 1
+        return count
+
+    def upsert_node(self, label, row):
+        """
+        incremental_load.upsert_statement for one {key, hash, props} row.
+        Returns (nodes created, properties set).
+        """
+        node = self.node(label, row["key"])
+        if node is not None and self.props[node].get("content_hash") == row["hash"]:
+            return 0, 0
+        props = dict(row["props"], content_hash=row["hash"])
+        self.add_node(label, props)
+        return int(node is None), len(props)
+
+    def upsert_relationship(self, stage, row):
+        """
+        incremental_load.relationship_upsert_statement for one {start, end,
+        hash, props} row. Returns (relationships created, properties set).
+        """
+        start, end = self.node(stage["start"], row["start"]), self.node(stage["end"], row["end"])
+        if start is None or end is None:
+            return 0, 0
+        pairs = self.outgoing(start, stage["type"]) if stage["directed"] else self.both(start, stage["type"])
+        existing = next((props for other, props in pairs if other == end), None)
+        if existing is None:
+            props = dict(row["props"], content_hash=row["hash"])
+            self.add_relationship(stage["type"], start, end, props)
+            return 1, len(props)
+        if existing.get("content_hash") == row["hash"]:
+            return 0, 0
+        # Shared by the outgoing and incoming lists, so one update does both
+        existing.update(row["props"], content_hash=row["hash"])
+        return 0, len(row["props"]) + 1
+
+    def load(self, dataset):
+        """
+        Load a generate_dataset / ScaleGenerator.dataset() graph, streaming
+        its rows. Relationships follow load_data's MERGE: duplicate rows collapse.
+        """
+        started = time.perf_counter()
+        for label in NODE_KEYS:
+            for props in dataset["nodes"][label]:
+                self.add_node(label, props)
+        for stage in RELATIONSHIP_STAGES:
+            self.add_stage(stage, distinct_rows(stage, dataset["relationships"][stage["name"]]))
+        print(f"✅ Loaded {len(self.props):,} nodes and {sum(self.rel_counts.values()):,} relationships "
+              f"in {time.perf_counter() - started:.1f}s")
+
+
+# ============================================================================
+# CATALOG QUERIES
+# One function per queries.py entry, evaluating the same pattern over the
+# in-memory indexes and returning the same columns in the same order.
+# ============================================================================
+def _occurred_at(g, crime):
+    return [l for l, _ in g.outgoing(crime, "OCCURRED_AT")]
+
+
+def _name_contains(g, label, text):
+    text = (text or "").lower()
+    return [n for n in g.nodes(label) if text in (g.props[n].get("name") or "").lower()]
+
+
+def _crimes_per_location(g):
+    counts = Counter()
+    for crime in g.nodes("Crime"):
+        counts.update(_occurred_at(g, crime))
+    return counts
+
+
+def dashboard_recent(g, params):
+    rows = ({"type": g.props[c].get("type"), "date": g.props[c].get("date"),
+             "time": g.props[c].get("time"), "location": g.props[l].get("name")}
+            for c in g.nodes("Crime") for l in _occurred_at(g, c))
+    return _order(rows, [("date", True), ("time", True)], 5)
+
+
+def network_persons(g, params):
+    names = {g.props[p].get("name") for p in g.nodes("Person")}
+    return [{"name": name} for name in sorted(names, key=_sort_key)]
+
+
+def network_person_graph(g, params):
+    groups = {}
+    for p in g.lookup("Person", "name", params["person"]):
+        orgs = [o for o, _ in g.outgoing(p, "MEMBER_OF")] or [None]
+        friends = [g.props[f].get("name") for f, _ in g.both(p, "KNOWS")]
+        for c, _ in g.outgoing(p, "PARTY_TO"):
+            for l in _occurred_at(g, c):
+                for o in orgs:
+                    key = (g.props[p].get("name"), g.props[c].get("id"), g.props[c].get("type"),
+                           g.props[l].get("name"), g.props[o].get("name") if o is not None else None)
+                    connections = groups.setdefault(key, [])
+                    connections.extend(f for f in friends if f is not None and f not in connections)
+    rows = [{"person": k[0], "crime_id": k[1], "crime_type": k[2], "location": k[3],
+             "organization": k[4], "connections": v[:10]} for k, v in groups.items()]
+    return rows[:params["limit"]]
+
+
+def network_gang_graph(g, params):
+    rows = ({"person": g.props[p].get("name"), "organization": g.props[o].get("name"),
+             "crime_id": g.props[c].get("id"), "crime_type": g.props[c].get("type"),
+             "location": g.props[l].get("name")}
+            for p in g.nodes("Person") for o, _ in g.outgoing(p, "MEMBER_OF")
+            for c, _ in g.outgoing(p, "PARTY_TO") for l in _occurred_at(g, c))
+    return _limit(rows, params["limit"])
+
+
+def network_graph(g, params):
+    def rows():
+        for p in g.nodes("Person"):
+            orgs = [o for o, _ in g.outgoing(p, "MEMBER_OF")] or [None]
+            for c, _ in g.outgoing(p, "PARTY_TO"):
+                for l in _occurred_at(g, c):
+                    for o in orgs:
+                        yield {"person": g.props[p].get("name"), "crime_id": g.props[c].get("id"),
+                               "crime_type": g.props[c].get("type"), "location": g.props[l].get("name"),
+                               "organization": g.props[o].get("name") if o is not None else None}
+    return _limit(rows(), params["limit"])
+
+
+def _has_crime(g, person):
+    return bool(g.outgoing(person, "PARTY_TO"))
+
+
+def network_knows(g, params):
+    rows = ({"p1": g.props[p1].get("name"), "p2": g.props[p2].get("name")}
+            for p1 in g.nodes("Person") if _has_crime(g, p1)
+            for p2, _ in g.both(p1, "KNOWS"))
+    return _limit(rows, 30)
+
+
+def _network3d(g, crimes, limit):
+    def rows():
+        for c in crimes:
+            for p, _ in g.incoming(c, "PARTY_TO"):
+                for rel_type, other in g.all_relationships(p):
+                    yield {"person": g.props[p].get("name"), "crime": g.props[c].get("id"),
+                           "relationship": rel_type, "connected_type": g.labels[other],
+                           "connected_name": g.props[other].get("name")}
+    return _limit(rows(), limit)
+
+
+def network3d_graph(g, params):
+    return _network3d(g, g.nodes("Crime"), params["limit"])
+
+
+def network3d_by_type(g, params):
+    return _network3d(g, g.lookup("Crime", "type", params["crime_type"]), params["limit"])
+
+
+def rag_entities_locations(g, params):
+    return [{"name": g.props[l].get("name")} for l in g.nodes("Location")]
+
+
+def rag_entities_organizations(g, params):
+    return [{"name": g.props[o].get("name")} for o in g.nodes("Organization")]
+
+
+def _distinct(g, label, prop):
+    values = dict.fromkeys(g.props[n].get(prop) for n in g.nodes(label))
+    return [{"name": value} for value in values]
+
+
+def rag_entities_crime_types(g, params):
+    return _distinct(g, "Crime", "type")
+
+
+def rag_entities_persons(g, params):
+    return _distinct(g, "Person", "name")
+
+
+def rag_entities_plates(g, params):
+    return [{"name": g.props[v]["license_plate"]} for v in g.nodes("Vehicle")
+            if g.props[v].get("license_plate") is not None]
+
+
+def rag_entities_mo(g, params):
+    return [{"name": g.props[m].get("description")} for m in g.nodes("ModusOperandi")]
+
+
+def _project(g, label, columns):
+    return [{alias: g.props[n].get(prop) for alias, prop in columns} for n in g.nodes(label)]
+
+
+def rag_all_organizations(g, params):
+    rows = _project(g, "Organization", [("name", "name"), ("type", "type"), ("territory", "territory"),
+                                        ("members", "members_count"), ("activity", "activity_level")])
+    return _order(rows, [("members", True)])
+
+
+def rag_organization_members(g, params):
+    rows = [{"organization": g.props[o].get("name"), "member": g.props[p].get("name"),
+             "age": g.props[p].get("age"), "rank": r.get("rank")}
+            for p in g.nodes("Person") for o, r in g.outgoing(p, "MEMBER_OF")]
+    return _order(rows, [("organization", False), ("rank", False)], 50)
+
+
+def rag_org_members(g, params):
+    rows = [{"organization": g.props[o].get("name"), "member": g.props[p].get("name"),
+             "age": g.props[p].get("age"), "rank": r.get("rank")}
+            for o in g.nodes("Organization") if g.props[o].get("name") == params["org"]
+            for p, r in g.incoming(o, "MEMBER_OF")]
+    return _order(rows, [("rank", False)], 50)
+
+
+def rag_org_crimes(g, params):
+    rows = [{"crime_type": g.props[c].get("type"), "date": g.props[c].get("date"),
+             "location": g.props[l].get("name"), "member": g.props[p].get("name")}
+            for o in g.nodes("Organization") if g.props[o].get("name") == params["org"]
+            for p, _ in g.incoming(o, "MEMBER_OF")
+            for c, _ in g.outgoing(p, "PARTY_TO") for l in _occurred_at(g, c)]
+    return _order(rows, [("date", True)], 30)
+
+
+SIGNIFICANCE_RANK = {"critical": 1, "high": 2, "medium": 3}
+
+
+def rag_all_evidence(g, params):
+    rows = _project(g, "Evidence", [("id", "id"), ("type", "type"), ("description", "description"),
+                                    ("significance", "significance"), ("verified", "verified")])
+    rows.sort(key=lambda r: SIGNIFICANCE_RANK.get(r["significance"], 4))
+    return rows[:30]
+
+
+def rag_evidence_person_links(g, params):
+    rows = [{"evidence_id": g.props[e].get("id"), "evidence": g.props[e].get("description"),
+             "suspect": g.props[p].get("name"), "confidence": r.get("confidence")}
+            for e in g.nodes("Evidence") for p, r in g.outgoing(e, "LINKS_TO")]
+    return _order(rows, [("confidence", True)], 30)
+
+
+def rag_all_investigators(g, params):
+    rows = _project(g, "Investigator", [("name", "name"), ("badge", "badge_number"),
+                                        ("department", "department"), ("specialization", "specialization"),
+                                        ("solved", "cases_solved"), ("active", "active_cases")])
+    return _order(rows, [("solved", True)])
+
+
+def rag_all_mo_patterns(g, params):
+    rows = _project(g, "ModusOperandi", [("id", "id"), ("description", "description"),
+                                         ("signature", "signature_element"), ("frequency", "frequency")])
+    return _order(rows, [("frequency", True)])
+
+
+def rag_crimes_by_mo(g, params):
+    rows = [{"mo": g.props[m].get("description"), "crime_id": g.props[c].get("id"),
+             "crime_type": g.props[c].get("type"), "similarity": r.get("similarity")}
+            for c in g.nodes("Crime") for m, r in g.outgoing(c, "MATCHES_MO")]
+    return _order(rows, [("similarity", True)], 40)
+
+
+def rag_all_vehicles(g, params):
+    rows = _project(g, "Vehicle", [("id", "id"), ("make", "make"), ("model", "model"), ("year", "year"),
+                                   ("color", "color"), ("plate", "license_plate"), ("stolen", "reported_stolen")])
+    return _order(rows, [("stolen", True)], 30)
+
+
+def rag_all_weapons(g, params):
+    columns = [("id", "id"), ("type", "type"), ("make", "make"), ("model", "model"), ("recovered", "recovered")]
+    return _limit(({alias: g.props[w].get(prop) for alias, prop in columns} for w in g.nodes("Weapon")), 30)
+
+
+def _in_location(g, location, rel_type, columns):
+    """DISTINCT rows for the nodes `rel_type` links to from crimes at matching locations"""
+    rows = {}
+    for l in _name_contains(g, "Location", location):
+        for c, _ in g.incoming(l, "OCCURRED_AT"):
+            for n, _ in g.outgoing(c, rel_type):
+                row = {alias: g.props[n].get(prop) for alias, prop in columns}
+                row["location"] = g.props[l].get("name")
+                rows.setdefault(tuple(row.values()), row)
+    return list(rows.values())
+
+
+def rag_vehicles_in_location(g, params):
+    rows = _in_location(g, params["location"], "INVOLVED_VEHICLE",
+                        [("id", "id"), ("make", "make"), ("model", "model"), ("year", "year"),
+                         ("color", "color"), ("plate", "license_plate"), ("stolen", "reported_stolen")])
+    return _order(rows, [("stolen", True)], 30)
+
+
+def rag_weapons_in_location(g, params):
+    rows = _in_location(g, params["location"], "USED_WEAPON",
+                        [("id", "id"), ("type", "type"), ("make", "make"), ("model", "model"),
+                         ("recovered", "recovered")])
+    return rows[:30]
+
+
+def rag_crimes_in_location(g, params):
+    rows = [{"crime_id": g.props[c].get("id"), "crime_type": g.props[c].get("type"),
+             "date": g.props[c].get("date"), "severity": g.props[c].get("severity")}
+            for l in _name_contains(g, "Location", params["location"])
+            for c, _ in g.incoming(l, "OCCURRED_AT")]
+    return _order(rows, [("date", True)], 30)
+
+
+def rag_suspects_in_location(g, params):
+    crimes = defaultdict(set)
+    for l in _name_contains(g, "Location", params["location"]):
+        for c, _ in g.incoming(l, "OCCURRED_AT"):
+            for p, _ in g.incoming(c, "PARTY_TO"):
+                crimes[p].add(c)
+    rows = [{"name": g.props[p].get("name"), "age": g.props[p].get("age"),
+             "risk_score": g.props[p].get("risk_score"), "crime_count": len(cs)} for p, cs in crimes.items()]
+    return _order(rows, [("crime_count", True)], 20)
+
+
+def rag_person_connections(g, params):
+    def rows():
+        seen = set()
+        for p in _name_contains(g, "Person", params["name"]):
+            # Relationship-unique paths of length 1..2
+            for hop1, (x, r1) in enumerate(g.both(p, "KNOWS")):
+                reached = [x] + [y for y, r2 in g.both(x, "KNOWS") if r2 is not r1]
+                for n in reached:
+                    row = (g.props[n].get("name"), g.props[n].get("age"), g.props[n].get("criminal_record"))
+                    if row not in seen:
+                        seen.add(row)
+                        yield {"name": row[0], "age": row[1], "has_record": row[2]}
+    return _limit(rows(), 30)
+
+
+def rag_repeat_offenders(g, params):
+    rows = []
+    for p in g.nodes("Person"):
+        crimes = len(g.outgoing(p, "PARTY_TO"))
+        if crimes >= 2:
+            orgs = [o for o, _ in g.outgoing(p, "MEMBER_OF")] or [None]
+            rows.extend({"name": g.props[p].get("name"), "age": g.props[p].get("age"), "crimes": crimes,
+                         "organization": g.props[o].get("name") if o is not None else None} for o in orgs)
+    return _order(rows, [("crimes", True)], 20)
+
+
+def rag_criminal_networks(g, params):
+    rows = ({"person1": g.props[p1].get("name"), "person2": g.props[p2].get("name")}
+            for p1 in g.nodes("Person") if _has_crime(g, p1)
+            for p2, _ in g.both(p1, "KNOWS") if _has_crime(g, p2))
+    return _limit(rows, 30)
+
+
+def _coalesce(*values):
+    # Cypher coalesce(): the first non-null value, so a stored None falls through too
+    return next((value for value in values if value is not None), None)
+
+
+def map_crimes(g, params):
+    for c in g.nodes("Crime"):
+        for l in _occurred_at(g, c):
+            crime, location = g.props[c], g.props[l]
+            yield {"crime_id": crime.get("id"), "crime_type": crime.get("type"), "date": crime.get("date"),
+                   "time": crime.get("time"), "case_number": crime.get("case_number"),
+                   "location": location.get("name"),
+                   "lat": _coalesce(crime.get("latitude"), location.get("latitude")),
+                   "lon": _coalesce(crime.get("longitude"), location.get("longitude"))}
+
+
+def predictive_crime_points(g, params):
+    for c in g.nodes("Crime"):
+        for l in _occurred_at(g, c):
+            crime, location = g.props[c], g.props[l]
+            yield {"crime_id": crime.get("id"), "crime_type": crime.get("type"),
+                   "lat": _coalesce(crime.get("latitude"), location.get("latitude")),
+                   "lon": _coalesce(crime.get("longitude"), location.get("longitude"))}
+
+
+def predictive_type_correlation(g, params):
+    counts = Counter()
+    for p in g.nodes("Person"):
+        types = [g.props[c].get("type") for c, _ in g.outgoing(p, "PARTY_TO")]
+        for i, t1 in enumerate(types):
+            for j, t2 in enumerate(types):
+                if i != j:
+                    counts[(t1, t2)] += 1
+    rows = [{"type1": t1, "type2": t2, "correlation": n} for (t1, t2), n in counts.items()]
+    return _order(rows, [("correlation", True)], 10)
+
+
+def stats_labels(g, params):
+    return [{"label": label, "count": g.count(label)} for label in list(g.by_label) if g.count(label)]
+
+
+def stats_relationships(g, params):
+    return [{"type": t, "count": n} for t, n in g.rel_counts.items() if n]
+
+
+def stats_locations(g, params):
+    crimes = _crimes_per_location(g)
+    return [{"location": g.props[l].get("name"), "district": g.props[l].get("district"), "crimes": crimes[l]}
+            for l in g.nodes("Location")]
+
+
+def stats_crimes(g, params):
+    counts = Counter((g.props[c].get("type"), (g.props[c].get("time") or "")[:2] or None) for c in g.nodes("Crime"))
+    return [{"type": t, "hour": h, "count": n} for (t, h), n in counts.items()]
+
+
+def stats_offenses(g, params):
+    for p in g.nodes("Person"):
+        crimes = len(g.outgoing(p, "PARTY_TO"))
+        if crimes:
+            yield {"person": g.props[p].get("id"), "crimes": crimes}
+
+
+HANDLERS = {
+    "dashboard.recent": dashboard_recent,
+    "network.persons": network_persons,
+    "network.person_graph": network_person_graph,
+    "network.gang_graph": network_gang_graph,
+    "network.graph": network_graph,
+    "network.knows": network_knows,
+    "network3d.graph": network3d_graph,
+    "network3d.by_type": network3d_by_type,
+    "rag.entities.locations": rag_entities_locations,
+    "rag.entities.organizations": rag_entities_organizations,
+    "rag.entities.crime_types": rag_entities_crime_types,
+    "rag.entities.persons": rag_entities_persons,
+    "rag.entities.plates": rag_entities_plates,
+    "rag.entities.mo": rag_entities_mo,
+    "rag.all_organizations": rag_all_organizations,
+    "rag.organization_members": rag_organization_members,
+    "rag.org_members": rag_org_members,
+    "rag.org_crimes": rag_org_crimes,
+    "rag.all_evidence": rag_all_evidence,
+    "rag.evidence_person_links": rag_evidence_person_links,
+    "rag.all_investigators": rag_all_investigators,
+    "rag.all_mo_patterns": rag_all_mo_patterns,
+    "rag.crimes_by_mo": rag_crimes_by_mo,
+    "rag.all_vehicles": rag_all_vehicles,
+    "rag.all_weapons": rag_all_weapons,
+    "rag.vehicles_in_location": rag_vehicles_in_location,
+    "rag.weapons_in_location": rag_weapons_in_location,
+    "rag.crimes_in_location": rag_crimes_in_location,
+    "rag.suspects_in_location": rag_suspects_in_location,
+    "rag.person_connections": rag_person_connections,
+    "rag.repeat_offenders": rag_repeat_offenders,
+    "rag.criminal_networks": rag_criminal_networks,
+    "map.crimes": map_crimes,
+    "predictive.crime_points": predictive_crime_points,
+    "predictive.type_correlation": predictive_type_correlation,
+    "stats.labels": stats_labels,
+    "stats.relationships": stats_relationships,
+    "stats.locations": stats_locations,
+    "stats.crimes": stats_crimes,
+    "stats.offenses": stats_offenses,
+}
+
+
+class MemoryDatabase:
+    """
+    Drop-in for Database backed by a MemoryGraph, for tests, benchmarks and
+    offline profiling without a Neo4j server.
+
+    Reads evaluate the queries.py catalog (by name, or by its exact text)
+    with Python handlers. Writes are the load_data and incremental_load
+    UNWIND statements, so both loaders run unchanged, or go through
+    load()/graph. Any other Cypher raises UnsupportedCypher.
+    """
+
+    def __init__(self, dataset=None, cache=None, metrics=None, stats=None):
+        self.graph = MemoryGraph()
+        self.cache = cache
+        self.metrics = metrics
+        if stats is None:
+            from graph_stats import GraphStats
+            stats = GraphStats()
+        self.stats = stats
+        if stats.db is None:
+            stats.db = self
+        if dataset is not None:
+            self.load(dataset)
+
+    def load(self, dataset):
+        self.graph.load(dataset)
+        self.invalidate()
+
+    def close(self):
+        pass
+
+    def invalidate(self, stats_current=False):
+        if self.cache is not None:
+            self.cache.invalidate()
+        if not stats_current:
+            self.stats.invalidate()
+
+    def _run(self, cypher, params, label, name=None):
+        started = time.perf_counter()
+        if name is None:
+            text = _normalize(cypher)
+            if text.upper().startswith("EXPLAIN "):
+                return []
+            name = _CATALOG_NAMES.get(text)
+        if name not in HANDLERS:
+            raise UnsupportedCypher(f"MemoryDatabase only runs catalog queries: {_normalize(cypher)[:80]}")
+        rows = list(HANDLERS[name](self.graph, params or {}))
+        if self.metrics is not None:
+            wall = time.perf_counter() - started
+            self.metrics.record(label or name, cypher, wall, len(rows), wall)
+        return rows
+
+    def query(self, cypher, params=None, label=None):
+        if _normalize(cypher) in _LOAD_STATEMENTS:
+            self.write_batches(cypher, (params or {}).get("rows", []), label=label)
+            return []
+        return self._run(cypher, params, label)
+
+    def read(self, cypher, params=None, ttl=None, label=None):
+        return self.read_many([(cypher, params)], ttl, label)[0]
+
+    def read_named(self, name, params=None, ttl=None):
+        return self.read(QUERIES[name], params, ttl, label=name)
+
+    def read_many(self, statements, ttl=None, label=None):
+        if self.cache is None:
+            return [self._run(cypher, params, label) for cypher, params in statements]
+        results = []
+        for cypher, params in statements:
+            key = self.cache.key(cypher, params)
+            version = self.cache.version
+            rows = self.cache.get(key)
+            if rows is None:
+                rows = self._run(cypher, params, label)
+                self.cache.put(key, rows, ttl, version)
+            elif self.metrics is not None:
+                self.metrics.record(label, cypher, 0.0, len(rows), cached=True)
+            results.append(rows)
+        return results
+
+    def stream(self, cypher, params=None, fetch_size=None, label=None):
+        """Rows are produced lazily for handlers that generate them"""
+        name = _CATALOG_NAMES.get(_normalize(cypher))
+        if name not in HANDLERS:
+            raise UnsupportedCypher(f"MemoryDatabase only runs catalog queries: {_normalize(cypher)[:80]}")
+        for row in HANDLERS[name](self.graph, params or {}):
+            yield row
+
+    def stream_named(self, name, params=None, fetch_size=None):
+        return self.stream(QUERIES[name], params, fetch_size, label=name)
+
+    def columns(self, cypher, params=None, fetch_size=None, cached=True, label=None):
+        rows = self.read(cypher, params, label=label) if cached else self._run(cypher, params, label)
+        return columns_from_rows(rows)
+
+    def query_frame(self, cypher, params=None, dtypes=None, fetch_size=None, cached=True, label=None):
+        return to_frame(*self.columns(cypher, params, fetch_size, cached, label), dtypes)
+
+    def query_arrow(self, cypher, params=None, dtypes=None, fetch_size=None, cached=True, label=None):
+        return to_arrow(*self.columns(cypher, params, fetch_size, cached, label), dtypes)
+
+    def frame_named(self, name, params=None, fetch_size=None, cached=True):
+        return self.query_frame(QUERIES[name], params, COLUMN_TYPES.get(name), fetch_size, cached, label=name)
+
+    def arrow_named(self, name, params=None, fetch_size=None, cached=True):
+        return self.query_arrow(QUERIES[name], params, COLUMN_TYPES.get(name), fetch_size, cached, label=name)
+
+    def write(self, cypher, params=None, label=None):
+        return self.write_many([(cypher, params)], label)[0]
+
+    def write_many(self, statements, label=None):
+        """Load statements only, each with its `rows` parameter; not atomic across statements"""
+        for cypher, _ in statements:
+            if _normalize(cypher) not in _LOAD_STATEMENTS:
+                raise UnsupportedCypher(f"MemoryDatabase only writes load_data/incremental_load statements: "
+                                        f"{_normalize(cypher)[:80]}")
+        for cypher, params in statements:
+            rows = (params or {}).get("rows", [])
+            self.write_batches(cypher, rows, max(len(rows), 1), label=label)
+        return [[] for _ in statements]
+
+    def write_batches(self, cypher, rows, batch_size=1000, on_batch=None, label=None):
+        """
+        Apply load_data's and incremental_load's statements, so their
+        loaders run unchanged against memory. Relationship rows are MERGEd
+        within the call. `on_batch(row_count, counters)` is called per
+        chunk, with nodes_created, relationships_created and properties_set.
+        """
+        kind, target = _LOAD_STATEMENTS.get(_normalize(cypher), (None, None))
+        if kind is None:
+            raise UnsupportedCypher(f"MemoryDatabase only writes load_data/incremental_load statements: "
+                                    f"{_normalize(cypher)[:80]}")
+        if kind == "relationship":
+            rows = distinct_rows(target, rows)
+        rows = iter(rows)
+        written = 0
+        stats_current = True
+        try:
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
+                started = time.perf_counter()
+                properties_set = 0
+                if kind == "node":
+                    for props in chunk:
+                        self.graph.add_node(target, props)
+                    created = len(chunk)
+                elif kind == "relationship":
+                    created = self.graph.add_stage(target, chunk)
+                else:
+                    upsert = self.graph.upsert_node if kind == "upsert" else self.graph.upsert_relationship
+                    created = 0
+                    for row in chunk:
+                        added, written_props = upsert(target, row)
+                        created += added
+                        properties_set += written_props
+                if self.metrics is not None:
+                    self.metrics.record(label, cypher, time.perf_counter() - started, len(chunk))
+                written += len(chunk)
+                stats_current = self.stats.apply(cypher, chunk, created, properties_set) and stats_current
+                if on_batch:
+                    nodes = kind in ("node", "upsert")
+                    on_batch(len(chunk), _Counters(created if nodes else 0, 0 if nodes else created, properties_set))
+        finally:
+            self.invalidate(stats_current)
+        return written
+
+    def purge(self, label=None, where=None, params=None, batch_size=10000, round_size=None):
+        """By label only: a Cypher `where` predicate raises UnsupportedCypher"""
+        if where is not None:
+            raise UnsupportedCypher("MemoryDatabase.purge takes a label only, not a Cypher predicate")
+        nodes = list(self.graph.nodes(label)) if label else range(len(self.graph.props))
+        deleted = self.graph.delete(nodes)
+        self.invalidate()
+        if not label:
+            self.stats.clear()
+        return deleted
+
+    def purge_crimes_before(self, date, batch_size=10000):
+        deleted = self.graph.delete(c for c in self.graph.nodes("Crime")
+                                    if (self.graph.props[c].get("date") or date) < date)
+        self.invalidate()
+        return deleted
+
+    def clear_all(self, batch_size=10000):
+        self.graph.clear()
+        self.invalidate()
+        self.stats.clear()
+        print("🗑️  Database cleared")
+
+
+# ============================================================================
+# PARITY WITH NEO4J
+# ============================================================================
+def _canonical(value):
+    """Comparable form of a result value: numbers as rounded floats, lists as sorted tuples"""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), 6)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(sorted((_canonical(v) for v in value), key=repr))
+    return str(value)  # Temporal and spatial driver types
+
+
+def _canonical_rows(rows):
+    return sorted((tuple((k, _canonical(v)) for k, v in row.items()) for row in rows), key=repr)
+
+
+def parity_params(memory_db):
+    """
+    Catalog parameters for the parity check: PARAMETER_EXAMPLES with real
+    names from the graph, so person/org/location lookups return rows
+    """
+    from queries import PARAMETER_EXAMPLES
+    g = memory_db.graph
+    samples = {
+        "org": g.props[next(g.nodes("Organization"))]["name"],
+        "location": memory_db.stats.hotspots(1)[0]["location"],
+        "name": g.props[next(g.nodes("Person"))]["name"],
+        "crime_type": memory_db.stats.crime_types(1)[0]["type"],
+    }
+    samples["person"] = samples["name"]
+    return {name: {param: samples.get(param, value) for param, value in PARAMETER_EXAMPLES.get(name, {}).items()}
+            for name in QUERIES}
+
+
+def check_parity(memory_db, neo4j_db):
+    """
+    Run every catalog query on both backends (same graph loaded in each)
+    and compare the rows, ignoring row and list order.
+
+    Returns [(name, status, detail)]. Status is "ok", "DIFF", or "limit"
+    for a LIMIT query with the same columns and row count but other rows:
+    without a total ORDER BY, LIMIT may keep any of the matching rows.
+    """
+    params = parity_params(memory_db)
+    report = []
+    for name in QUERIES:
+        try:
+            expected = neo4j_db.query(QUERIES[name], params[name], label=f"parity.{name}")
+            actual = memory_db.read_named(name, params[name])
+        except Exception as e:
+            report.append((name, "DIFF", f"error: {e}"))
+            continue
+        columns = (list(expected[0]) if expected else None, list(actual[0]) if actual else None)
+        if _canonical_rows(expected) == _canonical_rows(actual):
+            report.append((name, "ok", f"{len(actual):,} rows"))
+        elif "LIMIT" in QUERIES[name] and len(expected) == len(actual) and columns[0] == columns[1]:
+            report.append((name, "limit", f"{len(actual):,} rows, other picks"))
+        else:
+            report.append((name, "DIFF", f"Neo4j {len(expected):,} rows {columns[0]}, "
+                                         f"memory {len(actual):,} rows {columns[1]}"))
+    return report
+
+
+def check_catalog(memory_db):
+    """
+    Offline check that every QUERIES entry has a handler and that the
+    handler returns the catalog's RETURN columns, in order. Returns
+    [(name, problem)], empty when the catalog is covered.
+    """
+    from retrieval_planner import return_columns
+    params = parity_params(memory_db)
+    problems = [(name, "handler without a catalog query") for name in HANDLERS if name not in QUERIES]
+    for name in QUERIES:
+        if name not in HANDLERS:
+            problems.append((name, "no handler"))
+            continue
+        try:
+            rows = memory_db.read_named(name, params[name])
+        except Exception as e:
+            problems.append((name, f"error: {e!r}"))
+            continue
+        expected = return_columns(QUERIES[name])
+        if not rows:
+            problems.append((name, "no rows to check columns against"))
+        elif any(list(row) != expected for row in rows):
+            problems.append((name, f"columns {list(rows[0])}, catalog returns {expected}"))
+    return problems
+
+
+def run_check(scale, seed):
+    """check_catalog() on a generated graph; no Neo4j needed"""
+    from scale_generator import generate_scaled_dataset
+    problems = check_catalog(MemoryDatabase(generate_scaled_dataset(scale, seed=seed)))
+    for name, problem in problems:
+        print(f"   ❌ {name:32} {problem}")
+    print(f"{'❌' if problems else '✅'} {len(QUERIES) - len({name for name, _ in problems if name in QUERIES})}"
+          f"/{len(QUERIES)} catalog queries have a handler returning their columns")
+    return len(problems)
+
+
+def run_parity(scale, seed):
+    """Load one generated graph into the configured Neo4j (cleared!) and memory, then compare"""
+    from database import Database
+    from load_data import load_dataset
+    from scale_generator import generate_scaled_dataset
+    from schema import ensure_schema
+    import config
+
+    neo4j_db = Database()
+    try:
+        neo4j_db.clear_all()
+        ensure_schema(neo4j_db)
+        load_dataset(neo4j_db, generate_scaled_dataset(scale, seed=seed), batch_size=config.LOAD_BATCH_SIZE)
+        memory_db = MemoryDatabase(generate_scaled_dataset(scale, seed=seed))
+        report = check_parity(memory_db, neo4j_db)
+    finally:
+        neo4j_db.close()
+
+    icons = {"ok": "✅", "limit": "➖", "DIFF": "❌"}
+    for name, status, detail in report:
+        print(f"   {icons[status]} {name:32} {detail}")
+    failed = sum(status == "DIFF" for _, status, _ in report)
+    print(f"{'❌' if failed else '✅'} {len(report) - failed}/{len(report)} catalog queries agree")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the synthetic graph in memory and time every catalog query")
+    parser.add_argument("--scale", type=float, default=1, help="multiple of the default graph size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--parity", action="store_true",
+                        help="compare every catalog query with the configured Neo4j (which is cleared!)")
+    parser.add_argument("--check", action="store_true",
+                        help="check offline that every catalog query has a handler returning its columns")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if run_check(args.scale, args.seed) else 0)
+    if args.parity:
+        sys.exit(1 if run_parity(args.scale, args.seed) else 0)
+
+    from scale_generator import generate_scaled_dataset
+    db = MemoryDatabase(generate_scaled_dataset(args.scale, seed=args.seed))
+    from queries import PARAMETER_EXAMPLES
+    for name in QUERIES:
+        started = time.perf_counter()
+        rows = db.read_named(name, PARAMETER_EXAMPLES.get(name))
+        print(f"   {name:32} {len(rows):>8,} rows {(time.perf_counter() - started) * 1000:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,122 @@
 from pyvis.network import Network
-import networkx as nx
-import streamlit.components.v1 as components
+
+# Neo4j Browser palette for the network explorer
+NETWORK_COLORS = {
+    'Person': '#FFA07A',
+    'Crime': '#9FC5E8',
+    'Location': '#B4D7A8',
+    'Organization': '#E69138'
+}
+
+
+def create_network(db, query_name, params):
+    """
+    Build the network explorer graph from a network.* catalog query plus
+    the KNOWS links between its people.
+    Returns (html, node_count), or (None, 0) when the query finds nothing.
+    """
+    data = db.read_named(query_name, params)
+    if not data:
+        return None, 0
+    
+    # Create network with Neo4j styling
+    net = Network(height='700px', width='100%', 
+                bgcolor='#ffffff', font_color='black')
+    
+    # Neo4j-style physics
+    net.set_options("""
+    {
+        "nodes": {
+            "borderWidth": 2,
+            "font": {"size": 14, "face": "Arial"},
+            "shadow": true
+        },
+        "edges": {
+            "smooth": {"type": "continuous"},
+            "arrows": {"to": {"enabled": true, "scaleFactor": 0.5}},
+            "color": {"inherit": false}
+        },
+        "physics": {
+            "barnesHut": {
+                "gravitationalConstant": -30000,
+                "centralGravity": 0.3,
+                "springLength": 150,
+                "damping": 0.09
+            },
+            "stabilization": {"iterations": 200}
+        },
+        "interaction": {
+            "hover": true,
+            "tooltipDelay": 100,
+            "navigationButtons": true
+        }
+    }
+    """)
+    
+    nodes_added = set()
+    
+    # Add nodes
+    for record in data:
+        person = record.get('person')
+        crime_id = record.get('crime_id')
+        crime_type = record.get('crime_type')
+        location = record.get('location')
+        org = record.get('organization')
+        
+        # Person
+        if person and person not in nodes_added:
+            net.add_node(person, label=person, 
+                       color=NETWORK_COLORS['Person'], size=30,
+                       title=f"Person: {person}")
+            nodes_added.add(person)
+        
+        # Crime
+        if crime_id and crime_id not in nodes_added:
+            net.add_node(crime_id, label=crime_type,
+                       color=NETWORK_COLORS['Crime'], size=25,
+                       title=f"Crime: {crime_type}")
+            nodes_added.add(crime_id)
+        
+        # Location
+        if location and location not in nodes_added:
+            net.add_node(location, label=location,
+                       color=NETWORK_COLORS['Location'], size=25,
+                       title=f"Location: {location}")
+            nodes_added.add(location)
+        
+        # Organization
+        if org and org not in nodes_added:
+            net.add_node(org, label=org,
+                       color=NETWORK_COLORS['Organization'], size=35,
+                       title=f"Organization: {org}")
+            nodes_added.add(org)
+        
+        # Edges
+        if person and crime_id:
+            net.add_edge(person, crime_id, color='#848484', width=2)
+        
+        if crime_id and location:
+            net.add_edge(crime_id, location, color='#848484', width=2)
+        
+        if person and org:
+            net.add_edge(person, org, color='#E69138', width=3)
+    
+    # Add social connections
+    knows = db.read_named("network.knows")
+    
+    for k in knows:
+        if k['p1'] in nodes_added and k['p2'] in nodes_added:
+            net.add_edge(k['p1'], k['p2'], 
+                       color='#D3D3D3', width=1.5, dashes=True)
+    
+    # Save
+    net.save_graph('network.html')
+    
+    with open('network.html', 'r') as f:
+        html_string = f.read()
+    
+    return html_string, len(nodes_added)
+
 
 def create_3d_network(db, crime_type=None, limit=50):
     """
@@ -9,27 +125,9 @@ def create_3d_network(db, crime_type=None, limit=50):
     
     # Query for network data
     if crime_type:
-        query = f"""
-        MATCH (p:Person)-[:PARTY_TO]->(c:Crime {{type: '{crime_type}'}})
-        WITH p, c
-        MATCH (p)-[r]-(connected)
-        RETURN p.name as person, c.id as crime, type(r) as relationship, 
-               labels(connected)[0] as connected_type, 
-               connected.name as connected_name
-        LIMIT {limit}
-        """
+        results = db.read_named("network3d.by_type", {"crime_type": crime_type, "limit": limit})
     else:
-        query = f"""
-        MATCH (p:Person)-[:PARTY_TO]->(c:Crime)
-        WITH p, c
-        MATCH (p)-[r]-(connected)
-        RETURN p.name as person, c.id as crime, type(r) as relationship,
-               labels(connected)[0] as connected_type,
-               connected.name as connected_name
-        LIMIT {limit}
-        """
-    
-    results = db.query(query)
+        results = db.read_named("network3d.graph", {"limit": limit})
     
     if not results:
         return None
@@ -1,47 +1,104 @@
 from sklearn.cluster import DBSCAN
-import pandas as pd
+from collections import Counter
 import numpy as np
+import pandas as pd
+
+# Coordinates are pooled on a ~10 m grid, far finer than the DBSCAN radius
+GRID_DECIMALS = 4
+
+
+def crime_points(db, fetch_size=None):
+    """Stream every crime's coordinates and type, for hotspots and maps"""
+    return db.stream_named("predictive.crime_points", fetch_size=fetch_size)
+
+
+def crime_frame(db, fetch_size=None):
+    """Every crime's coordinates and type as a typed, columnar DataFrame"""
+    return db.frame_named("predictive.crime_points", fetch_size=fetch_size, cached=False)
+
+
+def _pool_rows(crimes_data):
+    cells = {}
+    total = 0
+    for crime in crimes_data:
+        if crime['lat'] is None or crime['lon'] is None:
+            continue
+        key = (round(crime['lat'], GRID_DECIMALS), round(crime['lon'], GRID_DECIMALS))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = Counter()
+        cell[crime['crime_type']] += 1
+        total += 1
+    return cells, total
+
+
+def _pool_frame(df):
+    # Same cells, in the same first-seen order, without touching rows in Python
+    df = df.dropna(subset=['lat', 'lon'])
+    grid = pd.DataFrame({'lat': df['lat'].round(GRID_DECIMALS), 'lon': df['lon'].round(GRID_DECIMALS),
+                         'crime_type': df['crime_type']})
+    counts = grid.groupby(['lat', 'lon', 'crime_type'], sort=False, dropna=False).size()
+    cells = {}
+    for (lat, lon, crime_type), count in counts.items():
+        cell = cells.get((lat, lon))
+        if cell is None:
+            cell = cells[(lat, lon)] = Counter()
+        cell[crime_type] = int(count)
+    return cells, len(grid)
+
 
 def predict_crime_hotspots(crimes_data):
     """
     Use ML to predict future crime hotspots
+
+    `crimes_data` is a crime_frame(db) DataFrame, pooled into grid cells with
+    vectorized rounding and a groupby, or any iterable of {lat, lon,
+    crime_type} rows (e.g. crime_points(db)), read once. Either way memory
+    grows with the number of distinct places, not the number of crimes.
     """
-    
-    if len(crimes_data) < 10:
+    if isinstance(crimes_data, pd.DataFrame):
+        cells, total = _pool_frame(crimes_data)
+    else:
+        cells, total = _pool_rows(crimes_data)
+
+    if total < 10:
         return None
-    
-    # Prepare data
-    df = pd.DataFrame(crimes_data)
-    
-    # Extract coordinates
-    coords = df[['lat', 'lon']].values
-    
-    # DBSCAN clustering
+
+    # Prepare data: one weighted point per cell
+    keys = list(cells)
+    coords = np.array(keys, dtype=float)
+    weights = np.fromiter((sum(cells[k].values()) for k in keys), dtype=float, count=len(keys))
+
+    # DBSCAN clustering; weights count toward min_samples like repeated points
     db = DBSCAN(eps=0.01, min_samples=3)
-    df['cluster'] = db.fit_predict(coords)
-    
+    labels = db.fit_predict(coords, sample_weight=weights)
+
     # Find hotspot clusters
     hotspots = []
-    
-    for cluster_id in df['cluster'].unique():
+
+    for cluster_id in np.unique(labels):
         if cluster_id == -1:  # Skip noise
             continue
-        
-        cluster_data = df[df['cluster'] == cluster_id]
-        
+
+        members = labels == cluster_id
+        count = weights[members].sum()
+        crime_types = Counter()
+        for i in np.flatnonzero(members):
+            crime_types.update(cells[keys[i]])
+
         hotspot = {
-            'lat': cluster_data['lat'].mean(),
-            'lon': cluster_data['lon'].mean(),
-            'crime_count': len(cluster_data),
-            'crime_types': cluster_data['crime_type'].value_counts().to_dict(),
-            'risk_score': len(cluster_data) / len(df) * 100
+            'lat': float(np.average(coords[members, 0], weights=weights[members])),
+            'lon': float(np.average(coords[members, 1], weights=weights[members])),
+            'crime_count': int(count),
+            'crime_types': dict(crime_types.most_common()),
+            'risk_score': count / total * 100
         }
-        
+
         hotspots.append(hotspot)
-    
+
     # Sort by risk score
     hotspots = sorted(hotspots, key=lambda x: x['risk_score'], reverse=True)
-    
+
     return hotspots[:10]  # Top 10 hotspots
 
 def get_crime_statistics(db):
@@ -52,21 +109,9 @@ def get_crime_statistics(db):
     stats = {}
     
     # Time-based patterns
-    stats['hourly_pattern'] = db.query("""
-        MATCH (c:Crime)
-        WITH substring(c.time, 0, 2) as hour, count(*) as count
-        RETURN hour, count
-        ORDER BY hour
-    """)
+    stats['hourly_pattern'] = db.stats.hourly_pattern()
     
     # Day of week pattern (if we had that data)
-    stats['type_correlation'] = db.query("""
-        MATCH (p:Person)-[:PARTY_TO]->(c1:Crime)
-        MATCH (p)-[:PARTY_TO]->(c2:Crime)
-        WHERE c1 <> c2
-        RETURN c1.type as type1, c2.type as type2, count(*) as correlation
-        ORDER BY correlation DESC
-        LIMIT 10
-    """)
+    stats['type_correlation'] = db.read_named("predictive.type_correlation")
     
     return stats
@@ -0,0 +1,27 @@
+from database import Database
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete graph data in batches (retention jobs, resets)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--all", action="store_true", help="delete every node and relationship")
+    target.add_argument("--crimes-before", metavar="YYYY-MM-DD", help="delete crimes dated before this day")
+    target.add_argument("--label", help="delete every node with this label")
+    parser.add_argument("--batch-size", type=int, default=10000, help="nodes deleted per transaction")
+    args = parser.parse_args()
+
+    db = Database()
+    if args.all:
+        db.clear_all(batch_size=args.batch_size)
+    elif args.crimes_before:
+        deleted = db.purge_crimes_before(args.crimes_before, batch_size=args.batch_size)
+        print(f"✅ Deleted {deleted:,} crimes before {args.crimes_before}")
+    else:
+        deleted = db.purge(args.label, batch_size=args.batch_size)
+        print(f"✅ Deleted {deleted:,} {args.label} nodes")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# Named, fully parameterized Cypher used by the app, GraphRAG and the
+# visualizations. Values always travel as parameters, so each entry compiles
+# to one plan that Neo4j caches, whatever person, location or limit it serves.
+# The name doubles as the query's metrics label.
+
+QUERIES = {
+    # ---------------------------------------------------------------- app
+    "dashboard.recent": """
+        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
+        RETURN c.type as type, c.date as date, c.time as time, l.name as location
+        ORDER BY c.date DESC, c.time DESC
+        LIMIT 5
+    """,
+    "network.persons": """
+        MATCH (p:Person)
+        RETURN DISTINCT p.name as name
+        ORDER BY name
+    """,
+    "network.person_graph": """
+        MATCH (p:Person {name: $person})-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
+        OPTIONAL MATCH (p)-[:MEMBER_OF]->(o:Organization)
+        OPTIONAL MATCH (p)-[:KNOWS]-(p2:Person)
+        RETURN p.name as person, c.id as crime_id, c.type as crime_type,
+               l.name as location, o.name as organization,
+               collect(DISTINCT p2.name)[0..10] as connections
+        LIMIT $limit
+    """,
+    "network.gang_graph": """
+        MATCH (p:Person)-[:MEMBER_OF]->(o:Organization)
+        MATCH (p)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
+        RETURN p.name as person, o.name as organization,
+               c.id as crime_id, c.type as crime_type, l.name as location
+        LIMIT $limit
+    """,
+    "network.graph": """
+        MATCH (p:Person)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
+        OPTIONAL MATCH (p)-[:MEMBER_OF]->(o:Organization)
+        RETURN p.name as person, c.id as crime_id, c.type as crime_type,
+               l.name as location, o.name as organization
+        LIMIT $limit
+    """,
+    "network.knows": """
+        MATCH (p1:Person)-[:KNOWS]-(p2:Person)
+        WHERE EXISTS { (p1)-[:PARTY_TO]->(:Crime) }
+        RETURN p1.name as p1, p2.name as p2
+        LIMIT 30
+    """,
+
+    # -------------------------------------------------------- network_viz
+    "network3d.graph": """
+        MATCH (p:Person)-[:PARTY_TO]->(c:Crime)
+        WITH p, c
+        MATCH (p)-[r]-(connected)
+        RETURN p.name as person, c.id as crime, type(r) as relationship,
+               labels(connected)[0] as connected_type,
+               connected.name as connected_name
+        LIMIT $limit
+    """,
+    "network3d.by_type": """
+        MATCH (p:Person)-[:PARTY_TO]->(c:Crime {type: $crime_type})
+        WITH p, c
+        MATCH (p)-[r]-(connected)
+        RETURN p.name as person, c.id as crime, type(r) as relationship,
+               labels(connected)[0] as connected_type,
+               connected.name as connected_name
+        LIMIT $limit
+    """,
+
+    # ----------------------------------------------------------- GraphRAG
+    "rag.entities.locations": """
+        MATCH (l:Location) RETURN l.name as name
+    """,
+    "rag.entities.organizations": """
+        MATCH (o:Organization) RETURN o.name as name
+    """,
+    "rag.entities.crime_types": """
+        MATCH (c:Crime) RETURN DISTINCT c.type as name
+    """,
+    "rag.entities.persons": """
+        MATCH (p:Person) RETURN DISTINCT p.name as name
+    """,
+    "rag.entities.plates": """
+        MATCH (v:Vehicle) WHERE v.license_plate IS NOT NULL
+        RETURN v.license_plate as name
+    """,
+    "rag.entities.mo": """
+        MATCH (m:ModusOperandi) RETURN m.description as name
+    """,
+    "rag.all_organizations": """
+        MATCH (o:Organization)
+        RETURN o.name as name, o.type as type,
+               o.territory as territory, o.members_count as members,
+               o.activity_level as activity
+        ORDER BY o.members_count DESC
+    """,
+    "rag.organization_members": """
+        MATCH (p:Person)-[r:MEMBER_OF]->(o:Organization)
+        RETURN o.name as organization, p.name as member,
+               p.age as age, r.rank as rank
+        ORDER BY o.name, r.rank
+        LIMIT 50
+    """,
+    "rag.org_members": """
+        MATCH (p:Person)-[r:MEMBER_OF]->(o:Organization {name: $org})
+        RETURN o.name as organization, p.name as member,
+               p.age as age, r.rank as rank
+        ORDER BY r.rank
+        LIMIT 50
+    """,
+    "rag.org_crimes": """
+        MATCH (p:Person)-[:MEMBER_OF]->(o:Organization {name: $org})
+        MATCH (p)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
+        RETURN c.type as crime_type, c.date as date,
+               l.name as location, p.name as member
+        ORDER BY c.date DESC
+        LIMIT 30
+    """,
+    "rag.all_evidence": """
+        MATCH (e:Evidence)
+        RETURN e.id as id, e.type as type, e.description as description,
+               e.significance as significance, e.verified as verified
+        ORDER BY
+            CASE e.significance
+                WHEN 'critical' THEN 1
+                WHEN 'high' THEN 2
+                WHEN 'medium' THEN 3
+                ELSE 4
+            END
+        LIMIT 30
+    """,
+    "rag.evidence_person_links": """
+        MATCH (e:Evidence)-[r:LINKS_TO]->(p:Person)
+        RETURN e.id as evidence_id, e.description as evidence,
+               p.name as suspect, r.confidence as confidence
+        ORDER BY r.confidence DESC
+        LIMIT 30
+    """,
+    "rag.all_investigators": """
+        MATCH (i:Investigator)
+        RETURN i.name as name, i.badge_number as badge,
+               i.department as department, i.specialization as specialization,
+               i.cases_solved as solved, i.active_cases as active
+        ORDER BY i.cases_solved DESC
+    """,
+    "rag.all_mo_patterns": """
+        MATCH (m:ModusOperandi)
+        RETURN m.id as id, m.description as description,
+               m.signature_element as signature, m.frequency as frequency
+        ORDER BY m.frequency DESC
+    """,
+    "rag.crimes_by_mo": """
+        MATCH (c:Crime)-[r:MATCHES_MO]->(m:ModusOperandi)
+        RETURN m.description as mo, c.id as crime_id,
+               c.type as crime_type, r.similarity as similarity
+        ORDER BY r.similarity DESC
+        LIMIT 40
+    """,
+    "rag.all_vehicles": """
+        MATCH (v:Vehicle)
+        RETURN v.id as id, v.make as make, v.model as model,
+               v.year as year, v.color as color,
+               v.license_plate as plate, v.reported_stolen as stolen
+        ORDER BY v.reported_stolen DESC
+        LIMIT 30
+    """,
+    "rag.all_weapons": """
+        MATCH (w:Weapon)
+        RETURN w.id as id, w.type as type, w.make as make,
+               w.model as model, w.recovered as recovered
+        LIMIT 30
+    """,
+    "rag.vehicles_in_location": """
+        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
+        WHERE toLower(l.name) CONTAINS toLower($location)
+        MATCH (c)-[:INVOLVED_VEHICLE]->(v:Vehicle)
+        RETURN DISTINCT v.id as id, v.make as make, v.model as model,
+               v.year as year, v.color as color,
+               v.license_plate as plate, v.reported_stolen as stolen,
+               l.name as location
+        ORDER BY stolen DESC
+        LIMIT 30
+    """,
+    "rag.weapons_in_location": """
+        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
+        WHERE toLower(l.name) CONTAINS toLower($location)
+        MATCH (c)-[:USED_WEAPON]->(w:Weapon)
+        RETURN DISTINCT w.id as id, w.type as type, w.make as make,
+               w.model as model, w.recovered as recovered,
+               l.name as location
+        LIMIT 30
+    """,
+    "rag.crimes_in_location": """
+        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
+        WHERE toLower(l.name) CONTAINS toLower($location)
+        RETURN c.id as crime_id, c.type as crime_type,
+               c.date as date, c.severity as severity
+        ORDER BY c.date DESC
+        LIMIT 30
+    """,
+    "rag.suspects_in_location": """
+        MATCH (p:Person)-[:PARTY_TO]->(c:Crime)-[:OCCURRED_AT]->(l:Location)
+        WHERE toLower(l.name) CONTAINS toLower($location)
+        WITH p, count(DISTINCT c) as crime_count
+        RETURN p.name as name, p.age as age, p.risk_score as risk_score,
+               crime_count
+        ORDER BY crime_count DESC
+        LIMIT 20
+    """,
+    "rag.person_connections": """
+        MATCH (p:Person)-[:KNOWS*1..2]-(connected:Person)
+        WHERE toLower(p.name) CONTAINS toLower($name)
+        RETURN DISTINCT connected.name as name,
+               connected.age as age,
+               connected.criminal_record as has_record
+        LIMIT 30
+    """,
+    "rag.repeat_offenders": """
+        MATCH (p:Person)-[:PARTY_TO]->(c:Crime)
+        WITH p, count(c) as crimes
+        WHERE crimes >= 2
+        OPTIONAL MATCH (p)-[:MEMBER_OF]->(o:Organization)
+        RETURN p.name as name, p.age as age, crimes,
+               o.name as organization
+        ORDER BY crimes DESC
+        LIMIT 20
+    """,
+    "rag.criminal_networks": """
+        MATCH (p1:Person)-[:KNOWS]-(p2:Person)
+        WHERE EXISTS { (p1)-[:PARTY_TO]->(:Crime) }
+          AND EXISTS { (p2)-[:PARTY_TO]->(:Crime) }
+        RETURN p1.name as person1, p2.name as person2
+        LIMIT 30
+    """,
+
+    # ------------------------------------------------------- enhanced_map
+    "map.crimes": """
+        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
+        RETURN c.id as crime_id, c.type as crime_type, c.date as date,
+               c.time as time, c.case_number as case_number,
+               l.name as location,
+               coalesce(c.latitude, l.latitude) as lat,
+               coalesce(c.longitude, l.longitude) as lon
+    """,
+
+    # --------------------------------------------------------- predictive
+    "predictive.crime_points": """
+        MATCH (c:Crime)-[:OCCURRED_AT]->(l:Location)
+        RETURN c.id as crime_id, c.type as crime_type,
+               coalesce(c.latitude, l.latitude) as lat,
+               coalesce(c.longitude, l.longitude) as lon
+    """,
+    "predictive.type_correlation": """
+        MATCH (p:Person)-[:PARTY_TO]->(c1:Crime)
+        MATCH (p)-[:PARTY_TO]->(c2:Crime)
+        WHERE c1 <> c2
+        RETURN c1.type as type1, c2.type as type2, count(*) as correlation
+        ORDER BY correlation DESC
+        LIMIT 10
+    """,
+
+    # -------------------------------------------------------- graph_stats
+    # Full aggregation passes, run only to (re)build graph_stats.GraphStats
+    "stats.labels": """
+        MATCH (n)
+        UNWIND labels(n) as label
+        RETURN label, count(*) as count
+    """,
+    "stats.relationships": """
+        MATCH ()-[r]->()
+        RETURN type(r) as type, count(*) as count
+    """,
+    "stats.locations": """
+        MATCH (l:Location)
+        OPTIONAL MATCH (c:Crime)-[:OCCURRED_AT]->(l)
+        RETURN l.name as location, l.district as district, count(c) as crimes
+    """,
+    "stats.crimes": """
+        MATCH (c:Crime)
+        RETURN c.type as type, substring(c.time, 0, 2) as hour, count(*) as count
+    """,
+    "stats.offenses": """
+        MATCH (p:Person)-[r:PARTY_TO]->(:Crime)
+        RETURN p.id as person, count(r) as crimes
+    """,
+}
+
+# Numeric column dtypes for frame_named()/arrow_named() results
+COLUMN_TYPES = {
+    "map.crimes": {"lat": "float64", "lon": "float64"},
+    "predictive.crime_points": {"lat": "float64", "lon": "float64"},
+    "predictive.type_correlation": {"correlation": "int64"},
+}
+
+# Parameter values with the right types, for planning entries that take any
+PARAMETER_EXAMPLES = {
+    "network.person_graph": {"person": "", "limit": 50},
+    "network.gang_graph": {"limit": 50},
+    "network.graph": {"limit": 50},
+    "network3d.graph": {"limit": 50},
+    "network3d.by_type": {"crime_type": "", "limit": 50},
+    "rag.org_members": {"org": ""},
+    "rag.org_crimes": {"org": ""},
+    "rag.vehicles_in_location": {"location": ""},
+    "rag.weapons_in_location": {"location": ""},
+    "rag.crimes_in_location": {"location": ""},
+    "rag.suspects_in_location": {"location": ""},
+    "rag.person_connections": {"name": ""},
+}
+
+
+def cypher(name):
+    """Catalog text for a query name; KeyError for unknown names"""
+    return QUERIES[name]
+
+
+def prewarm(db):
+    """
+    EXPLAIN every catalog entry so Neo4j plans and caches them before the
+    first user request. Nothing is executed. Returns the names that failed.
+    """
+    failed = []
+    for name, text in QUERIES.items():
+        try:
+            db.query("EXPLAIN " + text, PARAMETER_EXAMPLES.get(name), label="prewarm")
+        except Exception as e:
+            print(f"⚠️ Could not plan {name}: {e}")
+            failed.append(name)
+    print(f"🔥 Pre-planned {len(QUERIES) - len(failed)}/{len(QUERIES)} catalog queries")
+    return failed
+
+
+if __name__ == "__main__":
+    from database import Database
+
+    db = Database()
+    prewarm(db)
+    db.close()
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+import config
+import json
+import sys
+import threading
+import time
+
+
+def _sizeof(obj):
+    """Rough deep size of a query result in bytes"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_sizeof(item) for item in obj)
+    return size
+
+
+class QueryCache:
+    """
+    LRU cache of read results keyed by Cypher text plus parameters, bounded
+    by the estimated size of the cached rows. Entries expire after a TTL, and
+    invalidate() drops everything and bumps `version` after a write.
+    """
+
+    def __init__(self, max_bytes=None, default_ttl=None):
+        self.max_bytes = max_bytes or config.QUERY_CACHE_MB * 1024 * 1024
+        self.default_ttl = default_ttl if default_ttl is not None else config.QUERY_CACHE_TTL
+        self.entries = OrderedDict()  # key -> (expires_at, size, rows)
+        self.bytes = 0
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(cypher, params=None):
+        # Whitespace-insensitive, so reindented query strings share an entry
+        return " ".join(cypher.split()), json.dumps(params or {}, sort_keys=True, default=str)
+
+    def get(self, key):
+        """Cached rows for a key, or None on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, rows = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        # Copies, so callers can't mutate the cached rows
+        return [dict(row) for row in rows]
+
+    def put(self, key, rows, ttl=None, version=None):
+        """
+        Cache rows for `ttl` seconds (None: the default, 0: no expiry).
+        Rows read before a write that has since invalidated the cache
+        (`version` is stale) are discarded.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        size = _sizeof(rows)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if version is not None and version != self.version:
+                return
+            if key in self.entries:
+                self._drop(key)
+            expires_at = time.monotonic() + ttl if ttl else None
+            self.entries[key] = (expires_at, size, [dict(row) for row in rows])
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self):
+        """Forget every entry; called after any write"""
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+            self.version += 1
+
+    def _drop(self, key):
+        self.bytes -= self.entries.pop(key)[1]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "version": self.version
+        }
@@ -0,0 +1,115 @@
+from collections import deque
+import csv
+import io
+import json
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+FIELDS = ["timestamp", "label", "wall_ms", "rows", "consume_ms",
+          "available_after_ms", "consumed_after_ms", "cached", "error", "cypher"]
+
+
+def default_label(cypher):
+    """Label for untagged calls: the start of the statement"""
+    return " ".join(cypher.split())[:60]
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class QueryMetrics:
+    """
+    Per-call query timings tagged with a caller label (e.g. "rag.org_crimes").
+    Keeps a latency histogram per label plus the last `max_samples` calls
+    for percentiles and JSON/CSV export.
+    """
+
+    def __init__(self, max_samples=10000):
+        self.samples = deque(maxlen=max_samples)
+        self.histograms = {}  # label -> count per bucket
+        self.lock = threading.Lock()
+
+    def record(self, label, cypher, wall, rows, consume=None, available_after=None,
+               consumed_after=None, cached=False, error=None):
+        """Record one call; `wall`/`consume` in seconds, server timings in ms"""
+        sample = {
+            "timestamp": time.time(),
+            "label": label or default_label(cypher),
+            "wall_ms": wall * 1000,
+            "rows": rows,
+            "consume_ms": consume * 1000 if consume is not None else None,
+            "available_after_ms": available_after,
+            "consumed_after_ms": consumed_after,
+            "cached": cached,
+            "error": repr(error) if error is not None else None,
+            "cypher": " ".join(cypher.split())
+        }
+        bucket = next((i for i, bound in enumerate(BUCKETS_MS) if sample["wall_ms"] <= bound), len(BUCKETS_MS))
+        with self.lock:
+            self.samples.append(sample)
+            counts = self.histograms.setdefault(sample["label"], [0] * (len(BUCKETS_MS) + 1))
+            counts[bucket] += 1
+
+    def histogram(self, label):
+        """[(bucket name, count)] for one label"""
+        counts = self.histograms.get(label, [0] * (len(BUCKETS_MS) + 1))
+        names = [f"≤{bound} ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]} ms"]
+        return list(zip(names, counts))
+
+    def summary(self):
+        """One row per label over the retained samples, slowest total first"""
+        with self.lock:
+            samples = list(self.samples)
+        by_label = {}
+        for sample in samples:
+            by_label.setdefault(sample["label"], []).append(sample)
+
+        rows = []
+        for label, calls in by_label.items():
+            wall = [c["wall_ms"] for c in calls]
+            server = [c["available_after_ms"] + c["consumed_after_ms"] for c in calls
+                      if c["available_after_ms"] is not None]
+            rows.append({
+                "label": label,
+                "calls": len(calls),
+                "cached": sum(c["cached"] for c in calls),
+                "errors": sum(c["error"] is not None for c in calls),
+                "rows": sum(c["rows"] for c in calls),
+                "total_ms": sum(wall),
+                "mean_ms": sum(wall) / len(wall),
+                "p50_ms": _percentile(wall, 0.50),
+                "p95_ms": _percentile(wall, 0.95),
+                "max_ms": max(wall),
+                "server_mean_ms": sum(server) / len(server) if server else None
+            })
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def to_json(self):
+        with self.lock:
+            samples = list(self.samples)
+        return json.dumps({"summary": self.summary(), "samples": samples}, indent=2)
+
+    def to_csv(self):
+        with self.lock:
+            samples = list(self.samples)
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(samples)
+        return out.getvalue()
+
+    def export(self, path):
+        """Write the retained samples to a .json or .csv file"""
+        data = self.to_csv() if path.endswith(".csv") else self.to_json()
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(data)
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.histograms.clear()
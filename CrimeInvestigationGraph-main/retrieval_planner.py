@@ -0,0 +1,180 @@
+from batch_writer import replace_parameters
+import queries
+import re
+
+# Retrieval entries answered by the Database's materialized GraphStats
+# instead of a Cypher read
+STATS_READS = {
+    'graph_stats.summary': lambda stats, params: [stats.summary()],
+    'graph_stats.hotspots': lambda stats, params: stats.hotspots(params['limit']),
+}
+
+# What a question can ask about: the words that signal it and the rows its
+# retrievals may return in total, split evenly between them
+INTENTS = {
+    'organizations': {'keywords': ['organization', 'gang', 'crew', 'syndicate', 'cartel', 'ring'], 'rows': 60},
+    'evidence': {'keywords': ['evidence', 'proof', 'forensic', 'dna', 'fingerprint'], 'rows': 40},
+    'investigators': {'keywords': ['investigator', 'detective', 'officer', 'assigned'], 'rows': 20},
+    'modus_operandi': {'keywords': ['modus operandi', 'mo', 'pattern', 'method', 'signature', 'similar'], 'rows': 40},
+    'vehicles': {'keywords': ['vehicle', 'car', 'truck', 'getaway', 'stolen'], 'rows': 30},
+    'weapons': {'keywords': ['weapon', 'gun', 'firearm', 'knife', 'armed'], 'rows': 30},
+    'locations': {'keywords': [], 'rows': 60},
+    'persons': {'keywords': [], 'rows': 45},
+    'hotspots': {'keywords': ['hotspot', 'dangerous', 'where', 'most crime'], 'rows': 15},
+    'repeat_offenders': {'keywords': ['repeat', 'offender', 'criminal', 'suspect'], 'rows': 20},
+    'networks': {'keywords': ['network', 'connected', 'know', 'known', 'associate', 'associated'], 'rows': 30},
+}
+
+# Fewest rows a retrieval is cut to, however many share its intent's budget
+MIN_ROWS = 5
+
+# Whole words, plurals included: "car" matches "cars" but not "scar"
+_INTENT_PATTERNS = {
+    intent: re.compile(r"\b(?:" + "|".join(re.escape(w) for w in spec['keywords']) + r")(?:s|es)?\b")
+    for intent, spec in INTENTS.items() if spec['keywords']
+}
+
+
+def detect_intents(question):
+    """Intents whose keywords appear in the question, in INTENTS order"""
+    q = question.lower()
+    return [intent for intent, pattern in _INTENT_PATTERNS.items() if pattern.search(q)]
+
+
+def plan_retrieval(question, entities, max_entities=3):
+    """
+    Turn a question and its entities ({kind: [names]}, as EntityDictionary
+    finds them) into (context_key, query_name, params, row_limit) entries
+    over the queries.py catalog and STATS_READS. None depends on another.
+
+    Redundant reads are left out:
+    - a retrieval planned twice (same query and parameters) runs once
+    - named organizations get their own members instead of every gang's
+    - with named locations, vehicles and weapons are those involved in
+      crimes there instead of the whole table
+    Each intent's row budget is split between its retrievals.
+    """
+    intents = set(detect_intents(question))
+    organizations = entities.get('organizations', [])[:max_entities]
+    locations = entities.get('locations', [])[:max_entities]
+    persons = entities.get('persons', [])[:max_entities]
+    if organizations:
+        intents.add('organizations')
+    if entities.get('mo'):
+        intents.add('modus_operandi')
+    if entities.get('plates'):
+        intents.add('vehicles')
+    if locations:
+        intents.add('locations')
+    if persons:
+        intents.add('persons')
+
+    # intent -> [(context_key, query_name, params)]
+    wanted = {}
+    if 'organizations' in intents:
+        wanted['organizations'] = [('all_organizations', 'rag.all_organizations', None)]
+        if organizations:
+            for org in organizations:
+                wanted['organizations'].append((f'org_{org}_members', 'rag.org_members', {'org': org}))
+                wanted['organizations'].append((f'org_{org}_crimes', 'rag.org_crimes', {'org': org}))
+        else:
+            wanted['organizations'].append(('organization_members', 'rag.organization_members', None))
+    if 'evidence' in intents:
+        wanted['evidence'] = [('all_evidence', 'rag.all_evidence', None),
+                              ('evidence_person_links', 'rag.evidence_person_links', None)]
+    if 'investigators' in intents:
+        wanted['investigators'] = [('all_investigators', 'rag.all_investigators', None)]
+    if 'modus_operandi' in intents:
+        wanted['modus_operandi'] = [('all_mo_patterns', 'rag.all_mo_patterns', None),
+                                    ('crimes_by_mo', 'rag.crimes_by_mo', None)]
+    for intent, everything, in_location in [('vehicles', 'rag.all_vehicles', 'rag.vehicles_in_location'),
+                                            ('weapons', 'rag.all_weapons', 'rag.weapons_in_location')]:
+        if intent not in intents:
+            continue
+        if locations:
+            wanted[intent] = [(f'{intent}_in_{location}', in_location, {'location': location})
+                              for location in locations]
+        else:
+            wanted[intent] = [(f'all_{intent}', everything, None)]
+    if 'locations' in intents:
+        wanted['locations'] = []
+        for location in locations:
+            wanted['locations'].append((f'crimes_in_{location}', 'rag.crimes_in_location', {'location': location}))
+            wanted['locations'].append((f'suspects_in_{location}', 'rag.suspects_in_location', {'location': location}))
+    if 'persons' in intents:
+        wanted['persons'] = [(f'{name}_connections', 'rag.person_connections', {'name': name}) for name in persons]
+    if 'hotspots' in intents:
+        wanted['hotspots'] = [('hotspots', 'graph_stats.hotspots', {'limit': INTENTS['hotspots']['rows']})]
+    if 'repeat_offenders' in intents:
+        wanted['repeat_offenders'] = [('repeat_offenders', 'rag.repeat_offenders', None)]
+    if 'networks' in intents:
+        wanted['networks'] = [('criminal_networks', 'rag.criminal_networks', None)]
+
+    # ALWAYS get basic stats
+    plan = [('database_stats', 'graph_stats.summary', None, None)]
+    seen = set()
+    for intent, retrievals in wanted.items():
+        limit = max(MIN_ROWS, INTENTS[intent]['rows'] // max(len(retrievals), 1))
+        for key, name, params in retrievals:
+            signature = (name, tuple(sorted((params or {}).items())))
+            if signature in seen:
+                continue
+            seen.add(signature)
+            plan.append((key, name, params, limit))
+    return plan
+
+
+def return_columns(cypher):
+    """Column names of a catalog query's final RETURN clause"""
+    clause = cypher[cypher.rindex("RETURN") + len("RETURN"):]
+    clause = re.split(r"\b(?:ORDER\s+BY|SKIP|LIMIT)\b", clause)[0]
+    clause = re.sub(r"^\s*DISTINCT\b", "", clause)
+    items, depth, current = [], 0, ""
+    for char in clause:
+        depth += char in "([{"
+        depth -= char in ")]}"
+        if char == "," and depth == 0:
+            items.append(current)
+            current = ""
+        else:
+            current += char
+    items.append(current)
+    columns = []
+    for item in items:
+        alias = re.search(r"\bas\s+(\w+)\s*$", item.strip(), re.IGNORECASE)
+        columns.append(alias.group(1) if alias else item.strip())
+    return columns
+
+
+def compile_plan(plan):
+    """
+    One read statement for every Cypher entry of a plan. Each retrieval
+    becomes a CALL subquery that collects at most its row limit into a
+    list, so the statement returns a single row:
+
+        CALL { CALL { <catalog query> } WITH ... LIMIT $limit_0
+               RETURN collect({...}) AS part_0 }
+        CALL { ... } ...
+        RETURN part_0, part_1, ...
+
+    Parameters are renamed per part ($p0_location, ...). Returns
+    (cypher, params, {part alias: context_key}).
+    """
+    parts, params, aliases = [], {}, {}
+    for i, (key, name, part_params, limit) in enumerate(plan):
+        text = queries.cypher(name)
+        columns = return_columns(text)
+        alias = f"part_{i}"
+        body = replace_parameters(text.strip(), lambda param, i=i: f"$p{i}_{param}")
+        for param, value in (part_params or {}).items():
+            params[f"p{i}_{param}"] = value
+        params[f"limit_{i}"] = limit
+        parts.append(
+            f"CALL {{\n"
+            f"    CALL {{\n        {body}\n    }}\n"
+            f"    WITH {', '.join(columns)} LIMIT $limit_{i}\n"
+            f"    RETURN collect({{{', '.join(f'{c}: {c}' for c in columns)}}}) AS {alias}\n"
+            f"}}"
+        )
+        aliases[alias] = key
+    return "\n".join(parts) + f"\nRETURN {', '.join(aliases)}", params, aliases
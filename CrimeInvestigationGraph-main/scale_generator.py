@@ -0,0 +1,424 @@
+from graph_model import NODE_KEYS, RELATIONSHIP_STAGES
+from load_data import (
+    locations, organizations, investigators, mo_patterns,
+    first_names, last_names, occupations, vehicle_makes, vehicle_models, colors,
+    weapon_types, crime_types, severities, statuses, evidence_types,
+    evidence_descriptions, start_date
+)
+from datetime import timedelta
+import numpy as np
+import zlib
+
+# Rows generated per vectorized chunk; part of the seed, so changing it changes the data
+CHUNK_SIZE = 100_000
+
+# Entity and relationship counts at scale 1 (the default load_data.py graph)
+BASE_COUNTS = {
+    "persons": 120,
+    "vehicles": 50,
+    "weapons": 30,
+    "crimes": 350,
+    "evidence": 100,
+    "memberships": 80,
+    "vehicle_incidents": 80,
+    "weapon_incidents": 50,
+    "knows": 250,
+    "family": 90,
+    "similar_pairs": 60,
+}
+
+# Fractions of an entity set that take part in a relationship at scale 1
+MO_LINKED_CRIMES = 200 / 350
+LINKED_EVIDENCE = 60 / 100
+OWNED_WEAPONS = 20 / 30
+FREQUENTING_PERSONS = 60 / 120
+
+SEVERE_TYPES = ["Assault", "Robbery", "Weapons Violation"]
+MINOR_TYPES = ["Theft", "Criminal Trespass"]
+LETTERS = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+
+class ScaleGenerator:
+    """
+    Reproducible synthetic graph of any size with the same distributions as
+    load_data.generate_dataset.
+
+    Columns are drawn with NumPy, one chunk at a time, from an RNG seeded by
+    (seed, stage, chunk). Rows are never held: only one byte per crime (type
+    and location) is kept for the whole run. Stages of random endpoint pairs
+    never repeat a pair (see _random_pairs), so MERGE loads and neo4j-admin
+    imports build the same graph.
+    """
+
+    def __init__(self, scale=1, seed=0, chunk_size=CHUNK_SIZE):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.counts = {name: max(1, int(round(n * scale))) for name, n in BASE_COUNTS.items()}
+
+        rng = self._rng("crime_columns")
+        n_crimes = self.counts["crimes"]
+        self.crime_type = rng.integers(0, len(crime_types), n_crimes).astype(np.int8)
+        self.crime_location = rng.integers(0, len(locations), n_crimes).astype(np.int8)
+
+        # Dates are drawn as day offsets; format each possible offset once
+        self.days = {offset: (start_date + timedelta(days=offset)).strftime("%Y-%m-%d")
+                     for offset in range(-730, 301)}
+
+    def _rng(self, stage, chunk=0):
+        return np.random.default_rng([self.seed, zlib.crc32(stage.encode()), chunk])
+
+    def _chunks(self, stage, total):
+        """Yield (rng, first_index, size) for each chunk of a stage"""
+        for chunk, start in enumerate(range(0, total, self.chunk_size)):
+            yield self._rng(stage, chunk), start, min(self.chunk_size, total - start)
+
+    def dataset(self):
+        """Same shape as generate_dataset, but every value is a one-pass row generator"""
+        nodes = {
+            "Location": self.location_rows(),
+            "Organization": iter([dict(org) for org in organizations]),
+            "Investigator": self.investigator_rows(),
+            "ModusOperandi": self.mo_rows(),
+            "Person": self.person_rows(),
+            "Vehicle": self.vehicle_rows(),
+            "Weapon": self.weapon_rows(),
+            "Crime": self.crime_rows(),
+            "Evidence": self.evidence_rows(),
+        }
+        rels = {stage["name"]: getattr(self, f"{stage['name']}_rows")() for stage in RELATIONSHIP_STAGES}
+        assert set(nodes) == set(NODE_KEYS)
+        return {"nodes": nodes, "relationships": rels}
+
+    # ------------------------------------------------------------------ nodes
+    def location_rows(self):
+        rates = np.round(self._rng("Location").uniform(0.2, 0.9, len(locations)), 2).tolist()
+        for loc, rate in zip(locations, rates):
+            yield {"name": loc["name"], "latitude": loc["lat"], "longitude": loc["lon"],
+                   "type": loc["type"], "district": loc["district"], "crime_rate": rate}
+
+    def investigator_rows(self):
+        active = self._rng("Investigator").integers(5, 16, len(investigators)).tolist()
+        for inv, cases in zip(investigators, active):
+            yield {"id": inv["id"], "name": inv["name"], "badge_number": inv["badge"],
+                   "department": inv["dept"], "cases_solved": inv["cases_solved"],
+                   "specialization": inv["specialization"], "active_cases": cases}
+
+    def mo_rows(self):
+        confidence = np.round(self._rng("ModusOperandi").uniform(0.7, 0.95, len(mo_patterns)), 2).tolist()
+        for mo, conf in zip(mo_patterns, confidence):
+            yield {"id": mo["id"], "description": mo["description"], "signature_element": mo["signature"],
+                   "frequency": mo["frequency"], "confidence_score": conf}
+
+    def person_rows(self):
+        for rng, start, n in self._chunks("Person", self.counts["persons"]):
+            first = rng.integers(0, len(first_names), n).tolist()
+            last = rng.integers(0, len(last_names), n).tolist()
+            age = rng.integers(18, 66, n).tolist()
+            gender = rng.integers(0, 2, n).tolist()
+            occupation = rng.integers(0, len(occupations), n).tolist()
+            record = (rng.random(n) < 2 / 3).tolist()  # 66% have records
+            risk = np.round(rng.uniform(0.1, 0.9, n), 2).tolist()
+            number = rng.integers(100, 10000, n).tolist()
+            street = rng.integers(0, 4, n).tolist()
+            for k in range(n):
+                yield {
+                    "id": f"P{start + k:03d}",
+                    "name": f"{first_names[first[k]]} {last_names[last[k]]}",
+                    "age": age[k],
+                    "gender": ("Male", "Female")[gender[k]],
+                    "occupation": occupations[occupation[k]],
+                    "criminal_record": record[k],
+                    "risk_score": risk[k],
+                    "address": f"{number[k]} {('Oak', 'Main', 'Park', 'Lake')[street[k]]} St"
+                }
+
+    def vehicle_rows(self):
+        for rng, start, n in self._chunks("Vehicle", self.counts["vehicles"]):
+            make = rng.integers(0, len(vehicle_makes), n).tolist()
+            model = rng.integers(0, len(vehicle_models), n).tolist()
+            year = rng.integers(2010, 2025, n).tolist()
+            color = rng.integers(0, len(colors), n).tolist()
+            letters = ["".join(row) for row in LETTERS[rng.integers(0, 26, (n, 3))]]
+            digits = rng.integers(1000, 10000, n).tolist()
+            stolen = (rng.random(n) < 0.25).tolist()  # 25% stolen
+            for k in range(n):
+                yield {
+                    "id": f"V{start + k:03d}",
+                    "make": vehicle_makes[make[k]],
+                    "model": vehicle_models[model[k]],
+                    "year": year[k],
+                    "color": colors[color[k]],
+                    "license_plate": f"{letters[k]}-{digits[k]}",
+                    "reported_stolen": stolen[k]
+                }
+
+    def weapon_rows(self):
+        for rng, start, n in self._chunks("Weapon", self.counts["weapons"]):
+            kind = rng.integers(0, len(weapon_types), n).tolist()
+            serial = rng.integers(100000, 1000000, n).tolist()
+            recovered = (rng.random(n) < 2 / 3).tolist()  # 66% recovered
+            for k in range(n):
+                wtype, make, model = weapon_types[kind[k]]
+                yield {
+                    "id": f"W{start + k:03d}",
+                    "type": wtype,
+                    "make": make,
+                    "model": model,
+                    "serial_number": f"{make[:3].upper()}{serial[k]}",
+                    "recovered": recovered[k]
+                }
+
+    def crime_rows(self):
+        severe = np.isin(crime_types, SEVERE_TYPES)
+        minor = np.isin(crime_types, MINOR_TYPES)
+        for rng, start, n in self._chunks("Crime", self.counts["crimes"]):
+            types = self.crime_type[start:start + n]
+            # Severity depends on crime type, indices into `severities`
+            pair = rng.integers(0, 2, n)
+            severity = np.where(severe[types], 2 + pair,
+                                np.where(minor[types], pair, rng.integers(0, 4, n))).tolist()
+            day = rng.integers(0, 301, n).tolist()
+            hour = rng.integers(0, 24, n).tolist()
+            minute = rng.integers(0, 60, n).tolist()
+            case = rng.integers(100000, 1000000, n).tolist()
+            status = rng.integers(0, len(statuses), n).tolist()
+            types = types.tolist()
+            where = self.crime_location[start:start + n].tolist()
+            for k in range(n):
+                crime_type = crime_types[types[k]]
+                yield {
+                    "id": f"C{start + k:04d}",
+                    "type": crime_type,
+                    "date": self.days[day[k]],
+                    "time": f"{hour[k]:02d}:{minute[k]:02d}",
+                    "case_number": f"CHI{case[k]}",
+                    "severity": severities[severity[k]],
+                    "status": statuses[status[k]],
+                    "description": f"{crime_type} incident at {locations[where[k]]['name']}"
+                }
+
+    def evidence_rows(self):
+        for rng, start, n in self._chunks("Evidence", self.counts["evidence"]):
+            kind = rng.integers(0, len(evidence_types), n).tolist()
+            description = rng.integers(0, len(evidence_descriptions), n).tolist()
+            day = rng.integers(0, 301, n).tolist()
+            verified = (rng.random(n) < 0.75).tolist()  # 75% verified
+            significance = rng.integers(0, 4, n).tolist()
+            for k in range(n):
+                yield {
+                    "id": f"E{start + k:03d}",
+                    "type": evidence_types[kind[k]],
+                    "description": evidence_descriptions[description[k]],
+                    "collection_date": self.days[day[k]],
+                    "verified": verified[k],
+                    "significance": ("low", "medium", "high", "critical")[significance[k]]
+                }
+
+    # ---------------------------------------------------------- relationships
+    def occurred_at_rows(self):
+        for start in range(0, self.counts["crimes"], self.chunk_size):
+            where = self.crime_location[start:start + self.chunk_size].tolist()
+            for k, loc in enumerate(where):
+                yield {"start": f"C{start + k:04d}", "end": locations[loc]["name"]}
+
+    def _distinct_picks(self, stage, owners, targets, max_picks, prefix, target_prefix, width, target_width, props):
+        """1..max_picks distinct targets per owner; `props(rng, shape)` returns extra columns"""
+        for rng, start, n in self._chunks(stage, owners):
+            picks = rng.integers(1, max_picks + 1, n).tolist()
+            chosen = rng.integers(0, targets, (n, max_picks)).tolist()
+            extra = props(rng, (n, max_picks))
+            for k in range(n):
+                seen = set()
+                for j in range(picks[k]):
+                    target = chosen[k][j]
+                    if target in seen:
+                        continue
+                    seen.add(target)
+                    row = {"start": f"{prefix}{start + k:0{width}d}", "end": f"{target_prefix}{target:0{target_width}d}"}
+                    row.update({name: column[k][j] for name, column in extra.items()})
+                    yield row
+
+    def party_to_rows(self):
+        roles = ("suspect", "accomplice", "witness", "victim")
+        for row in self._distinct_picks(
+            "party_to", self.counts["crimes"], self.counts["persons"], 3, "C", "P", 4, 3,
+            lambda rng, shape: {"role": rng.integers(0, 4, shape).tolist()}
+        ):
+            # 1-3 persons per crime, generated crime-first
+            yield {"start": row["end"], "end": row["start"], "role": roles[row["role"]]}
+
+    def has_evidence_rows(self):
+        # 1-4 pieces of evidence per crime
+        return self._distinct_picks("has_evidence", self.counts["crimes"], self.counts["evidence"],
+                                    4, "C", "E", 4, 3, lambda rng, shape: {})
+
+    def _random_pairs(self, stage, sources, targets, rows, same_set=False, undirected=False):
+        """
+        Yield (rng, starts, ends) per chunk: `rows` random pairs in all, none
+        repeated, as index lists. The pair space is partitioned by source: a
+        pair belongs to the chunk of sources holding its start (its lower
+        end when undirected), which gets its share of `rows` and drops
+        repeats among its own draws, so memory is bounded by the chunk.
+        `same_set` pairs never link an index to itself.
+        """
+        if undirected:
+            # Pairs with lower end < x; chunks get rows in proportion, so pairs stay uniform
+            def before(x):
+                return x * (sources - 1) - x * (x - 1) // 2
+        else:
+            def before(x):
+                return x * targets
+        space = before(sources)
+        if not space or (same_set and sources < 2):
+            return
+        for rng, start, n in self._chunks(stage, sources):
+            m = rows * before(start + n) // space - rows * before(start) // space
+            if undirected:
+                lower = np.arange(start, start + n)
+                weight = (sources - 1 - lower).astype(float)
+                if not m or not weight.sum():
+                    continue
+                first = rng.choice(lower, m, p=weight / weight.sum())
+                second = first + 1 + (rng.random(m) * (sources - 1 - first)).astype(np.int64)
+                # Either way round, as an undirected relationship is drawn
+                swap = rng.random(m) < 0.5
+                first, second = np.where(swap, second, first), np.where(swap, first, second)
+            else:
+                first = rng.integers(start, start + n, m)
+                if same_set:
+                    second = (first + rng.integers(1, targets, m)) % targets
+                else:
+                    second = rng.integers(0, targets, m)
+            seen = set()
+            starts, ends = [], []
+            for a, b in zip(first.tolist(), second.tolist()):
+                key = (min(a, b), max(a, b)) if undirected else (a, b)
+                if key not in seen:
+                    seen.add(key)
+                    starts.append(a)
+                    ends.append(b)
+            yield rng, starts, ends
+
+    def member_of_rows(self):
+        ranks = ("member", "lieutenant", "enforcer", "associate")
+        for rng, person, org in self._random_pairs("member_of", self.counts["persons"], len(organizations),
+                                                    self.counts["memberships"]):
+            rank = rng.integers(0, 4, len(person)).tolist()
+            since = rng.integers(-730, 1, len(person)).tolist()
+            for k in range(len(person)):
+                yield {"start": f"P{person[k]:03d}", "end": organizations[org[k]]["id"],
+                       "rank": ranks[rank[k]], "since": self.days[since[k]]}
+
+    def operates_in_rows(self):
+        rng = self._rng("operates_in")
+        for org in organizations:
+            relevant = [l for l in locations if l["district"] == org["territory"] or org["territory"] == "Central"]
+            k = min(int(rng.integers(3, 6)), len(relevant))
+            for idx in rng.choice(len(relevant), k, replace=False).tolist():
+                yield {"start": org["id"], "end": relevant[idx]["name"],
+                       "activity_level": ("low", "medium", "high")[int(rng.integers(0, 3))]}
+
+    def matches_mo_rows(self):
+        linked = int(round(self.counts["crimes"] * MO_LINKED_CRIMES))
+        for rng, start, n in self._chunks("matches_mo", linked):
+            mo = rng.integers(0, len(mo_patterns), n).tolist()
+            similarity = np.round(rng.uniform(0.7, 0.98, n), 2).tolist()
+            for k in range(n):
+                yield {"start": f"C{start + k:04d}", "end": mo_patterns[mo[k]]["id"], "similarity": similarity[k]}
+
+    def investigated_by_rows(self):
+        # Investigators whose specialization names the crime type, or any with 30% chance
+        specialist = np.array([[ctype in inv["specialization"] for inv in investigators] for ctype in crime_types])
+        for rng, start, n in self._chunks("investigated_by", self.counts["crimes"]):
+            types = self.crime_type[start:start + n]
+            relevant = specialist[types] | (rng.random((n, len(investigators))) < 0.3)
+            # Uniform among relevant investigators, or among all when none is relevant
+            score = rng.random((n, len(investigators))) + relevant
+            chosen = score.argmax(axis=1).tolist()
+            day = rng.integers(0, 301, n).tolist()
+            for k in range(n):
+                yield {"start": f"C{start + k:04d}", "end": investigators[chosen[k]]["id"],
+                       "assigned_date": self.days[day[k]]}
+
+    def links_to_rows(self):
+        linked = int(round(self.counts["evidence"] * LINKED_EVIDENCE))
+        for rng, start, n in self._chunks("links_to", linked):
+            person = rng.integers(0, self.counts["persons"], n).tolist()
+            confidence = np.round(rng.uniform(0.6, 0.99, n), 2).tolist()
+            for k in range(n):
+                yield {"start": f"E{start + k:03d}", "end": f"P{person[k]:03d}", "confidence": confidence[k]}
+
+    def involved_vehicle_rows(self):
+        roles = ("getaway", "transport", "scene")
+        for rng, crime, vehicle in self._random_pairs("involved_vehicle", self.counts["crimes"],
+                                                      self.counts["vehicles"], self.counts["vehicle_incidents"]):
+            role = rng.integers(0, 3, len(crime)).tolist()
+            for k in range(len(crime)):
+                yield {"start": f"C{crime[k]:04d}", "end": f"V{vehicle[k]:03d}", "role": roles[role[k]]}
+
+    def owns_vehicle_rows(self):
+        for rng, start, n in self._chunks("owns_vehicle", self.counts["vehicles"]):
+            owner = rng.integers(0, self.counts["persons"], n).tolist()
+            for k in range(n):
+                yield {"start": f"P{owner[k]:03d}", "end": f"V{start + k:03d}"}
+
+    def used_weapon_rows(self):
+        for _, crime, weapon in self._random_pairs("used_weapon", self.counts["crimes"],
+                                                   self.counts["weapons"], self.counts["weapon_incidents"]):
+            for k in range(len(crime)):
+                yield {"start": f"C{crime[k]:04d}", "end": f"W{weapon[k]:03d}"}
+
+    def owns_weapon_rows(self):
+        owned = int(round(self.counts["weapons"] * OWNED_WEAPONS))
+        for rng, start, n in self._chunks("owns_weapon", owned):
+            owner = rng.integers(0, self.counts["persons"], n).tolist()
+            for k in range(n):
+                yield {"start": f"P{owner[k]:03d}", "end": f"W{start + k:03d}"}
+
+    def knows_rows(self):
+        kinds = ("friend", "acquaintance", "associate", "rival")
+        persons = self.counts["persons"]
+        for rng, p1, p2 in self._random_pairs("knows", persons, persons, self.counts["knows"],
+                                              same_set=True, undirected=True):
+            kind = rng.integers(0, 4, len(p1)).tolist()
+            strength = np.round(rng.uniform(0.3, 1.0, len(p1)), 2).tolist()
+            for k in range(len(p1)):
+                yield {"start": f"P{p1[k]:03d}", "end": f"P{p2[k]:03d}",
+                       "relationship": kinds[kind[k]], "strength": strength[k]}
+
+    def family_rel_rows(self):
+        relations = ("sibling", "parent", "cousin", "spouse")
+        persons = self.counts["persons"]
+        for rng, p1, p2 in self._random_pairs("family_rel", persons, persons, self.counts["family"],
+                                              same_set=True, undirected=True):
+            relation = rng.integers(0, 4, len(p1)).tolist()
+            for k in range(len(p1)):
+                yield {"start": f"P{p1[k]:03d}", "end": f"P{p2[k]:03d}", "relation": relations[relation[k]]}
+
+    def similar_to_rows(self):
+        crimes = self.counts["crimes"]
+        for rng, c1, c2 in self._random_pairs("similar_to", crimes, crimes, self.counts["similar_pairs"],
+                                              same_set=True):
+            score = np.round(rng.uniform(0.7, 0.95, len(c1)), 2).tolist()
+            # Only pairs of the same type become a series
+            same = (self.crime_type[c1] == self.crime_type[c2]).tolist()
+            for k in range(len(c1)):
+                if same[k]:
+                    yield {"start": f"C{c1[k]:04d}", "end": f"C{c2[k]:04d}", "similarity_score": score[k]}
+
+    def frequents_rows(self):
+        frequenting = int(round(self.counts["persons"] * FREQUENTING_PERSONS))
+        for rng, start, n in self._chunks("frequents", frequenting):
+            # 2-4 distinct locations per person: the first k of a random permutation
+            order = rng.random((n, len(locations))).argsort(axis=1)[:, :4].tolist()
+            picks = rng.integers(2, 5, n).tolist()
+            frequency = rng.integers(5, 31, (n, 4)).tolist()
+            for k in range(n):
+                for j in range(picks[k]):
+                    yield {"start": f"P{start + k:03d}", "end": locations[order[k][j]]["name"],
+                           "frequency": frequency[k][j]}
+
+
+def generate_scaled_dataset(scale, seed=0, chunk_size=CHUNK_SIZE):
+    """Streaming dataset `scale` times the size of the default graph"""
+    return ScaleGenerator(scale, seed, chunk_size).dataset()
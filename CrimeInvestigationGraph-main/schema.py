@@ -0,0 +1,93 @@
+from database import Database
+import time
+
+# Natural keys that must be unique per label
+UNIQUE_KEYS = {
+    "Crime": "id",
+    "Person": "id",
+    "Vehicle": "id",
+    "Weapon": "id",
+    "Evidence": "id",
+    "Organization": "id",
+    "Investigator": "id",
+    "ModusOperandi": "id",
+}
+
+# Range indexes for the properties queries filter and match on
+RANGE_INDEXES = [
+    ("Location", "name"),
+    ("Crime", "type"),
+    ("Crime", "date"),
+    ("Person", "name"),
+]
+
+
+def constraint_name(label, prop):
+    return f"{label.lower()}_{prop}_unique"
+
+
+def index_name(label, prop):
+    return f"{label.lower()}_{prop}_index"
+
+
+def create_schema(db):
+    """Create uniqueness constraints and range indexes (safe to re-run)"""
+    for label, prop in UNIQUE_KEYS.items():
+        db.query(f"""
+            CREATE CONSTRAINT {constraint_name(label, prop)} IF NOT EXISTS
+            FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE
+        """)
+    print(f"🔒 Ensured {len(UNIQUE_KEYS)} uniqueness constraints")
+
+    for label, prop in RANGE_INDEXES:
+        db.query(f"""
+            CREATE RANGE INDEX {index_name(label, prop)} IF NOT EXISTS
+            FOR (n:{label}) ON (n.{prop})
+        """)
+    print(f"📇 Ensured {len(RANGE_INDEXES)} range indexes")
+
+
+def wait_for_indexes(db, timeout=300, poll_interval=1.0):
+    """
+    Block until every schema index is ONLINE.
+    Raises RuntimeError if an index fails or the timeout is reached.
+    """
+    expected = {constraint_name(l, p) for l, p in UNIQUE_KEYS.items()}
+    expected |= {index_name(l, p) for l, p in RANGE_INDEXES}
+    deadline = time.monotonic() + timeout
+
+    while True:
+        indexes = db.query("""
+            SHOW INDEXES YIELD name, owningConstraint, state, populationPercent
+            RETURN coalesce(owningConstraint, name) as name, state, populationPercent as progress
+        """)
+        ours = [i for i in indexes if i['name'] in expected]
+
+        failed = [i['name'] for i in ours if i['state'] == 'FAILED']
+        if failed:
+            raise RuntimeError(f"Index population failed: {', '.join(failed)}")
+
+        missing = expected - {i['name'] for i in ours}
+        pending = [i for i in ours if i['state'] != 'ONLINE']
+        if not missing and not pending:
+            print(f"✅ All {len(expected)} indexes online")
+            return
+
+        if time.monotonic() > deadline:
+            waiting = sorted(missing | {i['name'] for i in pending})
+            raise RuntimeError(f"Timed out waiting for indexes: {', '.join(waiting)}")
+
+        progress = min((i['progress'] for i in pending), default=0.0)
+        print(f"⏳ Waiting for {len(pending) + len(missing)} indexes ({progress:.0f}% populated)...")
+        time.sleep(poll_interval)
+
+
+def ensure_schema(db, timeout=300):
+    create_schema(db)
+    wait_for_indexes(db, timeout=timeout)
+
+
+if __name__ == "__main__":
+    db = Database()
+    ensure_schema(db)
+    db.close()
@@ -0,0 +1,168 @@
+from logging.handlers import RotatingFileHandler
+from collections import deque
+from schema import RANGE_INDEXES, UNIQUE_KEYS
+import config
+import json
+import logging
+import queue
+import re
+import threading
+import time
+
+# label -> properties with an index or uniqueness constraint
+INDEXED = {}
+for _label, _prop in list(UNIQUE_KEYS.items()) + RANGE_INDEXES:
+    INDEXED.setdefault(_label, set()).add(_prop)
+
+# Operators that are expensive wherever they show up
+FLAGGED_OPERATORS = {
+    "AllNodesScan": "AllNodesScan: reads every node in the graph",
+    "CartesianProduct": "CartesianProduct: disconnected patterns multiplied together",
+    "Eager": "Eager: whole intermediate result materialized before continuing",
+}
+
+
+def _operator(plan):
+    # Neo4j 5 names operators like "NodeByLabelScan@neo4j"
+    return plan.get("operatorType", "").split("@")[0]
+
+
+def _args(plan):
+    return plan.get("args") or plan.get("arguments") or {}
+
+
+def _walk(plan, depth=0):
+    yield depth, plan
+    for child in plan.get("children", []):
+        yield from _walk(child, depth + 1)
+
+
+def analyze_plan(plan):
+    """Anti-pattern warnings for a plan or profile tree from a ResultSummary"""
+    nodes = [p for _, p in _walk(plan)]
+    details = " ".join(str(_args(p).get("Details", "")) for p in nodes)
+    flags = []
+    for p in nodes:
+        operator = _operator(p)
+        if operator in FLAGGED_OPERATORS:
+            flags.append(FLAGGED_OPERATORS[operator])
+        elif operator == "NodeByLabelScan":
+            # Details look like "p:Person"
+            match = re.match(r"\s*`?(\w+)`?\s*:\s*`?(\w+)", str(_args(p).get("Details", "")))
+            if not match:
+                continue
+            var, label = match.groups()
+            for prop in sorted(INDEXED.get(label, ())):
+                if re.search(rf"\b{re.escape(var)}\.{prop}\b", details):
+                    flags.append(f"NodeByLabelScan: filters indexed :{label}({prop}) without using the index")
+    return sorted(set(flags))
+
+
+def format_plan(plan):
+    """Indented operator tree with rows and db hits where profiled"""
+    lines = []
+    for depth, p in _walk(plan):
+        counts = ""
+        if "rows" in p or "dbHits" in p:
+            counts = f" rows={p.get('rows', 0)} dbHits={p.get('dbHits', 0)}"
+        detail = _args(p).get("Details")
+        lines.append(f"{'  ' * depth}{_operator(p)}{counts}{f' ({detail})' if detail else ''}")
+    return "\n".join(lines)
+
+
+class SlowQueryLog:
+    """
+    Logs queries slower than `threshold_ms` to a rotating JSON-lines file,
+    with their plan: PROFILE for reads (run again, so with real row and
+    db-hit counts), EXPLAIN for writes (never re-executed), and the
+    anti-patterns found in it.
+
+    Database/AsyncDatabase hand every finished call to observe(); plans
+    are captured on a background thread, so callers never wait for them.
+    A statement is planned at most once per `plan_interval` seconds; its
+    entries in between reuse that plan.
+    """
+
+    def __init__(self, threshold_ms=None, path=None, max_mb=None, backups=3, profile=None,
+                 plan_interval=300, keep=200):
+        self.threshold_ms = threshold_ms if threshold_ms is not None else config.SLOW_QUERY_MS
+        self.profile = profile if profile is not None else config.SLOW_QUERY_PROFILE
+        self.plan_interval = plan_interval
+        # Database whose driver plans the statements; set by Database(slow_log=...)
+        self.db = None
+        self.entries = deque(maxlen=keep)
+        self.planned = {}  # cypher -> (monotonic time, mode, flags, plan text)
+        self.logger = logging.getLogger(f"slow_queries.{id(self)}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handler = RotatingFileHandler(path or config.SLOW_QUERY_LOG,
+                                           maxBytes=int((max_mb or config.SLOW_QUERY_LOG_MB) * 1024 * 1024),
+                                           backupCount=backups, encoding="utf-8")
+        self.logger.addHandler(self.handler)
+        self.queue = queue.Queue(maxsize=100)
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def observe(self, label, cypher, params, wall, error=None):
+        """Called for every finished query; `wall` in seconds"""
+        if wall * 1000 < self.threshold_ms or cypher.lstrip().upper().startswith(("EXPLAIN", "PROFILE")):
+            return
+        try:
+            self.queue.put_nowait((time.time(), label, cypher, params, wall, error))
+        except queue.Full:
+            pass  # Dropping a log line beats slowing down the app
+
+    def _worker(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self._log(*item)
+            except Exception as e:
+                print(f"⚠️ Slow query log failed: {e}")
+
+    def _plan(self, cypher, params):
+        """(mode, flags, plan text) for a statement; reused for `plan_interval` seconds"""
+        from database import WRITE_CLAUSES
+
+        last = self.planned.get(cypher)
+        if last is not None and time.monotonic() - last[0] < self.plan_interval:
+            return last[1:]
+        if self.db is None:
+            return None, [], None
+        mode = "PROFILE" if self.profile and not WRITE_CLAUSES.search(cypher) else "EXPLAIN"
+        with self.db.driver.session() as session:
+            summary = session.run(f"{mode} {cypher}", params or {}).consume()
+        plan = summary.profile if mode == "PROFILE" else summary.plan
+        mode, flags, text = (mode, analyze_plan(plan), format_plan(plan)) if plan else (None, [], None)
+        self.planned[cypher] = (time.monotonic(), mode, flags, text)
+        return mode, flags, text
+
+    def _log(self, timestamp, label, cypher, params, wall, error):
+        entry = {
+            "timestamp": timestamp,
+            "label": label,
+            "wall_ms": round(wall * 1000, 1),
+            "threshold_ms": self.threshold_ms,
+            "error": repr(error) if error is not None else None,
+            "cypher": " ".join(cypher.split()),
+            "params": json.dumps(params or {}, default=str)[:500],
+            "plan_mode": None,
+            "flags": [],
+            "plan": None
+        }
+        try:
+            entry["plan_mode"], entry["flags"], entry["plan"] = self._plan(cypher, params)
+        except Exception as e:
+            entry["plan_error"] = repr(e)
+        self.entries.append(entry)
+        self.logger.info(json.dumps(entry))
+        if entry["flags"]:
+            print(f"🐢 Slow query {label or entry['cypher'][:40]} ({entry['wall_ms']} ms): {'; '.join(entry['flags'])}")
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.logger.removeHandler(self.handler)
+        self.handler.close()